@@ -0,0 +1,671 @@
+from frontend.ASTNodes import *
+from frontend.ASTCache import ASTCache, FORMAT_VERSION, MAGIC
+from version import VERSION
+from frontend.Error import Error
+from backend.RuntimeValue import NullValue
+from array import array
+
+class Opcode:
+    POP = 0
+    LOAD_NULL = 1
+    LOAD_LITERAL = 2
+    LOAD_CONSTANT = 3
+    LOAD_NAME = 4
+    DECLARE = 5
+    ASSIGN = 6
+    AUGMENTED_LOAD = 7
+    AUGMENTED_STORE = 8
+    AUGMENTED_LITERAL = 9
+    BINARY = 10
+    BINARY_LITERAL = 11
+    COMPARE_JUMP_IF_FALSE = 12
+    COMPARE_LITERAL_JUMP_IF_FALSE = 13
+    MAKE_FUNCTION = 14
+    MAKE_ARRAY = 15
+    MAKE_OBJECT = 16
+    MAKE_EXPORT = 17
+    CALL = 18
+    DELEGATE = 19
+    JUMP = 20
+    JUMP_IF_ERROR = 21
+    JUMP_IF_BREAK = 22
+    JUMP_IF_SIGNAL = 23
+    POP_JUMP_IF_CONTINUE = 24
+    GET_ITERATOR = 25
+    FOR_ITER = 26
+    ASSIGN_EACH = 27
+    POP_BELOW = 28
+    CATCH = 29
+    RETURN = 30
+
+OPCODE_NAMES = {value: name for name, value in vars(Opcode).items() if name.isupper()}
+
+# Opcodes that can produce an Error. Their last two arguments are the stack depth to cut back to
+# and the instruction to jump to with the Error, so no separate check follows them.
+FALLIBLE = {
+    Opcode.LOAD_NAME, Opcode.DECLARE, Opcode.ASSIGN, Opcode.AUGMENTED_LOAD, Opcode.AUGMENTED_STORE,
+    Opcode.AUGMENTED_LITERAL, Opcode.BINARY, Opcode.BINARY_LITERAL, Opcode.MAKE_FUNCTION, Opcode.CALL,
+    Opcode.DELEGATE, Opcode.ASSIGN_EACH,
+}
+
+# How many arguments follow each opcode in the instruction array
+ARGUMENTS = {
+    Opcode.LOAD_LITERAL: 1,
+    Opcode.LOAD_CONSTANT: 1,
+    Opcode.LOAD_NAME: 3,
+    Opcode.DECLARE: 3,
+    Opcode.ASSIGN: 3,
+    Opcode.AUGMENTED_LOAD: 3,
+    Opcode.AUGMENTED_STORE: 3,
+    Opcode.AUGMENTED_LITERAL: 3,
+    Opcode.BINARY: 3,
+    Opcode.BINARY_LITERAL: 4,
+    Opcode.COMPARE_JUMP_IF_FALSE: 2,
+    Opcode.COMPARE_LITERAL_JUMP_IF_FALSE: 3,
+    Opcode.MAKE_FUNCTION: 3,
+    Opcode.MAKE_ARRAY: 1,
+    Opcode.MAKE_OBJECT: 1,
+    Opcode.MAKE_EXPORT: 1,
+    Opcode.CALL: 3,
+    Opcode.DELEGATE: 3,
+    Opcode.JUMP: 1,
+    Opcode.JUMP_IF_ERROR: 2,
+    Opcode.JUMP_IF_BREAK: 1,
+    Opcode.JUMP_IF_SIGNAL: 1,
+    Opcode.POP_JUMP_IF_CONTINUE: 1,
+    Opcode.FOR_ITER: 1,
+    Opcode.ASSIGN_EACH: 3,
+    Opcode.CATCH: 2,
+}
+
+# Opcodes whose first arguments index the constants pool
+CONSTANT_ARGUMENTS = {
+    Opcode.LOAD_LITERAL: 1,
+    Opcode.LOAD_CONSTANT: 1,
+    Opcode.LOAD_NAME: 1,
+    Opcode.DECLARE: 1,
+    Opcode.ASSIGN: 1,
+    Opcode.AUGMENTED_LOAD: 1,
+    Opcode.AUGMENTED_STORE: 1,
+    Opcode.AUGMENTED_LITERAL: 1,
+    Opcode.BINARY: 1,
+    Opcode.BINARY_LITERAL: 2,
+    Opcode.COMPARE_JUMP_IF_FALSE: 1,
+    Opcode.COMPARE_LITERAL_JUMP_IF_FALSE: 2,
+    Opcode.MAKE_FUNCTION: 1,
+    Opcode.MAKE_ARRAY: 1,
+    Opcode.MAKE_OBJECT: 1,
+    Opcode.MAKE_EXPORT: 1,
+    Opcode.DELEGATE: 1,
+    Opcode.ASSIGN_EACH: 1,
+    Opcode.CATCH: 1,
+}
+
+# Opcodes whose last argument is a jump target
+JUMPS = FALLIBLE | {
+    Opcode.COMPARE_JUMP_IF_FALSE, Opcode.COMPARE_LITERAL_JUMP_IF_FALSE, Opcode.JUMP, Opcode.JUMP_IF_ERROR,
+    Opcode.JUMP_IF_BREAK, Opcode.JUMP_IF_SIGNAL, Opcode.POP_JUMP_IF_CONTINUE, Opcode.FOR_ITER, Opcode.CATCH,
+}
+
+# Change of the stack depth when execution falls through to the next instruction
+STACK_EFFECTS = {
+    Opcode.POP: -1,
+    Opcode.LOAD_NULL: 1,
+    Opcode.LOAD_LITERAL: 1,
+    Opcode.LOAD_CONSTANT: 1,
+    Opcode.LOAD_NAME: 1,
+    Opcode.ASSIGN: -1,
+    Opcode.AUGMENTED_LOAD: 1,
+    Opcode.AUGMENTED_STORE: -1,
+    Opcode.AUGMENTED_LITERAL: 1,
+    Opcode.BINARY: -1,
+    Opcode.COMPARE_JUMP_IF_FALSE: -2,
+    Opcode.COMPARE_LITERAL_JUMP_IF_FALSE: -1,
+    Opcode.MAKE_FUNCTION: 1,
+    Opcode.DELEGATE: 1,
+    Opcode.FOR_ITER: 1,
+    Opcode.POP_BELOW: -1,
+    Opcode.CATCH: -1,
+    Opcode.RETURN: -1,
+}
+
+# Change of the stack depth when a jump is taken, jumps to an error label are counted by the label
+JUMP_EFFECTS = {
+    Opcode.COMPARE_JUMP_IF_FALSE: -2,
+    Opcode.COMPARE_LITERAL_JUMP_IF_FALSE: -1,
+    Opcode.POP_JUMP_IF_CONTINUE: -1,
+    Opcode.FOR_ITER: -1,
+}
+
+# What the value on top of the stack can be, for leaving out checks that can never succeed
+ERROR = 1
+SIGNAL = 2
+
+# The flags of the value an opcode leaves when execution falls through
+VALUE_FLAGS = {
+    Opcode.CALL: SIGNAL,
+    Opcode.DELEGATE: SIGNAL,
+}
+
+# Opcodes that leave the value on top of the stack as it is when execution falls through
+PRESERVING = {Opcode.JUMP_IF_ERROR, Opcode.JUMP_IF_BREAK, Opcode.JUMP_IF_SIGNAL, Opcode.POP_JUMP_IF_CONTINUE}
+
+# The flags of the value a jump arrives with
+JUMP_FLAGS = {
+    Opcode.JUMP_IF_ERROR: ERROR,
+    Opcode.CATCH: ERROR,
+    Opcode.JUMP_IF_BREAK: SIGNAL,
+    Opcode.JUMP_IF_SIGNAL: SIGNAL,
+}
+
+# A compiled program or function body. instructions holds opcodes each followed by their arguments,
+# lines holds the source line of every entry in instructions for the disassembler.
+class Code:
+    # How many nodes the Optimizer took out of the program before it was compiled, None when it didn't run
+    eliminated_nodes = None
+
+    def __init__(self, name: str, instructions: array, constants: list, lines: array) -> None:
+        self.name = name
+        self.instructions = instructions
+        self.constants = constants
+        self.lines = lines
+
+    def __repr__(self) -> str:
+        return f"<code {self.name}>"
+
+class Label:
+    def __init__(self, depth: int = None) -> None:
+        # Stack depth when execution arrives at the label and the flags of the value on top
+        self.depth = depth
+        self.flags = 0
+        self.position = None
+        self.references = []
+
+LITERAL_NODES = (IntegerLiteralNode, RealLiteralNode, StringLiteralNode, UnknownLiteralNode)
+
+# Compiles one program or function body to a Code. Every node leaves exactly one value on the
+# stack, the value the Interpreter would have returned for it, so blocks hand back Break and
+# Continue nodes and the last result in the same places. Errors jump to the enclosing error
+# label which cuts the stack back, the same as the Interpreter returning them up to whatever
+# stops them. Nodes without a compiler here are handed to the Interpreter at run time.
+class BytecodeCompiler:
+    def __init__(self, file_path: str = "", name: str = "<program>") -> None:
+        self.file_path = file_path
+        self.name = name
+        self.instructions = array('i')
+        self.lines = array('i')
+        self.constants = []
+        self.constant_indexes = {}
+        self.labels = []
+        self.depth = 0
+        self.flags = 0
+        self.line = 0
+        self.error_target = None
+
+        self.compilers = {
+            BinaryExpressionNode: self.compile_binary_expression,
+            IdentifierNode: self.compile_identifier_expression,
+            AssignmentExpressionNode: self.compile_assignment_expression,
+            VariableDeclarationExpressionNode: self.compile_variable_declaration_expression,
+            FunctionDeclarationExpressionNode: self.compile_function_declaration,
+            ObjectLiteralNode: self.compile_object_expression,
+            CallExpression: self.compile_call_expression,
+            IfStatementNode: self.compile_if_statement,
+            WhileStatementNode: self.compile_while_statement,
+            ForStatementNode: self.compile_for_statement,
+            ForEachStatementNode: self.compile_for_each_statement,
+            ArrayLiteralNode: self.compile_array_expression,
+            ReturnNode: self.compile_return_expression,
+            AssignmentBinaryExpressionNode: self.compile_assignment_binary_expression,
+            ExportNode: self.compile_export_expression,
+            TryNode: self.compile_try_statement,
+            IntegerLiteralNode: self.compile_literal,
+            RealLiteralNode: self.compile_literal,
+            StringLiteralNode: self.compile_literal,
+            UnknownLiteralNode: self.compile_literal,
+            NullLiteralNode: self.compile_null_literal,
+        }
+
+    def constant(self, value) -> int:
+        key = (type(value), value) if isinstance(value, (str, int, float, tuple)) or value is None else id(value)
+        index = self.constant_indexes.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self.constant_indexes[key] = index
+        return index
+
+    def emit(self, opcode: int, *arguments: int, effect: int = None, flags: int = None) -> None:
+        self.instructions.append(opcode)
+        self.instructions.extend(arguments)
+        self.lines.extend([self.line] * (len(arguments) + 1))
+        self.depth += STACK_EFFECTS.get(opcode, 0) if effect is None else effect
+
+        if opcode == Opcode.JUMP_IF_ERROR:
+            self.flags &= ~ERROR
+        elif opcode not in PRESERVING:
+            self.flags = VALUE_FLAGS.get(opcode, 0) if flags is None else flags
+
+    def jump(self, opcode: int, label: Label, *arguments: int, effect: int = None) -> None:
+        if label.depth is None:
+            label.depth = self.depth + JUMP_EFFECTS.get(opcode, 0)
+        label.flags |= self.flags if opcode == Opcode.JUMP else JUMP_FLAGS.get(opcode, 0)
+        self.emit(opcode, *arguments, 0, effect=effect)
+        if label.references == []:
+            self.labels.append(label)
+        label.references.append(len(self.instructions) - 1)
+
+    # Emits an opcode from FALLIBLE with the current error label as its error exit
+    def emit_fallible(self, opcode: int, *arguments: int, effect: int = None) -> None:
+        self.error_target.flags |= ERROR
+        self.jump(opcode, self.error_target, *arguments, self.error_target.depth - 1, effect=effect)
+
+    def place(self, label: Label) -> None:
+        label.position = len(self.instructions)
+        if label.depth is None:
+            label.depth = self.depth
+        self.depth = label.depth
+        self.flags |= label.flags
+
+    # Only values that can still be an Error need a check of their own
+    def check(self) -> None:
+        if self.flags & ERROR:
+            self.jump(Opcode.JUMP_IF_ERROR, self.error_target, self.error_target.depth - 1)
+
+    def assemble(self) -> Code:
+        for label in self.labels:
+            for reference in label.references:
+                self.instructions[reference] = label.position
+        self.labels = []
+        return Code(self.name, self.instructions, self.constants, self.lines)
+
+    def compile(self, astNode) -> None:
+        if isinstance(getattr(astNode, "line", None), int):
+            self.line = astNode.line
+        compiler = self.compilers.get(type(astNode))
+        if compiler is not None:
+            compiler(astNode)
+        else:
+            self.emit_fallible(Opcode.DELEGATE, self.constant(("evaluate", astNode)))
+
+    # Errors of the code emitted between these two end up as the value of that code instead of
+    # leaving it, for places where the Interpreter keeps the Error without returning it
+    def open_boundary(self) -> Label:
+        error_target = self.error_target
+        self.error_target = Label(self.depth + 1)
+        return error_target
+
+    def close_boundary(self, error_target: Label) -> None:
+        self.place(self.error_target)
+        self.error_target = error_target
+
+    def compile_unchecked(self, astNode) -> None:
+        error_target = self.open_boundary()
+        self.compile(astNode)
+        self.close_boundary(error_target)
+
+    def compile_program(self, program: ProgramNode) -> Code:
+        self.error_target = Label(1)
+
+        if program.body == []:
+            self.emit(Opcode.LOAD_NULL)
+        for index, statement in enumerate(program.body):
+            if index > 0:
+                self.emit(Opcode.POP)
+            self.compile(statement)
+            self.check()
+
+        self.place(self.error_target)
+        self.emit(Opcode.RETURN)
+        return self.assemble()
+
+    # Only return statements at the top of the body end a call, the ones in nested blocks are plain values
+    def compile_function_body(self, body: list) -> Code:
+        self.error_target = Label(1)
+
+        for statement in body:
+            self.compile(statement)
+            if isinstance(statement, ReturnNode):
+                self.emit(Opcode.RETURN)
+                break
+            self.check()
+            self.emit(Opcode.POP)
+        else:
+            self.emit(Opcode.LOAD_NULL)
+            self.emit(Opcode.RETURN)
+
+        if self.error_target.references:
+            self.place(self.error_target)
+            self.emit(Opcode.RETURN)
+        return self.assemble()
+
+    def compile_condition(self, left_condition, operand: str, right_condition, otherwise: Label) -> None:
+        self.compile(left_condition)
+        self.check()
+        if isinstance(right_condition, LITERAL_NODES):
+            self.jump(Opcode.COMPARE_LITERAL_JUMP_IF_FALSE, otherwise, self.constant(operand), self.constant(right_condition))
+            return
+
+        if isinstance(right_condition, NullValue):
+            self.emit(Opcode.LOAD_NULL)
+        else:
+            self.compile(right_condition)
+            self.check()
+        self.jump(Opcode.COMPARE_JUMP_IF_FALSE, otherwise, self.constant(operand))
+
+    def compile_binary_expression(self, binary_operation: BinaryExpressionNode) -> None:
+        self.compile(binary_operation.left)
+        self.check()
+        if isinstance(binary_operation.right, LITERAL_NODES):
+            self.emit_fallible(Opcode.BINARY_LITERAL, self.constant(binary_operation.operand), self.constant(binary_operation.right))
+            return
+
+        self.compile(binary_operation.right)
+        self.check()
+        self.emit_fallible(Opcode.BINARY, self.constant(binary_operation.operand))
+
+    def compile_identifier_expression(self, identifier: IdentifierNode) -> None:
+        self.emit_fallible(Opcode.LOAD_NAME, self.constant(identifier))
+
+    def compile_assignment_expression(self, assignment_expression: AssignmentExpressionNode) -> None:
+        if not isinstance(assignment_expression.assigne, IdentifierNode):
+            self.emit_fallible(Opcode.DELEGATE, self.constant(("evaluate", assignment_expression)))
+            return
+
+        self.emit_fallible(Opcode.LOAD_NAME, self.constant(assignment_expression.assigne))
+        self.compile(assignment_expression.value)
+        self.check()
+        self.emit_fallible(Opcode.ASSIGN, self.constant(assignment_expression.assigne))
+
+    def compile_variable_declaration_expression(self, declaration: VariableDeclarationExpressionNode) -> None:
+        self.compile(declaration.value)
+        self.check()
+        self.emit_fallible(Opcode.DECLARE, self.constant(declaration))
+
+    # Loops declare their variable through evaluate_variable_declaration_expression whatever the node is
+    def compile_declaration(self, declaration) -> None:
+        if isinstance(declaration, VariableDeclarationExpressionNode):
+            self.compile_unchecked(declaration)
+            return
+
+        error_target = self.open_boundary()
+        self.emit_fallible(Opcode.DELEGATE, self.constant(("evaluate_variable_declaration_expression", declaration)))
+        self.close_boundary(error_target)
+
+    # Bodies are compiled up front, except lazy ones which are compiled on their first call
+    def compile_function_declaration(self, declaration: FunctionDeclarationExpressionNode) -> None:
+        code = None
+        if isinstance(declaration.body, list):
+            code = BytecodeCompiler(self.file_path, declaration.name).compile_function_body(declaration.body)
+        self.emit_fallible(Opcode.MAKE_FUNCTION, self.constant((declaration, code)))
+
+    def compile_object_expression(self, object: ObjectLiteralNode) -> None:
+        for prop in object.properties:
+            self.compile(prop.value)
+            self.check()
+        keys = tuple(prop.key for prop in object.properties)
+        self.emit(Opcode.MAKE_OBJECT, self.constant((keys, object.line, object.column)), effect=1 - len(keys))
+
+    def compile_array_expression(self, array: ArrayLiteralNode) -> None:
+        for item in array.items:
+            self.compile_unchecked(item.value)
+        indexes = tuple(item.index for item in array.items)
+        self.emit(Opcode.MAKE_ARRAY, self.constant((indexes, array.line, array.column)), effect=1 - len(indexes))
+
+    def compile_export_expression(self, export_expression: ExportNode) -> None:
+        self.compile_unchecked(export_expression.value)
+        self.emit(Opcode.MAKE_EXPORT, self.constant((export_expression.line, export_expression.column)))
+
+    def compile_call_expression(self, call_expression: CallExpression) -> None:
+        for arg in call_expression.arguments:
+            self.compile(arg)
+            self.check()
+        self.compile(call_expression.caller)
+        self.check()
+        self.emit_fallible(Opcode.CALL, len(call_expression.arguments), effect=-len(call_expression.arguments))
+
+    def compile_return_expression(self, return_expression: ReturnNode) -> None:
+        self.compile(return_expression.value)
+
+    def compile_assignment_binary_expression(self, expr: AssignmentBinaryExpressionNode) -> None:
+        if not isinstance(expr, AssignmentBinaryExpressionNode) or not isinstance(expr.assigne, IdentifierNode):
+            self.emit_fallible(Opcode.DELEGATE, self.constant(("evaluate_assignment_binary_expression", expr)))
+            return
+
+        if isinstance(expr.value, LITERAL_NODES):
+            self.emit_fallible(Opcode.AUGMENTED_LITERAL, self.constant(expr))
+            return
+
+        self.emit_fallible(Opcode.AUGMENTED_LOAD, self.constant(expr))
+        self.compile(expr.value)
+        self.check()
+        self.emit_fallible(Opcode.AUGMENTED_STORE, self.constant(expr))
+
+    def compile_if_statement(self, if_statement: IfStatementNode) -> None:
+        else_label = Label()
+        end = Label()
+
+        self.compile_condition(if_statement.left_condition, if_statement.operand, if_statement.right_condition, else_label)
+        self.compile_if_body(if_statement.body, end)
+        self.place(else_label)
+        if if_statement.else_body != []:
+            self.compile_if_body(if_statement.else_body, end)
+        else:
+            self.emit(Opcode.LOAD_NULL)
+        self.place(end)
+
+    # Break and continue statements are the value of the if statement, for the loop around it to act on
+    def compile_if_body(self, statements: list, end: Label) -> None:
+        for statement in statements:
+            if isinstance(statement, (ContinueNode, BreakNode)):
+                self.emit(Opcode.LOAD_CONSTANT, self.constant(statement), flags=SIGNAL)
+                self.jump(Opcode.JUMP, end)
+                return
+            self.compile(statement)
+            self.check()
+            self.emit(Opcode.POP)
+        self.emit(Opcode.LOAD_NULL)
+        self.jump(Opcode.JUMP, end)
+
+    # A break value ends the loop with it as the result, a continue value goes on at next. Loops
+    # stop at break and return statements in their own body and keep the previous result.
+    def compile_loop_body(self, statements: list, next: Label, end: Label) -> None:
+        for index, statement in enumerate(statements):
+            if isinstance(statement, (Error, ReturnNode, BreakNode)):
+                if index == 0:
+                    self.emit(Opcode.LOAD_NULL)
+                self.jump(Opcode.JUMP, end)
+                return
+            if index > 0:
+                self.emit(Opcode.POP)
+            self.compile(statement)
+            self.check()
+            if self.flags & SIGNAL:
+                self.jump(Opcode.JUMP_IF_BREAK, end)
+                self.jump(Opcode.POP_JUMP_IF_CONTINUE, next)
+
+        if statements != []:
+            self.emit(Opcode.POP)
+        self.jump(Opcode.JUMP, next)
+
+    def compile_while_statement(self, while_statement: WhileStatementNode) -> None:
+        top = Label()
+        else_label = Label()
+        after_else = Label()
+        end = Label(self.depth + 1)
+
+        self.place(top)
+        self.compile_condition(while_statement.left_condition, while_statement.operand, while_statement.right_condition, else_label)
+        self.compile_loop_body(while_statement.body, top, end)
+
+        self.place(else_label)
+        for statement in while_statement.else_body:
+            self.compile(statement)
+            self.check()
+            if self.flags & SIGNAL:
+                self.jump(Opcode.JUMP_IF_BREAK, end)
+                self.jump(Opcode.POP_JUMP_IF_CONTINUE, after_else)
+            self.emit(Opcode.POP)
+        self.place(after_else)
+        self.emit(Opcode.LOAD_NULL)
+        self.place(end)
+
+    def compile_for_statement(self, for_statement: ForStatementNode) -> None:
+        top = Label()
+        step = Label()
+        exit = Label()
+        end = Label(self.depth + 1)
+
+        self.compile_declaration(for_statement.declaration)
+        self.emit(Opcode.POP)
+
+        self.place(top)
+        self.compile_condition(for_statement.left_condition, for_statement.operand, for_statement.right_condition, exit)
+        self.compile_loop_body(for_statement.body, step, end)
+
+        self.place(step)
+        error_target = self.open_boundary()
+        self.compile_assignment_binary_expression(for_statement.step)
+        self.close_boundary(error_target)
+        self.emit(Opcode.POP)
+        self.jump(Opcode.JUMP, top)
+
+        self.place(exit)
+        self.emit(Opcode.LOAD_NULL)
+        self.place(end)
+
+    def compile_for_each_statement(self, for_each_statement: ForEachStatementNode) -> None:
+        top = Label()
+        leave = Label()
+        exit = Label()
+        end = Label(self.depth + 1)
+
+        self.compile_declaration(for_each_statement.declaration)
+        self.emit(Opcode.POP)
+        self.compile_unchecked(for_each_statement.iterable)
+        self.emit(Opcode.GET_ITERATOR)
+
+        self.place(top)
+        self.jump(Opcode.FOR_ITER, exit)
+        self.emit_fallible(Opcode.ASSIGN_EACH, self.constant(for_each_statement.declaration))
+        self.emit(Opcode.POP)
+        self.compile_loop_body(for_each_statement.body, top, leave)
+
+        # Leaving early has the iterator under the result
+        if leave.references:
+            self.place(leave)
+            self.emit(Opcode.POP_BELOW)
+            self.jump(Opcode.JUMP, end)
+
+        self.place(exit)
+        self.emit(Opcode.LOAD_NULL)
+        self.place(end)
+
+    # Errors in the try body jump to the handler, which runs the catch body when the error type
+    # matches and otherwise leaves the error as the value of the statement
+    def compile_try_statement(self, try_statement: TryNode) -> None:
+        handler = Label(self.depth + 1)
+        no_result = Label()
+        end = Label(self.depth + 1)
+
+        error_target = self.error_target
+        self.error_target = handler
+        index = 0
+        for index, statement in enumerate(try_statement.try_body):
+            if isinstance(statement, (ReturnNode, Error, BreakNode, ContinueNode)):
+                break
+            if index > 0:
+                self.emit(Opcode.POP)
+            self.compile(statement)
+            self.check()
+            if self.flags & SIGNAL:
+                self.jump(Opcode.JUMP_IF_SIGNAL, end)
+        else:
+            index = len(try_statement.try_body)
+        if index == 0:
+            self.emit(Opcode.LOAD_NULL)
+        self.jump(Opcode.JUMP, end)
+        self.error_target = error_target
+
+        self.place(handler)
+        self.jump(Opcode.CATCH, end, self.constant(try_statement.exception.symbol))
+        for statement in try_statement.except_body:
+            if isinstance(statement, (Error, BreakNode)):
+                self.emit(Opcode.LOAD_CONSTANT, self.constant(statement), flags=SIGNAL | ERROR)
+                self.jump(Opcode.JUMP, end)
+                break
+            if isinstance(statement, ContinueNode):
+                break
+            self.compile(statement)
+            self.check()
+            if self.flags & SIGNAL:
+                self.jump(Opcode.JUMP_IF_BREAK, end)
+                self.jump(Opcode.POP_JUMP_IF_CONTINUE, no_result)
+            self.emit(Opcode.POP)
+
+        # A catch body that runs to its end leaves no result
+        self.place(no_result)
+        self.emit(Opcode.LOAD_CONSTANT, self.constant(None))
+        self.place(end)
+
+    def compile_literal(self, literal) -> None:
+        self.emit(Opcode.LOAD_LITERAL, self.constant(literal))
+
+    def compile_null_literal(self, literal: NullLiteralNode) -> None:
+        self.emit(Opcode.LOAD_NULL)
+
+def describe(value) -> str:
+    if isinstance(value, IdentifierNode):
+        return value.symbol
+    if isinstance(value, VariableDeclarationExpressionNode):
+        return value.identifier
+    if isinstance(value, AssignmentBinaryExpressionNode):
+        return f"{getattr(value.assigne, 'symbol', value.assigne.kind)} {value.operand}"
+    if isinstance(value, LITERAL_NODES):
+        return repr(value.value)
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], FunctionDeclarationExpressionNode):
+        return f"fn {value[0].name}"
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str) and isinstance(value[1], ASTNode):
+        return f"{value[0]} {value[1].kind}"
+    if isinstance(value, ASTNode):
+        return value.kind
+    return repr(value)
+
+def disassemble(code: Code) -> str:
+    lines = [f"Disassembly of {code.name}:"]
+    instructions = code.instructions
+    functions = []
+    offset = 0
+
+    while offset < len(instructions):
+        opcode = instructions[offset]
+        arguments = list(instructions[offset + 1:offset + 1 + ARGUMENTS.get(opcode, 0)])
+        text = f"{code.lines[offset]:>6} {offset:>6} {OPCODE_NAMES[opcode]:<22} {' '.join(map(str, arguments))}"
+
+        notes = []
+        for index in range(CONSTANT_ARGUMENTS.get(opcode, 0)):
+            notes.append(describe(code.constants[arguments[index]]))
+        if opcode in JUMPS:
+            notes.append(f"to {arguments[-1]}")
+        if opcode == Opcode.MAKE_FUNCTION and code.constants[arguments[0]][1] is not None:
+            functions.append(code.constants[arguments[0]][1])
+        if notes:
+            text = f"{text:<42} ({', '.join(notes)})"
+
+        lines.append(text.rstrip())
+        offset += ARGUMENTS.get(opcode, 0) + 1
+
+    for function in functions:
+        lines.append("")
+        lines.append(disassemble(function))
+    return "\n".join(lines)
+
+BYTECODE_FORMAT_VERSION = 1
+
+# Compiled programs are kept next to the parsed ones as <name>.phib, signed the same way. The header
+# says which AST node and bytecode layouts the file has, the body is the pickled Code, whose
+# instruction arrays pickle as their raw bytes.
+class BytecodeCache(ASTCache):
+    extension = ".phib"
+    header = MAGIC + f"{VERSION}:{FORMAT_VERSION}:bytecode{BYTECODE_FORMAT_VERSION}".encode().ljust(28, b"\0")
+    value_type = Code
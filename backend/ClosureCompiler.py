@@ -0,0 +1,594 @@
+from frontend.ASTNodes import *
+from frontend.Error import *
+from frontend.Parser import LazyBody
+from backend.RuntimeValue import *
+from backend.Environment import CallFrame, Environment
+from backend.Interpreter import Interpreter, value_type_table
+from backend.Functions import call_memoized
+import operator
+
+# Integer results the interpreter computes without any further checks
+INTEGER_OPERATIONS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+}
+
+# Integer results that need a non zero right hand side
+INTEGER_DIVISIONS = {
+    "%": operator.mod,
+    "//": operator.floordiv,
+}
+
+COMPARISONS = {
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+}
+
+NUMBERS = (IntegerValue, RealValue)
+MISSING = object()
+
+# Environment.lookup without the method calls, MISSING when the caller has to ask the environment for the error
+def lookup(env: Environment, name: str):
+    while env is not None:
+        if name in env.constants:
+            return env.constants[name]
+        if name in env.variables:
+            return env.variables[name]
+        env = env.parent
+    return MISSING
+
+def integer_constant(astNode) -> int | None:
+    return astNode.value if type(astNode) is IntegerLiteralNode and type(astNode.value) is int else None
+
+# Turns every node into a Python closure taking the environment, once, so running a program is
+# only calling closures. Each closure does what the matching Interpreter method does. Nodes that
+# are rare or only run once per program, such as imports and try statements, are handed to an
+# Interpreter as they are.
+class ClosureCompiler:
+    def __init__(self, file_path: str = "") -> None:
+        self.file_path = file_path
+        self.interpreter = Interpreter(file_path)
+        # Compiled function bodies by id of the body list, the list is kept so the id stays unique
+        self.function_bodies = {}
+
+        self.compilers = {
+            ProgramNode: self.compile_program,
+            BinaryExpressionNode: self.compile_binary_expression,
+            IdentifierNode: self.compile_identifier_expression,
+            AssignmentExpressionNode: self.compile_assignment_expression,
+            VariableDeclarationExpressionNode: self.compile_variable_declaration_expression,
+            FunctionDeclarationExpressionNode: self.compile_function_declaration,
+            ObjectLiteralNode: self.compile_object_expression,
+            CallExpression: self.compile_call_expression,
+            IfStatementNode: self.compile_if_statement,
+            WhileStatementNode: self.compile_while_statement,
+            ForStatementNode: self.compile_for_statement,
+            ForEachStatementNode: self.compile_for_each_statement,
+            ArrayLiteralNode: self.compile_array_expression,
+            ReturnNode: self.compile_return_expression,
+            AssignmentBinaryExpressionNode: self.compile_assignment_binary_expression,
+            ExportNode: self.compile_export_expression,
+            IntegerLiteralNode: self.compile_integer_literal,
+            RealLiteralNode: self.compile_real_literal,
+            StringLiteralNode: self.compile_string_literal,
+            UnknownLiteralNode: self.compile_unknown_literal,
+            NullLiteralNode: self.compile_null_literal,
+        }
+
+    def __str__(self) -> str:
+        return "Interpreter"
+
+    def evaluate(self, astNode: ASTNode, env: Environment) -> RuntimeValue | None:
+        return self.compile(astNode)(env)
+
+    def compile(self, astNode: ASTNode):
+        compiler = self.compilers.get(type(astNode))
+        if compiler is not None:
+            return compiler(astNode)
+
+        evaluate = self.interpreter.evaluate
+        return lambda env: evaluate(astNode, env)
+
+    def compile_condition(self, left_condition, operand: str, right_condition):
+        left = self.compile(left_condition)
+        right = None if isinstance(right_condition, NullValue) else self.compile(right_condition)
+        compare = COMPARISONS.get(operand)
+        check_condition = self.interpreter.check_condition
+        constant = integer_constant(right_condition)
+
+        if compare is not None and constant is not None:
+            def constant_condition(env):
+                left_value = left(env)
+                if type(left_value) in NUMBERS:
+                    return compare(left_value.value, constant)
+                if isinstance(left_value, Error):
+                    return (left_value,)
+                return check_condition(left_value, operand, right(env))
+
+            return constant_condition
+
+        # Returns the condition result, or the Error of one of its sides wrapped in a tuple
+        def condition(env):
+            left_value = left(env)
+            if isinstance(left_value, Error):
+                return (left_value,)
+            if right is None:
+                return check_condition(left_value, operand, NULL)
+
+            right_value = right(env)
+            if isinstance(right_value, Error):
+                return (right_value,)
+
+            if compare is not None and type(left_value) in NUMBERS and type(right_value) in NUMBERS:
+                return compare(left_value.value, right_value.value)
+            return check_condition(left_value, operand, right_value)
+
+        return condition
+
+    def compile_program(self, program: ProgramNode):
+        statements = [self.compile(statement) for statement in program.body]
+
+        def evaluate_program(env):
+            last_evaluated = NULL
+            for statement in statements:
+                last_evaluated = statement(env)
+                if isinstance(last_evaluated, Error):
+                    return last_evaluated
+            return last_evaluated
+
+        return evaluate_program
+
+    def compile_binary_expression(self, binary_operation: BinaryExpressionNode):
+        left = self.compile(binary_operation.left)
+        right = self.compile(binary_operation.right)
+        binary = self.compile_binary_operation(binary_operation.operand)
+        operation = self.constant_operation(binary_operation.operand, binary_operation.right)
+
+        if operation is not None:
+            constant = binary_operation.right.value
+
+            def evaluate_constant_binary_expression(env):
+                left_value = left(env)
+                if type(left_value) is IntegerValue:
+                    return integer_value(operation(left_value.value, constant))
+                if isinstance(left_value, Error):
+                    return left_value
+                return binary(left_value, right(env))
+
+            return evaluate_constant_binary_expression
+
+        integer_operation = INTEGER_OPERATIONS.get(binary_operation.operand)
+        integer_division = INTEGER_DIVISIONS.get(binary_operation.operand)
+
+        def evaluate_binary_expression(env):
+            left_value = left(env)
+            if isinstance(left_value, Error):
+                return left_value
+            right_value = right(env)
+            if type(left_value) is IntegerValue and type(right_value) is IntegerValue:
+                if integer_operation is not None:
+                    return integer_value(integer_operation(left_value.value, right_value.value))
+                if integer_division is not None and right_value.value != 0:
+                    return integer_value(integer_division(left_value.value, right_value.value))
+            if isinstance(right_value, Error):
+                return right_value
+            return binary(left_value, right_value)
+
+        return evaluate_binary_expression
+
+    # The integer operation for an integer literal right hand side that can never fail
+    def constant_operation(self, operand: str, right):
+        constant = integer_constant(right)
+        if constant is None:
+            return None
+        if operand in INTEGER_OPERATIONS:
+            return INTEGER_OPERATIONS[operand]
+        if operand in INTEGER_DIVISIONS and constant != 0:
+            return INTEGER_DIVISIONS[operand]
+        return None
+
+    # The type dispatch of Interpreter.evaluate_binary_expression once both sides are evaluated
+    def compile_binary_operation(self, operand: str):
+        interpreter = self.interpreter
+        file_path = self.file_path
+        integer_operation = INTEGER_OPERATIONS.get(operand)
+        integer_division = INTEGER_DIVISIONS.get(operand)
+
+        def binary(left, right):
+            if type(left) is IntegerValue and type(right) is IntegerValue:
+                if integer_operation is not None:
+                    return integer_value(integer_operation(left.value, right.value))
+                if integer_division is not None and right.value != 0:
+                    return integer_value(integer_division(left.value, right.value))
+
+            if isinstance(left, NUMBERS) and isinstance(right, NUMBERS):
+                return interpreter.evaluate_numeric_binary_expression(left, right, operand)
+            elif isinstance(left, StringValue) and isinstance(right, (StringValue, NUMBERS)):
+                return interpreter.evaluate_string_binary_expression(left, right, operand)
+            elif isinstance(left, ArrayValue):
+                return interpreter.evaluate_array_append_binary_expression(left, right, operand)
+            return TypeError(file_path, interpreter, f"Incompatible types. '{left.type}' and '{right.type}'", right.column, right.line)
+
+        return binary
+
+    def compile_identifier_expression(self, identifier: IdentifierNode):
+        name = identifier.symbol
+
+        def evaluate_identifier_expression(env):
+            value = lookup(env, name)
+            return value if value is not MISSING else env.lookup(identifier)
+
+        return evaluate_identifier_expression
+
+    def compile_assignment_expression(self, assignment_expression: AssignmentExpressionNode):
+        if not isinstance(assignment_expression.assigne, IdentifierNode):
+            evaluate_assignment_expression = self.interpreter.evaluate_assignment_expression
+            return lambda env: evaluate_assignment_expression(assignment_expression, env)
+
+        assigne = assignment_expression.assigne
+        name = assigne.symbol
+        value = self.compile(assignment_expression.value)
+        file_path = self.file_path
+        interpreter = self.interpreter
+
+        def evaluate_assignment_expression(env):
+            current_value = lookup(env, name)
+            if current_value is MISSING:
+                return env.lookup(assigne)
+            new_value = value(env)
+            if isinstance(new_value, Error):
+                return new_value
+
+            if new_value.type in value_type_table[new_value.type]:
+                return env.assign_variable(name, new_value)
+            return TypeError(file_path, interpreter, f"'{new_value.type}' is incompatible with '{current_value.type}'", new_value.column, new_value.line)
+
+        return evaluate_assignment_expression
+
+    def compile_variable_declaration_expression(self, declaration: VariableDeclarationExpressionNode):
+        value = self.compile(declaration.value)
+        identifier = declaration.identifier
+        constant = declaration.constant
+        data_type = declaration.dataType
+        file_path = self.file_path
+        interpreter = self.interpreter
+
+        def evaluate_variable_declaration_expression(env):
+            new_value = value(env)
+            if isinstance(new_value, Error):
+                return new_value
+
+            if new_value.type in value_type_table[new_value.type]:
+                return env.declare_variable(identifier, new_value, constant)
+            return TypeError(file_path, interpreter, f"'{new_value.type}' is incompatible with '{data_type}'", new_value.column, new_value.line)
+
+        return evaluate_variable_declaration_expression
+
+    def compile_function_declaration(self, declaration: FunctionDeclarationExpressionNode):
+        return lambda env: env.declare_variable(declaration.name, Function(declaration.name, declaration.parameters, env, declaration.body))
+
+    def compile_object_expression(self, object: ObjectLiteralNode):
+        properties = [(prop.key, self.compile(prop.value)) for prop in object.properties]
+        line, column = object.line, object.column
+
+        def evaluate_object_expression(env):
+            values = {}
+            for key, value in properties:
+                a = value(env)
+                if isinstance(a, Error):
+                    return a
+                values[key] = a
+            return ObjectValue(values, line, column)
+
+        return evaluate_object_expression
+
+    def compile_array_expression(self, array: ArrayLiteralNode):
+        items = [(item.index, self.compile(item.value)) for item in array.items]
+        line, column = array.line, array.column
+        return lambda env: ArrayValue({index: value(env) for index, value in items}, line, column)
+
+    def compile_function_body(self, body: list) -> list:
+        compiled = self.function_bodies.get(id(body))
+        if compiled is None or compiled[0] is not body:
+            compiled = (body, [(self.compile(statement), isinstance(statement, ReturnNode)) for statement in body])
+            self.function_bodies[id(body)] = compiled
+        return compiled[1]
+
+    def compile_call_expression(self, call_expression: CallExpression):
+        arguments = [self.compile(arg) for arg in call_expression.arguments]
+        caller = self.compile(call_expression.caller)
+        call_function = self.call_function
+        file_path = self.file_path
+        interpreter = self.interpreter
+
+        def evaluate_call_expression(env):
+            args = []
+            for arg in arguments:
+                a = arg(env)
+                if isinstance(a, Error):
+                    return a
+                args.append(a)
+            fn = caller(env)
+            if isinstance(fn, Error):
+                return fn
+
+            if type(fn) is MemoizedFunction:
+                return call_memoized(file_path, fn, call_function, args, env)
+            if isinstance(fn, NativeFunction):
+                return fn.call(args, env)
+            elif isinstance(fn, Function):
+                return call_function(fn, args, env)
+            return SyntaxError(file_path, interpreter, f"'{fn.type}' is not a function", fn.column, fn.line)
+
+        return evaluate_call_expression
+
+    def call_function(self, fn: Function, args: list, env: Environment):
+        scope = CallFrame(env)
+
+        if len(fn.parameters) == len(args):
+            for i in range(len(fn.parameters)):
+                scope.declare_variable(fn.parameters[i].symbol, args[i])
+        else:
+            if len(fn.parameters) > 0:
+                column = fn.parameters[-1].column
+                line = fn.parameters[-1].line
+            else:
+                column = fn.column
+                line = fn.line
+            return SyntaxError(self.file_path, self.interpreter, f"Insufficient arguments provided. Expected {len(fn.parameters)}, but received {len(args)}\nExpected [{', '.join([i.symbol for i in fn.parameters])}]", column, line)
+
+        if isinstance(fn.body, LazyBody):
+            body = fn.body.parse()
+            if isinstance(body, Error):
+                return body
+            fn.body = body
+
+        for statement, returns in self.compile_function_body(fn.body):
+            result = statement(scope)
+            if isinstance(result, Error):
+                return result
+            if returns:
+                return result
+        return NULL
+
+    def compile_if_statement(self, if_statement: IfStatementNode):
+        condition = self.compile_condition(if_statement.left_condition, if_statement.operand, if_statement.right_condition)
+        body = self.compile_block(if_statement.body)
+        else_body = self.compile_block(if_statement.else_body) if if_statement.else_body != [] else None
+
+        def evaluate_if_statement(env):
+            res = condition(env)
+            if type(res) is tuple:
+                return res[0]
+
+            if res:
+                statements = body
+            elif else_body is not None:
+                statements = else_body
+            else:
+                return NULL
+
+            for statement, compiled in statements:
+                if compiled is None:
+                    return statement
+                result = compiled(env)
+                if isinstance(result, (Error, ReturnNode)):
+                    return result
+            return NULL
+
+        return evaluate_if_statement
+
+    # Pairs of a statement and its closure, or None for break and continue which blocks hand back as they are
+    def compile_block(self, statements: list) -> list:
+        return [
+            (statement, None if isinstance(statement, (ContinueNode, BreakNode)) else self.compile(statement))
+            for statement in statements
+        ]
+
+    # Closures for a loop body, None where the loop stops before evaluating the statement
+    def compile_loop_body(self, statements: list) -> list:
+        return [
+            None if isinstance(statement, (Error, ReturnNode, BreakNode)) else self.compile(statement)
+            for statement in statements
+        ]
+
+    def compile_while_statement(self, while_statement: WhileStatementNode):
+        condition = self.compile_condition(while_statement.left_condition, while_statement.operand, while_statement.right_condition)
+        body = self.compile_loop_body(while_statement.body)
+        else_body = [self.compile(statement) for statement in while_statement.else_body]
+
+        def evaluate_while_statement(env):
+            while True:
+                res = condition(env)
+                if type(res) is tuple:
+                    return res[0]
+
+                if res:
+                    result = MISSING
+                    for statement in body:
+                        if statement is None:
+                            return result if result is not MISSING else NULL
+                        result = statement(env)
+                        if isinstance(result, (Error, BreakNode)):
+                            return result
+                        if isinstance(result, ContinueNode):
+                            break
+                else:
+                    result = NULL
+                    for statement in else_body:
+                        if isinstance(result, (Error, ReturnNode, BreakNode)):
+                            return result
+                        result = statement(env)
+                        if isinstance(result, (Error, BreakNode)):
+                            return result
+                        if isinstance(result, ContinueNode):
+                            break
+                    break
+            return NULL
+
+        return evaluate_while_statement
+
+    def compile_for_statement(self, for_statement: ForStatementNode):
+        declaration = self.compile_declaration(for_statement.declaration)
+        condition = self.compile_condition(for_statement.left_condition, for_statement.operand, for_statement.right_condition)
+        body = self.compile_loop_body(for_statement.body)
+        step = self.compile_assignment_binary_expression(for_statement.step)
+
+        def evaluate_for_statement(env):
+            declaration(env)
+
+            while True:
+                res = condition(env)
+                if type(res) is tuple:
+                    return res[0]
+                if not res:
+                    break
+
+                result = NULL
+                for statement in body:
+                    if statement is None:
+                        return result
+                    result = statement(env)
+                    if isinstance(result, (Error, BreakNode)):
+                        return result
+                    if isinstance(result, ContinueNode):
+                        break
+                step(env)
+            return NULL
+
+        return evaluate_for_statement
+
+    # Loops declare their variable through evaluate_variable_declaration_expression whatever the node is
+    def compile_declaration(self, declaration):
+        if isinstance(declaration, VariableDeclarationExpressionNode):
+            return self.compile_variable_declaration_expression(declaration)
+
+        evaluate_variable_declaration_expression = self.interpreter.evaluate_variable_declaration_expression
+        return lambda env: evaluate_variable_declaration_expression(declaration, env)
+
+    def compile_for_each_statement(self, for_each_statement: ForEachStatementNode):
+        declaration = self.compile_declaration(for_each_statement.declaration)
+        iterable = self.compile(for_each_statement.iterable)
+        body = self.compile_loop_body(for_each_statement.body)
+        evaluate_assignment_expression = self.interpreter.evaluate_assignment_expression
+        node = for_each_statement.declaration
+
+        def evaluate_for_each_statement(env):
+            declaration(env)
+            array = iterable(env)
+
+            for item in array.items:
+                assignment_expression = AssignmentExpressionNode(IdentifierNode(
+                    node.identifier, node.line, node.column), IntegerLiteralNode(array.items[item].value, -1, -1))
+                res = evaluate_assignment_expression(assignment_expression, env)
+                if isinstance(res, Error):
+                    return res
+
+                result = NULL
+                for statement in body:
+                    if statement is None:
+                        return result
+                    result = statement(env)
+                    if isinstance(result, (Error, BreakNode)):
+                        return result
+                    if isinstance(result, ContinueNode):
+                        break
+
+            return NULL
+
+        return evaluate_for_each_statement
+
+    def compile_return_expression(self, return_expression: ReturnNode):
+        return self.compile(return_expression.value)
+
+    def compile_assignment_binary_expression(self, expr: AssignmentBinaryExpressionNode):
+        if not isinstance(expr, AssignmentBinaryExpressionNode) or not isinstance(expr.assigne, IdentifierNode):
+            evaluate_assignment_binary_expression = self.interpreter.evaluate_assignment_binary_expression
+            return lambda env: evaluate_assignment_binary_expression(expr, env)
+
+        assigne = expr.assigne
+        name = assigne.symbol
+        value = self.compile(expr.value)
+        binary = self.compile_binary_operation(expr.operand[0])
+        integer_operation = INTEGER_OPERATIONS.get(expr.operand[0])
+        operation = self.constant_operation(expr.operand[0], expr.value)
+        constant = integer_constant(expr.value)
+        line, column = expr.line, expr.column
+        file_path = self.file_path
+        interpreter = self.interpreter
+
+        # The interpreter turns the current and the new value into literal nodes and evaluates
+        # those, which swaps line and column of some of them. The same positions are kept here.
+        def evaluate_assignment_binary_expression(env):
+            current_value = lookup(env, name)
+            if current_value is MISSING:
+                current_value = env.lookup(assigne)
+            current_type = type(current_value)
+
+            if operation is not None and current_type is IntegerValue:
+                return env.assign_variable(name, IntegerValue(operation(current_value.value, constant), line, column))
+
+            if current_type is IntegerValue:
+                left = IntegerValue(current_value.value, column, line)
+            elif current_type is RealValue:
+                left = RealValue(current_value.value, column, line)
+            elif current_type is StringValue:
+                left = StringValue(current_value.value, column, line)
+            else:
+                return TypeError(file_path, interpreter, f"Incompatible type '{current_value}'", column, line)
+
+            right = value(env)
+            if isinstance(right, Error):
+                return right
+
+            if integer_operation is not None and current_type is IntegerValue and type(right) is IntegerValue:
+                return env.assign_variable(name, IntegerValue(integer_operation(left.value, right.value), line, column))
+
+            new_value = binary(left, right)
+            new_type = type(new_value)
+            if isinstance(new_value, Error):
+                return new_value
+            elif new_type is RealValue:
+                new_value = RealValue(new_value.value, line, column)
+            elif new_type is IntegerValue:
+                new_value = IntegerValue(new_value.value, line, column)
+            elif new_type is StringValue:
+                new_value = StringValue(new_value.value, column, line)
+            else:
+                literal = {IntegerValue: IntegerLiteralNode, RealValue: RealLiteralNode, StringValue: StringLiteralNode}[current_type](current_value.value, column, line)
+                return TypeError(file_path, interpreter, f"Incompatible types. '{literal}' and '{new_value}'", column, line)
+
+            if lookup(env, name) is MISSING:
+                return env.lookup(assigne)
+            return env.assign_variable(name, new_value)
+
+        return evaluate_assignment_binary_expression
+
+    def compile_export_expression(self, export_expression: ExportNode):
+        value = self.compile(export_expression.value)
+        line, column = export_expression.line, export_expression.column
+        return lambda env: ExportValue(value(env), line, column)
+
+    def compile_integer_literal(self, literal: IntegerLiteralNode):
+        value, line, column = literal.value, literal.line, literal.column
+        return lambda env: IntegerValue(value, line, column)
+
+    def compile_real_literal(self, literal: RealLiteralNode):
+        value, line, column = literal.value, literal.line, literal.column
+        return lambda env: RealValue(value, line, column)
+
+    def compile_string_literal(self, literal: StringLiteralNode):
+        value, line, column = literal.value, literal.line, literal.column
+        return lambda env: StringValue(value, line, column)
+
+    def compile_unknown_literal(self, literal: UnknownLiteralNode):
+        value, line, column = literal.value, literal.line, literal.column
+        return lambda env: UnknownValue(value, line, column)
+
+    def compile_null_literal(self, literal: NullLiteralNode):
+        return lambda env: NULL
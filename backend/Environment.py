@@ -4,7 +4,17 @@ from backend.RuntimeValue import *
 from backend.Functions import *
 import sys
 
+# Marks a slot whose variable is not declared in the scope
+EMPTY = object()
+
 class Environment:
+    # Only a SlotEnvironment keeps its variables in slots as well
+    slots = None
+    # Set on the call frames of a function, the names the frame can hold and the first scope below the
+    # frames of the same function that are directly below it
+    names = None
+    outside = None
+
     def __init__(self, parent=None, file_path:str="") -> None:
         self.file_path = file_path
         self.parent = parent
@@ -57,12 +67,46 @@ class Environment:
             return self
         if self.parent is None:
             return NameError(self.file_path, self, variable_name, 0, 0)
-        else:
-            return self.parent.resolve(variable_name)
+        # None of the frames of a recursion can hold a name the first of them can not
+        if self.names is not None and variable_name not in self.names:
+            return self.outside.resolve(variable_name)
+        return self.parent.resolve(variable_name)
         
     def delete_variable(self, variable_name:str) -> None:
         env = self.resolve(variable_name)
         del env.variables[variable_name]
+        if env.slots is not None and variable_name in env.layout:
+            env.slots[env.layout[variable_name]] = EMPTY
+
+# The scope of a Phi function call. It starts with the builtins of a global environment without
+# declaring them again: the constants are one table shared by every frame until the body declares a
+# constant of its own, and only the builtin variables are copied.
+# Given the layout the Resolver made for the body, every variable of the layout is also kept in a
+# slot, so identifiers resolved to a slot are read by indexing a list. The dicts stay the source of
+# truth for everything else, as functions called from here look variables up by name.
+class CallFrame(Environment):
+    def __init__(self, parent=None, file_path: str = "", layout: dict | None = None) -> None:
+        self.file_path = file_path
+        self.parent = parent
+        self.variables = dict(BUILTIN_VARIABLES)
+        self.constants = BUILTIN_CONSTANTS
+        if layout is not None:
+            self.layout = layout
+            self.slots = BUILTIN_SLOTS + [EMPTY] * (len(layout) - len(BUILTIN_SLOTS))
+
+    def assign_variable(self, variable_name: str, var_value) -> None:
+        result = super().assign_variable(variable_name, var_value)
+        if self.slots is not None and variable_name in self.layout and not isinstance(result, Error):
+            self.slots[self.layout[variable_name]] = var_value
+        return result
+
+    def declare_variable(self, variable_name: str, var_value, constant: bool = False) -> None:
+        if constant and self.constants is BUILTIN_CONSTANTS:
+            self.constants = dict(BUILTIN_CONSTANTS)
+        result = super().declare_variable(variable_name, var_value, constant)
+        if self.slots is not None and variable_name in self.layout and not isinstance(result, Error):
+            self.slots[self.layout[variable_name]] = var_value
+        return result
 
 def create_global_environment(parent:Environment|None=None, file_path:str="") -> Environment:
     env = Environment(parent, file_path)
@@ -78,11 +122,20 @@ def create_global_environment(parent:Environment|None=None, file_path:str="") ->
     env.declare_variable("now", NativeFunction(lambda args, scope : now(file_path, )), True)
     env.declare_variable("wait", NativeFunction(lambda args, scope : wait(file_path, args[0])), True)
     env.declare_variable("eval", NativeFunction(lambda args, scope : phi_evaluate(file_path, args[0])), True)
+    env.declare_variable("memoize", NativeFunction(lambda args, scope : memoize(file_path, *args[:2])), True)
+    env.declare_variable("memoInfo", NativeFunction(lambda args, scope : memo_info(file_path, args[0])), True)
 
     # variables
-    env.declare_variable("_", NullValue(), True)
-    env.declare_variable("?", UnknownValue(NullValue()))
-    env.declare_variable("T", BooleanValue("T"), True)
-    env.declare_variable("F", BooleanValue("F"), True)
+    env.declare_variable("_", NULL, True)
+    env.declare_variable("?", UnknownValue(NULL))
+    env.declare_variable("T", TRUE, True)
+    env.declare_variable("F", FALSE, True)
     
-    return env
\ No newline at end of file
+    return env
+
+# What a call frame starts with, the builtins of a global environment for no file as every call had
+BUILTINS = create_global_environment()
+BUILTIN_CONSTANTS = BUILTINS.constants
+BUILTIN_VARIABLES = BUILTINS.variables
+BUILTIN_NAMES = [*BUILTIN_CONSTANTS, *BUILTIN_VARIABLES]
+BUILTIN_SLOTS = [*BUILTIN_CONSTANTS.values(), *BUILTIN_VARIABLES.values()]
@@ -0,0 +1,351 @@
+from frontend.ASTNodes import *
+from frontend.Error import *
+from backend.RuntimeValue import *
+from backend.Environment import EMPTY, Environment
+from backend.Interpreter import Interpreter, value_type_table
+from backend.Functions import call_memoized
+
+# A Phi error on its way to the try statement, function call or program that handles it
+class PhiError(Exception):
+    __slots__ = ("error",)
+
+    def __init__(self, error: Error) -> None:
+        self.error = error
+
+# A break or continue on its way to the loop it ends
+class BreakSignal(Exception):
+    __slots__ = ()
+
+class ContinueSignal(Exception):
+    __slots__ = ()
+
+SIGNALS = (BreakSignal, ContinueSignal)
+
+# The statements of body before the first one that is one of stops, and that statement
+def until(body: list, stops: tuple) -> tuple:
+    for index, statement in enumerate(body):
+        if isinstance(statement, stops):
+            return body[:index], statement
+    return body, None
+
+# An Interpreter in which Phi errors, break and continue are raised as Python exceptions instead of
+# being returned as values. Only try statements, loops, function calls and the program catch them,
+# so evaluating a node never checks what its children gave back. Where a break, continue or error
+# ends up is the same as in the Interpreter, including where it ignores them.
+# A '<-' only ends a call at the top level of the function body, which is known before the call
+# runs, so a body is cut at its first '<-' and no exception is needed for it.
+# evaluate raises PhiError for anything but a ProgramNode, which gives back its Error as a value.
+class ExceptionInterpreter(Interpreter):
+    def __init__(self, file_path: str = "") -> None:
+        super().__init__(file_path)
+        # Statement lists cut at their first stop by id of the list, the list is kept so the id stays unique
+        self.blocks = {}
+
+        # Evaluators of the Interpreter that give back an Error of their own
+        for node in (MemberExpressionNode, ImportNode, ThrowNode):
+            self.evaluators[node] = self.raising(self.evaluators[node])
+
+    def raising(self, evaluator):
+        def evaluate(astNode: ASTNode, env: Environment):
+            result = evaluator(astNode, env)
+            if isinstance(result, Error):
+                raise PhiError(result)
+            return result
+        return evaluate
+
+    def block(self, body: list, stops: tuple) -> tuple:
+        block = self.blocks.get(id(body))
+        if block is None:
+            block = self.blocks[id(body)] = (body, *until(body, stops))
+        return block
+
+    def evaluate_condition(self, left_condition, operand: str, right_condition, env: Environment):
+        left = self.evaluate_operand(left_condition, env)
+        right = NULL if isinstance(right_condition, NullValue) else self.evaluate_operand(right_condition, env)
+        return self.check_condition(left, operand, right)
+
+    def evaluate_program(self, program: ProgramNode, env: Environment) -> RuntimeValue | Error:
+        last_evaluated = NULL
+        try:
+            for statement in program.body:
+                try:
+                    last_evaluated = self.evaluate(statement, env)
+                except SIGNALS:
+                    last_evaluated = NULL
+        except PhiError as raised:
+            return raised.error
+        return last_evaluated
+
+    def evaluate_binary_expression(self, binary_operation: BinaryExpressionNode, env: Environment) -> RuntimeValue:
+        left = self.evaluate(binary_operation.left, env)
+        right = self.evaluate(binary_operation.right, env)
+        result = self.evaluate_binary_operation(left, right, binary_operation.operand)
+        if isinstance(result, Error):
+            raise PhiError(result)
+        return result
+
+    def evaluate_identifier_expression(self, identifier: IdentifierNode, env: Environment) -> RuntimeValue:
+        if env.slots is not None and identifier.slot >= 0:
+            value = env.slots[identifier.slot]
+            if value is not EMPTY:
+                return value
+        value = env.lookup(identifier)
+        if isinstance(value, Error):
+            raise PhiError(value)
+        return value
+
+    def evaluate_assignment_expression(self, assignment_expression: AssignmentExpressionNode, env: Environment) -> RuntimeValue:
+        if not isinstance(assignment_expression.assigne, IdentifierNode):
+            result = super().evaluate_assignment_expression(assignment_expression, env)
+            if isinstance(result, Error):
+                raise PhiError(result)
+            return result
+
+        current_value = self.evaluate_identifier_expression(assignment_expression.assigne, env)
+        value = self.evaluate(assignment_expression.value, env)
+        if value.type not in value_type_table[value.type]:
+            raise PhiError(TypeError(self.file_path, self, f"'{value.type}' is incompatible with '{current_value.type}'", value.column, value.line))
+
+        result = env.assign_variable(assignment_expression.assigne.symbol, value)
+        if isinstance(result, Error):
+            raise PhiError(result)
+        return result
+
+    def evaluate_variable_declaration_expression(self, declaration: VariableDeclarationExpressionNode, env: Environment) -> RuntimeValue:
+        value = self.evaluate(declaration.value, env)
+        if value.type not in value_type_table[value.type]:
+            raise PhiError(TypeError(self.file_path, self, f"'{value.type}' is incompatible with '{declaration.dataType}'", value.column, value.line))
+
+        result = env.declare_variable(declaration.identifier, value, declaration.constant)
+        if isinstance(result, Error):
+            raise PhiError(result)
+        return result
+
+    def evaluate_assignment_binary_expression(self, expr: AssignmentBinaryExpressionNode, env: Environment) -> RuntimeValue:
+        current_value = env.lookup(expr.assigne)
+        if not isinstance(current_value, (IntegerValue, RealValue, StringValue)):
+            raise PhiError(TypeError(self.file_path, self, f"Incompatible type '{current_value}'", expr.column, expr.line))
+
+        # The interpreter works the new value out from a literal of the current value and stores a literal
+        # of the result, both at the position of the '+=', the first with its line and column swapped.
+        # Errors are reported at the position of a value, so the values here are made at the same ones.
+        current_value = type(current_value)(current_value.value, expr.column, expr.line)
+        value = self.evaluate(expr.value, env)
+        new_value = self.evaluate_binary_operation(current_value, value, expr.operand[0])
+        if isinstance(new_value, Error):
+            raise PhiError(new_value)
+        if isinstance(new_value, (IntegerValue, RealValue)):
+            new_value = type(new_value)(new_value.value, expr.line, expr.column)
+        elif isinstance(new_value, StringValue):
+            new_value = StringValue(new_value.value, expr.column, expr.line)
+        else:
+            raise PhiError(TypeError(self.file_path, self, f"Incompatible types. '{current_value}' and '{new_value}'", expr.column, expr.line))
+
+        result = env.assign_variable(expr.assigne.symbol, new_value)
+        if isinstance(result, Error):
+            raise PhiError(result)
+        return result
+
+    def evaluate_call_expression(self, call_expression: CallExpression, env: Environment) -> RuntimeValue:
+        args = [self.evaluate(arg, env) for arg in call_expression.arguments]
+        fn = self.evaluate(call_expression.caller, env)
+
+        if type(fn) is MemoizedFunction:
+            result = call_memoized(self.file_path, fn, self.run_function, args, env)
+        elif isinstance(fn, NativeFunction):
+            result = fn.call(args, env)
+        elif isinstance(fn, Function):
+            return self.run_function(fn, args, env)
+        else:
+            raise PhiError(SyntaxError(self.file_path, self, f"'{fn.type}' is not a function", fn.column, fn.line))
+        if isinstance(result, Error):
+            raise PhiError(result)
+        return result
+
+    def run_function(self, fn: Function, args: list, env: Environment) -> RuntimeValue:
+        scope = self.enter_function(fn, args, env)
+        if isinstance(scope, Error):
+            raise PhiError(scope)
+
+        # A break or continue that gets back to the body of a function is ignored
+        while True:
+            _, statements, returned = self.block(fn.body, (ReturnNode,))
+            for statement in statements:
+                try:
+                    self.evaluate(statement, scope)
+                except SIGNALS:
+                    pass
+            if returned is None:
+                return NULL
+
+            tail_call = self.tail_call(returned.value, fn, scope)
+            if tail_call is None:
+                try:
+                    return self.evaluate(returned, scope)
+                except SIGNALS:
+                    return NULL
+
+            args = [self.evaluate(arg, scope) for arg in tail_call.arguments]
+            scope = self.enter_function(fn, args, scope)
+            if isinstance(scope, Error):
+                raise PhiError(scope)
+
+    # Runs the body of an if statement, which hands its own break or continue to the loop around it
+    # and ignores the ones its statements give back
+    def evaluate_if_body(self, body: list, env: Environment) -> None:
+        _, statements, stop = self.block(body, (ContinueNode, BreakNode))
+        for statement in statements:
+            try:
+                self.evaluate(statement, env)
+            except SIGNALS:
+                pass
+        if stop is not None:
+            raise BreakSignal() if isinstance(stop, BreakNode) else ContinueSignal()
+
+    def evaluate_if_statement(self, if_statement: IfStatementNode, env: Environment) -> NullValue:
+        if self.evaluate_condition(if_statement.left_condition, if_statement.operand, if_statement.right_condition, env):
+            self.evaluate_if_body(if_statement.body, env)
+        elif if_statement.else_body != []:
+            self.evaluate_if_body(if_statement.else_body, env)
+        return NULL
+
+    # A break its statements give back ends a loop and is handed on to whatever is around it,
+    # a break, return or error statement in the body itself only ends the loop
+    def evaluate_while_statement(self, while_statement: WhileStatementNode, env: Environment) -> NullValue:
+        _, statements, stop = self.block(while_statement.body, (Error, ReturnNode, BreakNode))
+
+        while True:
+            if self.evaluate_condition(while_statement.left_condition, while_statement.operand, while_statement.right_condition, env):
+                try:
+                    for statement in statements:
+                        self.evaluate(statement, env)
+                except ContinueSignal:
+                    continue
+                if stop is not None:
+                    return NULL
+            else:
+                if while_statement.else_body != []:
+                    try:
+                        for statement in while_statement.else_body:
+                            self.evaluate(statement, env)
+                    except ContinueSignal:
+                        pass
+                break
+        return NULL
+
+    def evaluate_for_statement(self, for_statement: ForStatementNode, env: Environment) -> NullValue:
+        # The Interpreter ignores the error of declaring the variable again in a second loop
+        try:
+            self.evaluate_variable_declaration_expression(for_statement.declaration, env)
+        except PhiError:
+            pass
+        _, statements, stop = self.block(for_statement.body, (Error, ReturnNode, BreakNode))
+
+        while self.evaluate_condition(for_statement.left_condition, for_statement.operand, for_statement.right_condition, env):
+            try:
+                for statement in statements:
+                    self.evaluate(statement, env)
+            except ContinueSignal:
+                pass
+            else:
+                if stop is not None:
+                    return NULL
+            try:
+                self.evaluate_assignment_binary_expression(for_statement.step, env)
+            except PhiError:
+                pass
+        return NULL
+
+    def evaluate_for_each_statement(self, for_each_statement: ForEachStatementNode, env: Environment) -> NullValue:
+        try:
+            self.evaluate_variable_declaration_expression(for_each_statement.declaration, env)
+        except PhiError:
+            pass
+        _, statements, stop = self.block(for_each_statement.body, (Error, ReturnNode, BreakNode))
+
+        array = self.evaluate(for_each_statement.iterable, env)
+        for item in array.items:
+            assignment_expression = AssignmentExpressionNode(IdentifierNode(
+                for_each_statement.declaration.identifier, for_each_statement.declaration.line, for_each_statement.declaration.column), IntegerLiteralNode(array.items[item].value, -1, -1))
+            self.evaluate_assignment_expression(assignment_expression, env)
+
+            try:
+                for statement in statements:
+                    self.evaluate(statement, env)
+            except ContinueSignal:
+                pass
+            else:
+                if stop is not None:
+                    return NULL
+        return NULL
+
+    def evaluate_do_while_statement(self, do_while_statement: DoWhileStatementNode, env: Environment) -> NullValue:
+        _, statements, stop = self.block(do_while_statement.body, (ReturnNode, Error, BreakNode, ContinueNode))
+
+        res = True
+        while res:
+            try:
+                for statement in statements:
+                    self.evaluate(statement, env)
+            except ContinueSignal:
+                pass
+            else:
+                if stop is not None and not isinstance(stop, ContinueNode):
+                    return NULL
+
+            # The Interpreter ends the loop quietly on an error in the condition
+            try:
+                left = self.evaluate(do_while_statement.conditionLeft, env)
+                right = NULL if isinstance(do_while_statement.conditionRight, NullValue) else self.evaluate(do_while_statement.conditionRight, env)
+            except PhiError:
+                return NULL
+            res = self.check_condition(left, do_while_statement.operand, right)
+        return NULL
+
+    def evaluate_try_statement(self, try_statement: TryNode, env: Environment) -> NullValue | None:
+        _, statements, _ = self.block(try_statement.try_body, (ReturnNode, Error, BreakNode, ContinueNode))
+        try:
+            for statement in statements:
+                self.evaluate(statement, env)
+        except PhiError as raised:
+            if raised.error.type != try_statement.exception.symbol:
+                raise
+
+            _, statements, stop = self.block(try_statement.except_body, (Error, BreakNode, ContinueNode))
+            try:
+                for statement in statements:
+                    self.evaluate(statement, env)
+            except ContinueSignal:
+                return None
+            if isinstance(stop, Error):
+                raise PhiError(stop)
+            if isinstance(stop, BreakNode):
+                raise BreakSignal()
+            return None
+        return NULL
+
+    def evaluate_match_statement(self, match_statement: MatchNode, env: Environment) -> NullValue:
+        value = self.evaluate(match_statement.value, env)
+
+        for match in match_statement.matches:
+            v = self.evaluate(match.value, env)
+            if value.value == v.value:
+                _, statements, stop = self.block(match.body, (Error, BreakNode, ContinueNode))
+                for statement in statements:
+                    self.evaluate(statement, env)
+                if isinstance(stop, Error):
+                    raise PhiError(stop)
+                if isinstance(stop, BreakNode):
+                    raise BreakSignal()
+                return NULL
+        return NULL
+
+    def evaluate(self, astNode: ASTNode, env: Environment) -> RuntimeValue:
+        evaluator = self.evaluators.get(type(astNode))
+        if evaluator is not None:
+            return evaluator(astNode, env)
+
+        result = super().evaluate(astNode, env)
+        if isinstance(result, Error):
+            raise PhiError(result)
+        return result
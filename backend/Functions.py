@@ -18,6 +18,8 @@ def output(value, file_path:str='') -> str:
         return result.rstrip(', ') + '}'
     elif isinstance(value, ArrayValue):
         return '[' + ', '.join(map(str, map(output, value.items.values()))) + ']'
+    elif isinstance(value, MemoizedFunction):
+        return f"memo {output(value.function)}"
     elif isinstance(value, Function):
         parameters = [parameter.symbol for parameter in value.parameters]
         return f"fn {value.name}({', '.join(parameters)})"
@@ -67,4 +69,75 @@ def read_file(file_path, value:StringValue) -> ArrayValue:
     f = open(path, 'r').readlines()
     v = {f.index(i) : StringValue(i, value.line, value.column) for i in f}
 
-    return ArrayValue(v, value.line, value.column)
\ No newline at end of file
+    return ArrayValue(v, value.line, value.column)
+
+# The key a call of a memoized function is cached by, an Error for arguments whose value can change
+def memo_key(file_path, args: list) -> tuple | Error:
+    key = []
+    for arg in args:
+        if isinstance(arg, (ArrayValue, ObjectValue)):
+            return TypeError(file_path, "Memoization", f"Can't memoize a call with an '{arg.type}' argument, it can change after the call", arg.column, arg.line)
+        if isinstance(arg, (IntegerValue, RealValue, StringValue, BooleanValue, NullValue)):
+            key.append((arg.type, arg.value))
+        else:
+            key.append((arg.type, arg))
+    return tuple(key)
+
+# The key a call of memo with args is cached by and the result kept for it. The result is None when
+# the call has to be made, and an Error when the arguments can't be a key.
+def memo_lookup(file_path, memo: MemoizedFunction, args: list) -> tuple:
+    key = memo_key(file_path, args)
+    if isinstance(key, Error):
+        return None, key
+
+    result = memo.cache.get(key)
+    if result is None:
+        memo.misses += 1
+        return key, None
+    memo.hits += 1
+    memo.cache.move_to_end(key)
+    return key, result
+
+def memo_store(memo: MemoizedFunction, key: tuple, result: RuntimeValue) -> None:
+    memo.cache[key] = result
+    if memo.size > 0 and len(memo.cache) > memo.size:
+        memo.cache.popitem(last=False)
+
+# A call of a memoized function, made with call(fn, args, scope) of the backend running the program
+# when it has no result for the arguments yet
+def call_memoized(file_path, memo: MemoizedFunction, call, args: list, scope) -> RuntimeValue:
+    key, result = memo_lookup(file_path, memo, args)
+    if result is not None:
+        return result
+
+    result = call(memo.function, args, scope)
+    if not isinstance(result, Error):
+        memo_store(memo, key, result)
+    return result
+
+def memoize(file_path, fn: Function, size: IntegerValue = None) -> MemoizedFunction:
+    from backend.Interpreter import Interpreter
+
+    if not isinstance(fn, Function):
+        return TypeError(file_path, "Memoization", f"Can only memoize a function, got '{fn.type}'", fn.column, fn.line)
+    if size is None:
+        size = IntegerValue(128)
+    if not isinstance(size, IntegerValue) or type(size.value) is not int or size.value < 0:
+        return ValueError(file_path, "Memoization", size.value, size.column, size.line)
+
+    # Backends call a memoized function through call_memoized with their own way of calling fn, this
+    # is for anything that calls it as a plain native function
+    interpreter = Interpreter(file_path)
+    memo = MemoizedFunction(fn, size.value, None)
+    memo.call = lambda args, scope: call_memoized(file_path, memo, interpreter.call_function, args, scope)
+    return memo
+
+def memo_info(file_path, memo: MemoizedFunction) -> ObjectValue:
+    if not isinstance(memo, MemoizedFunction):
+        return TypeError(file_path, "Memoization", f"Expected a memoized function, got '{memo.type}'", memo.column, memo.line)
+    return ObjectValue({
+        "hits": integer_value(memo.hits),
+        "misses": integer_value(memo.misses),
+        "cached": integer_value(len(memo.cache)),
+        "size": integer_value(memo.size)
+    }, memo.line, memo.column)
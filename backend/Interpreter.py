@@ -1,9 +1,16 @@
 from frontend.ASTNodes import *
+from frontend.Parser import LazyBody
 from frontend.Error import *
 from backend.RuntimeValue import *
-from backend.Environment import Environment, create_global_environment
+from backend.Environment import EMPTY, CallFrame, Environment
+from backend.Resolver import Resolver
+from backend.Functions import call_memoized
+from functools import partial
 import os
 
+# Values that can't change once made, the only ones pure function calls are cached by and for
+SCALAR_VALUES = (IntegerValue, RealValue, StringValue, BooleanValue, NullValue)
+
 boolean_table = {
     "T": True,
     "F": False
@@ -25,6 +32,45 @@ value_type_table = {
 class Interpreter:
     def __init__(self, file_path: str = "") -> None:
         self.file_path = file_path
+        self.resolver = Resolver()
+        # What the two sides of a condition are evaluated with
+        self.evaluate_operand = self.evaluate
+        # The bodies of the functions a PurityAnalyzer found pure, by id. A call of one of them with
+        # scalar arguments runs once, later calls with the same arguments get the result it had.
+        self.pure_bodies = None
+        self.pure_results = {}
+
+        # Handlers by node class, nodes that are never evaluated on their own have none
+        self.evaluators = {
+            ProgramNode: self.evaluate_program,
+            BinaryExpressionNode: self.evaluate_binary_expression,
+            IdentifierNode: self.evaluate_identifier_expression,
+            AssignmentExpressionNode: self.evaluate_assignment_expression,
+            VariableDeclarationExpressionNode: self.evaluate_variable_declaration_expression,
+            FunctionDeclarationExpressionNode: self.evaluate_function_declaration,
+            ObjectLiteralNode: self.evaluate_object_expression,
+            CallExpression: self.evaluate_call_expression,
+            MemberExpressionNode: self.evaluate_member_expression,
+            IfStatementNode: self.evaluate_if_statement,
+            WhileStatementNode: self.evaluate_while_statement,
+            ForStatementNode: self.evaluate_for_statement,
+            ForEachStatementNode: self.evaluate_for_each_statement,
+            DoWhileStatementNode: self.evaluate_do_while_statement,
+            ArrayLiteralNode: self.evaluate_array_expression,
+            ReturnNode: self.evaluate_return_expression,
+            AssignmentBinaryExpressionNode: self.evaluate_assignment_binary_expression,
+            ExportNode: self.evaluate_export_expression,
+            ImportNode: self.evaluate_import_expression,
+            TryNode: self.evaluate_try_statement,
+            ThrowNode: self.evaluate_throw_statement,
+            MatchNode: self.evaluate_match_statement,
+            DeleteNode: self.evaluate_delete_statement,
+            IntegerLiteralNode: self.evaluate_integer_literal,
+            RealLiteralNode: self.evaluate_real_literal,
+            StringLiteralNode: self.evaluate_string_literal,
+            UnknownLiteralNode: self.evaluate_unknown_literal,
+            NullLiteralNode: self.evaluate_null_literal,
+        }
 
     def __str__(self) -> str:
         return "Interpreter"
@@ -33,7 +79,7 @@ class Interpreter:
         res = False
         if isinstance(right, NullValue):
             if isinstance(left, (RealValue, IntegerValue)):
-                res = BooleanValue("T") if left.value != 0 else BooleanValue("F")
+                res = TRUE if left.value != 0 else FALSE
             elif isinstance(left, BooleanValue):
                 res = left.value == "T"
             elif isinstance(left, StringValue):
@@ -71,7 +117,7 @@ class Interpreter:
         return res
 
     def evaluate_program(self, program: ProgramNode, env: Environment) -> NullValue | IntegerValue | ObjectValue | ArrayValue | StringValue | bool | None:
-        last_evaluated = NullValue()
+        last_evaluated = NULL
 
         for statement in program.body:
             last_evaluated = self.evaluate(statement, env)
@@ -88,13 +134,16 @@ class Interpreter:
         if isinstance(right, Error):
             return right
 
+        return self.evaluate_binary_operation(left, right, binary_operation.operand)
+
+    def evaluate_binary_operation(self, left: RuntimeValue, right: RuntimeValue, operand: str) -> RuntimeValue | Error:
         if isinstance(left, (RealValue, IntegerValue)) and isinstance(right, (RealValue, IntegerValue)):
-            return self.evaluate_numeric_binary_expression(left, right, binary_operation.operand)
+            return self.evaluate_numeric_binary_expression(left, right, operand)
         elif isinstance(left, StringValue) and isinstance(right, (StringValue, (RealValue, IntegerValue))):
-            return self.evaluate_string_binary_expression(left, right, binary_operation.operand)
+            return self.evaluate_string_binary_expression(left, right, operand)
 
         elif isinstance(left, ArrayValue):
-            return self.evaluate_array_append_binary_expression(left, right, binary_operation.operand)
+            return self.evaluate_array_append_binary_expression(left, right, operand)
         else:
             return TypeError(self.file_path, self, f"Incompatible types. '{left.type}' and '{right.type}'", right.column, right.line)
 
@@ -134,17 +183,17 @@ class Interpreter:
                 if isinstance(left, RealValue) or isinstance(right, RealValue):
                     return RealValue(left.value + right.value)
                 else:
-                    return IntegerValue(left.value + right.value)
+                    return integer_value(left.value + right.value)
             case "-":
                 if isinstance(left, RealValue) or isinstance(right, RealValue):
                     return RealValue(left.value - right.value)
                 else:
-                    return IntegerValue(left.value - right.value)
+                    return integer_value(left.value - right.value)
             case "*":
                 if isinstance(left, RealValue) or isinstance(right, RealValue):
                     return RealValue(left.value * right.value)
                 else:
-                    return IntegerValue(left.value * right.value)
+                    return integer_value(left.value * right.value)
             case "/":
                 if right.value != 0:
                     return RealValue(left.value / right.value)
@@ -154,15 +203,15 @@ class Interpreter:
                 if isinstance(left, RealValue) or isinstance(right, RealValue):
                     return RealValue(left.value ** right.value)
                 else:
-                    return IntegerValue(left.value ** right.value)
+                    return integer_value(left.value ** right.value)
             case "%":
                 if right.value != 0:
-                    return IntegerValue(left.value % right.value)
+                    return integer_value(left.value % right.value)
                 else:
                     return ZeroDivisionError(self.file_path, self, right.column, right.line)
             case "//":
                 if right.value != 0:
-                    return IntegerValue(left.value // right.value)
+                    return integer_value(left.value // right.value)
                 else:
                     return ZeroDivisionError(self.file_path, self, right.column, right.line)
             case _:
@@ -171,6 +220,10 @@ class Interpreter:
 # --------------------------------------------------------------------------------------------------------------------------------
 
     def evaluate_identifier_expression(self, identifier: IdentifierNode, env: Environment) -> None:
+        if env.slots is not None and identifier.slot >= 0:
+            value = env.slots[identifier.slot]
+            if value is not EMPTY:
+                return value
         return env.lookup(identifier)
 
     def evaluate_assignment_expression(self, assignment_expression: AssignmentExpressionNode, env: Environment) -> None:
@@ -247,34 +300,93 @@ class Interpreter:
         if isinstance(fn, Error):
             return fn
 
+        if type(fn) is MemoizedFunction:
+            return call_memoized(self.file_path, fn, self.call_function, args, env)
         if isinstance(fn, NativeFunction):
             return fn.call(args, env)
         elif isinstance(fn, Function):
-            scope = create_global_environment(env)
+            return self.call_function(fn, args, env)
+        else:
+            return SyntaxError(self.file_path, self, f"'{fn.type}' is not a function", fn.column, fn.line)
 
-            if len(fn.parameters) == len(args):
-                for i in range(len(fn.parameters)):
-                    scope.declare_variable(fn.parameters[i].symbol, args[i])
-            else:
-                if len(fn.parameters) > 0:
-                    column = fn.parameters[-1].column
-                    line = fn.parameters[-1].line
-                else:
-                    column = fn.column
-                    line = fn.line
-                return SyntaxError(self.file_path, self, f"Insufficient arguments provided. Expected {len(fn.parameters)}, but received {len(args)}\nExpected [{', '.join([i.symbol for i in fn.parameters])}]", column, line)
+    def call_function(self, fn: Function, args: list, env: Environment) -> RuntimeValue | Error:
+        if self.pure_bodies is None or id(fn.body) not in self.pure_bodies:
+            return self.run_function(fn, args, env)
+        if not all(isinstance(arg, SCALAR_VALUES) for arg in args):
+            return self.run_function(fn, args, env)
+
+        key = (id(fn.body), *[(arg.type, arg.value) for arg in args])
+        result = self.pure_results.get(key)
+        if result is None:
+            result = self.run_function(fn, args, env)
+            if isinstance(result, SCALAR_VALUES):
+                self.pure_results[key] = result
+        return result
+
+    def run_function(self, fn: Function, args: list, env: Environment) -> RuntimeValue | Error:
+        scope = self.enter_function(fn, args, env)
+        if isinstance(scope, Error):
+            return scope
 
-            # Loop through funcion body and evalute the code
-            result = NullValue()
+        # Loop through funcion body and evalute the code, a call of fn itself in tail position runs as the next round of this loop
+        while True:
             for statement in fn.body:
+                if isinstance(statement, ReturnNode):
+                    tail_call = self.tail_call(statement.value, fn, scope)
+                    if tail_call is not None:
+                        break
                 result = self.evaluate(statement, scope)
                 if isinstance(result, Error):
                     return result
                 if isinstance(statement, ReturnNode):
                     return result
-        else:
-            return SyntaxError(self.file_path, self, f"'{fn.type}' is not a function", fn.column, fn.line)
-        return NullValue()
+            else:
+                return NULL
+
+            args = []
+            for arg in tail_call.arguments:
+                a = self.evaluate(arg, scope)
+                if isinstance(a, Error):
+                    return a
+                args.append(a)
+            # The call it stands for would have run on top of this scope, whose variables it can still read
+            scope = self.enter_function(fn, args, scope)
+            if isinstance(scope, Error):
+                return scope
+
+    # The call expression of '<- value' when it calls fn itself. Its result is what the call of fn
+    # returns, so it can be run in place of that call instead of inside it.
+    def tail_call(self, value, fn: Function, scope: Environment) -> CallExpression | None:
+        if type(value) is CallExpression and type(value.caller) is IdentifierNode and value.caller.symbol == fn.name:
+            if scope.lookup(value.caller) is fn:
+                return value
+        return None
+
+    # The scope a call of fn with args runs its body in
+    def enter_function(self, fn: Function, args: list, env: Environment) -> CallFrame | Error:
+        if len(fn.parameters) != len(args):
+            if len(fn.parameters) > 0:
+                column = fn.parameters[-1].column
+                line = fn.parameters[-1].line
+            else:
+                column = fn.column
+                line = fn.line
+            return SyntaxError(self.file_path, self, f"Insufficient arguments provided. Expected {len(fn.parameters)}, but received {len(args)}\nExpected [{', '.join([i.symbol for i in fn.parameters])}]", column, line)
+
+        if isinstance(fn.body, LazyBody):
+            body = fn.body.parse()
+            if isinstance(body, Error):
+                return body
+            fn.body = body
+
+        resolved = self.resolver.resolve_function(fn.parameters, fn.body)
+        scope = CallFrame(env, layout=resolved.slots)
+        # A name the function can't declare is looked up past the frames of the calls of it below this one
+        scope.names = resolved.declarable
+        scope.outside = env.outside if env.names is scope.names else env
+        for i in range(len(fn.parameters)):
+            scope.declare_variable(fn.parameters[i].symbol, args[i])
+        return scope
 
     def evaluate_member_expression(self, member: MemberExpressionNode, env: Environment) -> None:
         x = self.evaluate(member.object, env) if isinstance(member.object, (MemberExpressionNode, StringLiteralNode)) else member.object
@@ -289,10 +401,10 @@ class Interpreter:
                 if isinstance(list(obj.properties.keys())[0], StringValue):
                     obj.properties = {key.value: value for key, value in obj.properties.items() if isinstance(key, StringValue)}
 
-                if method_or_property := obj.methods.get(
-                    member.property.symbol
-                ) or obj.properties.get(member.property.symbol):
-                    return method_or_property
+                if method := obj.methods.get(member.property.symbol):
+                    return NativeFunction(partial(method, obj))
+                if prop := obj.properties.get(member.property.symbol):
+                    return prop
 
                 v = self.evaluate(member.property, env)
                 if isinstance(v, Error):
@@ -308,7 +420,7 @@ class Interpreter:
 
             if isinstance(member.property, IdentifierNode):
                 if method := obj.methods.get(member.property.symbol):
-                    return method
+                    return NativeFunction(partial(method, obj))
 
                 value = self.evaluate(member.property, env)
                 if isinstance(value, Error):
@@ -320,20 +432,20 @@ class Interpreter:
 
 
     def evaluate_if_statement(self, if_statement: IfStatementNode, env: Environment) -> None:
-        left: RuntimeValue = self.evaluate(if_statement.left_condition, env)
+        left: RuntimeValue = self.evaluate_operand(if_statement.left_condition, env)
         if isinstance(left, Error):
             return left
         if not isinstance(if_statement.right_condition, NullValue):
-            right: RuntimeValue = self.evaluate(
+            right: RuntimeValue = self.evaluate_operand(
                 if_statement.right_condition, env)
             if isinstance(right, Error):
                 return right
         else:
-            right = NullValue()
+            right = NULL
 
         res = False
         if res := self.check_condition(left, if_statement.operand, right):
-            result = NullValue()
+            result = NULL
             for statement in if_statement.body:
                 if isinstance(statement, (ContinueNode, BreakNode)):
                     return statement
@@ -341,32 +453,32 @@ class Interpreter:
                 if isinstance(result, (Error, ReturnNode)):
                     return result
         elif if_statement.else_body != []:
-            result = NullValue()
+            result = NULL
             for statement in if_statement.else_body:
                 if isinstance(statement, (ContinueNode, BreakNode)):
                     return statement
                 result = self.evaluate(statement, env)
                 if isinstance(result, (Error, ReturnNode)):
                     return result
-        return NullValue()
+        return NULL
 
     def evaluate_while_statement(self, while_statement: WhileStatementNode, env: Environment) -> bool:
         while True:
-            left: RuntimeValue = self.evaluate(
+            left: RuntimeValue = self.evaluate_operand(
                 while_statement.left_condition, env)
             if isinstance(left, Error):
                 return left
             if not isinstance(while_statement.right_condition, NullValue):
-                right: RuntimeValue = self.evaluate(
+                right: RuntimeValue = self.evaluate_operand(
                     while_statement.right_condition, env)
                 if isinstance(right, Error):
                     return right
             else:
-                right = NullValue()
+                right = NULL
 
             res = False
             if res := self.check_condition(left, while_statement.operand, right):
-                result = NullValue()
+                result = NULL
                 for statement in while_statement.body:
                     if isinstance(statement, (Error, ReturnNode, BreakNode)):
                         return result
@@ -379,7 +491,7 @@ class Interpreter:
                         break
             else:
                 if while_statement.else_body != []:
-                    result = NullValue()
+                    result = NULL
                     for statement in while_statement.else_body:
                         if isinstance(result, (Error, ReturnNode, BreakNode)):
                             return result
@@ -391,27 +503,27 @@ class Interpreter:
                         if isinstance(result, ContinueNode):
                             break
                 break
-        return NullValue()
+        return NULL
 
     def evaluate_for_statement(self, for_statement: ForStatementNode, env: Environment) -> None:
         self.evaluate_variable_declaration_expression(for_statement.declaration, env)
 
         while True:
-            left: RuntimeValue = self.evaluate(for_statement.left_condition, env)
+            left: RuntimeValue = self.evaluate_operand(for_statement.left_condition, env)
             if isinstance(left, Error):
                 return left
             if not isinstance(for_statement.right_condition, NullValue):
-                right: RuntimeValue = self.evaluate(
+                right: RuntimeValue = self.evaluate_operand(
                     for_statement.right_condition, env)
                 if isinstance(right, Error):
                     return right
             else:
-                right = NullValue()
+                right = NULL
 
             res = False
             if not (res := self.check_condition(left, for_statement.operand, right)):
                 break
-            result = NullValue()
+            result = NULL
             for statement in for_statement.body:
                 if isinstance(statement, (Error, ReturnNode, BreakNode)):
                     return result
@@ -422,7 +534,7 @@ class Interpreter:
                     break
             result = self.evaluate_assignment_binary_expression(
                 for_statement.step, env)
-        return NullValue()
+        return NULL
 
     def evaluate_for_each_statement(self, for_each_statement: ForEachStatementNode, env: Environment) -> None:
         self.evaluate_variable_declaration_expression(
@@ -437,7 +549,7 @@ class Interpreter:
             if isinstance(res, Error):
                 return res
 
-            result = NullValue()
+            result = NULL
             for statement in for_each_statement.body:
                 if isinstance(statement, (Error, ReturnNode, BreakNode)):
                     return result
@@ -447,12 +559,12 @@ class Interpreter:
                 if isinstance(result, ContinueNode):
                     break
 
-        return NullValue()
+        return NULL
 
     def evaluate_do_while_statement(self, do_while_statement: DoWhileStatementNode, env: Environment) -> None:
         res = True
         while res:
-            result = NullValue()
+            result = NULL
             for statement in do_while_statement.body:
                 if isinstance(statement, (ReturnNode, Error, BreakNode)):
                     return result
@@ -464,19 +576,19 @@ class Interpreter:
                 if isinstance(result, ContinueNode):
                     break
 
-            left: RuntimeValue = self.evaluate(do_while_statement.conditionLeft, env)
+            left: RuntimeValue = self.evaluate_operand(do_while_statement.conditionLeft, env)
             if isinstance(left, Error):
                 return result
             if not isinstance(do_while_statement.conditionRight, NullValue):
-                right: RuntimeValue = self.evaluate(
+                right: RuntimeValue = self.evaluate_operand(
                     do_while_statement.conditionRight, env)
                 if isinstance(right, Error):
                     return result
             else:
-                right = NullValue()
+                right = NULL
 
             res = self.check_condition(left, do_while_statement.operand, right)
-        return NullValue()
+        return NULL
 
     def evaluate_return_expression(self, return_expression: ReturnNode, env: Environment):
         return self.evaluate(return_expression.value, env)
@@ -518,7 +630,7 @@ class Interpreter:
     def evaluate_import_expression(self, import_expression: ImportNode, env: Environment):
         from shell import run
 
-        result = NullValue()
+        result = NULL
         for i in range(len(import_expression.values)):
             path = import_expression.values[i]
 
@@ -588,7 +700,7 @@ class Interpreter:
             result = env.declare_variable(name, module, False)
 
     def evaluate_try_statement(self, try_statement: TryNode, env: Environment) -> None:
-        result = NullValue()
+        result = NULL
         for statement in try_statement.try_body:
             if isinstance(statement, (ReturnNode, Error, BreakNode)):
                 break
@@ -604,8 +716,8 @@ class Interpreter:
             return result
         if result.type != try_statement.exception.symbol:
             return result
-        result = NullValue()
-        for statement in try_statement.exceptBody:
+        result = NULL
+        for statement in try_statement.except_body:
             if isinstance(statement, (Error, BreakNode)):
                 return statement
             if isinstance(statement, ContinueNode):
@@ -639,7 +751,7 @@ class Interpreter:
         for match in match_statement.matches:
             v = self.evaluate(match.value, env)
             if value.value == v.value:
-                result = NullValue()
+                result = NULL
                 for statement in match.body:
                     if isinstance(statement, (Error, BreakNode)):
                         return statement
@@ -651,72 +763,32 @@ class Interpreter:
                     if isinstance(result, ContinueNode):
                         break
                 return result
-        return NullValue()
+        return NULL
 
     def evaluate_delete_statement(self, delete_statement: DeleteNode, env: Environment) -> None:
         env.delete_variable(delete_statement.variable)
-        return NullValue()
+        return NULL
+
+    def evaluate_integer_literal(self, literal: IntegerLiteralNode, env: Environment) -> IntegerValue:
+        return IntegerValue(literal.value, literal.line, literal.column)
+
+    def evaluate_real_literal(self, literal: RealLiteralNode, env: Environment) -> RealValue:
+        return RealValue(literal.value, literal.line, literal.column)
+
+    def evaluate_string_literal(self, literal: StringLiteralNode, env: Environment) -> StringValue:
+        return StringValue(literal.value, literal.line, literal.column)
+
+    def evaluate_unknown_literal(self, literal: UnknownLiteralNode, env: Environment) -> UnknownValue:
+        return UnknownValue(literal.value, literal.line, literal.column)
+
+    def evaluate_null_literal(self, literal: NullLiteralNode, env: Environment) -> NullValue:
+        return NULL
 
     def evaluate(self, astNode: ASTNode, env: Environment) -> RuntimeValue | None:
+        evaluator = self.evaluators.get(type(astNode))
+        if evaluator is not None:
+            return evaluator(astNode, env)
+
         if isinstance(astNode, (str, float, int, Error)):
             return astNode
-        match astNode.kind:
-            case "program":
-                return self.evaluate_program(astNode, env)
-            case "binaryExpression":
-                return self.evaluate_binary_expression(astNode, env)
-            case "identifier":
-                return self.evaluate_identifier_expression(astNode, env)
-            case "assignmentExpression":
-                return self.evaluate_assignment_expression(astNode, env)
-            case "variableDeclarationExpression":
-                return self.evaluate_variable_declaration_expression(astNode, env)
-            case "functionDeclaration":
-                return self.evaluate_function_declaration(astNode, env)
-            case "objectLiteral":
-                return self.evaluate_object_expression(astNode, env)
-            case "callExpression":
-                return self.evaluate_call_expression(astNode, env)
-            case "memberExpression":
-                return self.evaluate_member_expression(astNode, env)
-            case "ifStatement":
-                return self.evaluate_if_statement(astNode, env)
-            case "whileStatement":
-                return self.evaluate_while_statement(astNode, env)
-            case "forStatement":
-                return self.evaluate_for_statement(astNode, env)
-            case "forEachStatement":
-                return self.evaluate_for_each_statement(astNode, env)
-            case "doWhileStatement":
-                return self.evaluate_do_while_statement(astNode, env)
-            case "arrayLiteral":
-                return self.evaluate_array_expression(astNode, env)
-            case "returnExpression":
-                return self.evaluate_return_expression(astNode, env)
-            case "assignmentBinaryExpression":
-                return self.evaluate_assignment_binary_expression(astNode, env)
-            case "exportExpression":
-                return self.evaluate_export_expression(astNode, env)
-            case "importExpression":
-                return self.evaluate_import_expression(astNode, env)
-            case "tryStatement":
-                return self.evaluate_try_statement(astNode, env)
-            case "throwStatement":
-                return self.evaluate_throw_statement(astNode, env)
-            case "matchStatement":
-                return self.evaluate_match_statement(astNode, env)
-            case "delete":
-                return self.evaluate_delete_statement(astNode, env)
-
-            case "integerLiteral":
-                return IntegerValue(astNode.value, astNode.line, astNode.column)
-            case "realLiteral":
-                return RealValue(astNode.value, astNode.line, astNode.column)
-            case "stringLiteral":
-                return StringValue(astNode.value, astNode.line, astNode.column)
-            case "unknownLiteral":
-                return UnknownValue(astNode.value, astNode.line, astNode.column)
-            case "nullLiteral":
-                return NullValue()
-            case _:
-                return NotImplementedError(self.file_path, self, astNode.kind, astNode.column, astNode.line)
+        return NotImplementedError(self.file_path, self, astNode.kind, astNode.column, astNode.line)
@@ -7,7 +7,7 @@ def array_append(array: ArrayValue, value: RuntimeValue) -> ArrayValue:
     return array
 
 def array_length(array: ArrayValue) -> IntegerValue:
-    return IntegerValue(len(array.items))
+    return integer_value(len(array.items))
 
 def array_join(array: ArrayValue, join_character: StringValue) -> StringValue:
     if isinstance(join_character, StringValue):
@@ -17,7 +17,7 @@ def array_join(array: ArrayValue, join_character: StringValue) -> StringValue:
         return TypeError('', "Method", join_character, join_character.column, join_character.line)
 
 def string_length(string: StringValue) -> IntegerValue:
-    return IntegerValue(len(string.value))
+    return integer_value(len(string.value))
 
 def string_format(args, string: StringValue) -> StringValue:
     formatted_string = ''
@@ -50,14 +50,14 @@ def object_update(obj: ObjectValue, new_properties) -> NullValue:
         return TypeError('', "Method", f"Expected an objectValue but received a '{new_properties.type}'", new_properties.column, new_properties.line)
     object_new_properties = {**new_properties.properties}
     obj.properties.update(object_new_properties)
-    return NullValue()
+    return NULL
 
 def object_has_attribute(obj:ObjectValue, attribute):
     if not isinstance(attribute, StringValue):
         return TypeError('', "Method", f"Expected an stringValue but received a '{attribute.type}'", attribute.column, attribute.line)
     attribute_name = attribute.value
     return (
-        BooleanValue("F")
+        FALSE
         if attribute_name not in obj.properties
-        else BooleanValue("T")
+        else TRUE
     )
@@ -0,0 +1,228 @@
+from frontend.ASTNodes import *
+from backend.RuntimeValue import *
+from backend.Interpreter import Interpreter
+from backend.Resolver import Resolver
+import copy
+
+# The literal node a folded value is put back in the tree as
+LITERALS = {IntegerValue: IntegerLiteralNode, RealValue: RealLiteralNode, StringValue: StringLiteralNode}
+FOLDABLE = (IntegerLiteralNode, RealLiteralNode, StringLiteralNode)
+# Builtin constants a condition can be worked out with, no scope can declare them again
+CONSTANTS = {"T": TRUE, "F": FALSE, "_": NULL}
+# Integers with more bits than this are left for the program to compute if it gets there
+MAX_BITS = 4096
+
+# Statements a block is made of, by the kind of block. The kind decides what the block does with
+# the result of each statement, which is what decides what can be taken out of it
+BLOCKS = {
+    (ProgramNode, "body"): "program",
+    (FunctionDeclarationExpressionNode, "body"): "function",
+    (IfStatementNode, "body"): "if",
+    (IfStatementNode, "else_body"): "if",
+    (WhileStatementNode, "body"): "loop",
+    (ForStatementNode, "body"): "loop",
+    (ForEachStatementNode, "body"): "loop",
+    (DoWhileStatementNode, "body"): "loop",
+}
+# Statements after which the rest of a block never runs. A '<-' only ends a function body at its
+# top level and a loop body, an if body goes on after it
+ENDS = {
+    "function": (ReturnNode, BreakNode),
+    "loop": (ReturnNode, BreakNode),
+    "if": (BreakNode, ContinueNode),
+}
+# Fields holding identifiers that aren't read as variables, or expressions that are looked at
+# before they are evaluated, which are left as they are
+KEEP = {
+    (MemberExpressionNode, "object"),
+    (MemberExpressionNode, "property"),
+    (CallExpression, "caller"),
+    (AssignmentExpressionNode, "assigne"),
+    (AssignmentBinaryExpressionNode, "assigne"),
+    (FunctionDeclarationExpressionNode, "parameters"),
+    (ImportNode, "names"),
+    (ImportNode, "values"),
+    (TryNode, "exception"),
+    (ThrowNode, "error"),
+}
+
+
+# Rewrites a program into one that does the same with fewer nodes, between parsing and evaluation.
+# The tree it is given is left as it was, as the parser's cache holds on to it.
+# Level 1 folds arithmetic on literals, replaces if statements whose condition is made of literals
+# by the statements of the branch they take, and drops the statements of a block that can't run.
+# Level 2 also puts the value of an uppercase constant declared at the top level with a literal in
+# place of the identifiers reading it, in the statements after the declaration and in every
+# function body. A function called before the declaration ran sees the value instead of a NameError.
+# Conditions and arithmetic are worked out by the Interpreter, so a folded program does what the
+# Interpreter would have done, quirks included.
+class Optimizer:
+    def __init__(self, level: int = 1, file_path: str = "") -> None:
+        self.level = level
+        self.interpreter = Interpreter(file_path)
+        self.resolver = Resolver()
+        # Values of the constants that can be put in place of their identifiers, by name
+        self.constants = {}
+        self.inline = {}
+        self.before = 0
+        self.after = 0
+
+    @property
+    def eliminated(self) -> int:
+        return self.before - self.after
+
+    def optimize(self, program: ProgramNode) -> ProgramNode:
+        self.before = self.count(program)
+        if self.level > 0:
+            program = self.rewrite(program)
+        if self.level > 1:
+            self.constants = self.find_constants(program)
+            if self.constants:
+                program = self.rewrite(program)
+        self.after = self.count(program)
+        return program
+
+    def nodes(self, root):
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, ASTNode):
+                yield node
+                stack.extend(getattr(node, field, None) for field in self.resolver.node_fields(type(node)))
+
+    def count(self, root) -> int:
+        return sum(1 for _ in self.nodes(root))
+
+    # The uppercase constants declared at the top level with a literal whose name nothing else declares or assigns to
+    def find_constants(self, program: ProgramNode) -> dict:
+        declared = {}
+        rebound = set()
+        for node in self.nodes(program):
+            if isinstance(node, VariableDeclarationExpressionNode):
+                declared[node.identifier] = declared.get(node.identifier, 0) + 1
+            elif isinstance(node, FunctionDeclarationExpressionNode):
+                declared[node.name] = declared.get(node.name, 0) + 1
+                for parameter in node.parameters:
+                    declared[parameter.symbol] = declared.get(parameter.symbol, 0) + 1
+            elif isinstance(node, ImportNode):
+                for name in node.names:
+                    if isinstance(name, IdentifierNode):
+                        declared[name.symbol] = declared.get(name.symbol, 0) + 1
+            elif isinstance(node, (AssignmentExpressionNode, AssignmentBinaryExpressionNode)) and isinstance(node.assigne, IdentifierNode):
+                rebound.add(node.assigne.symbol)
+            elif isinstance(node, DeleteNode):
+                rebound.add(node.variable)
+
+        return {
+            statement.identifier: statement.value
+            for statement in program.body
+            if isinstance(statement, VariableDeclarationExpressionNode) and statement.constant
+            and isinstance(statement.value, FOLDABLE)
+            and declared[statement.identifier] == 1 and statement.identifier not in rebound
+        }
+
+    def rewrite(self, node):
+        if isinstance(node, list):
+            return self.rewrite_list(node)
+        if not isinstance(node, ASTNode):
+            return node
+        # Errors are reported at the position of the value, which is where the constant's literal is
+        if type(node) is IdentifierNode and node.symbol in self.inline:
+            literal = self.inline[node.symbol]
+            return type(literal)(literal.value, literal.line, literal.column)
+
+        inline = self.inline
+        if isinstance(node, FunctionDeclarationExpressionNode):
+            self.inline = self.constants
+        elif isinstance(node, ProgramNode):
+            self.inline = {}
+
+        changes = {}
+        for field in self.resolver.node_fields(type(node)):
+            if (type(node), field) in KEEP:
+                continue
+            value = getattr(node, field, None)
+            kind = BLOCKS.get((type(node), field))
+            new = self.rewrite_block(value, kind) if kind is not None and isinstance(value, list) else self.rewrite(value)
+            if new is not value:
+                changes[field] = new
+        self.inline = inline
+
+        if changes:
+            node = copy.copy(node)
+            for field, value in changes.items():
+                setattr(node, field, value)
+        if type(node) is BinaryExpressionNode:
+            return self.fold(node)
+        return node
+
+    def rewrite_list(self, nodes: list) -> list:
+        new = [self.rewrite(node) for node in nodes]
+        return nodes if all(a is b for a, b in zip(new, nodes)) else new
+
+    def rewrite_block(self, statements: list, kind: str) -> list:
+        block = []
+        for index, statement in enumerate(statements):
+            statement = self.rewrite(statement)
+            if kind == "program" and isinstance(statement, VariableDeclarationExpressionNode) and statement.identifier in self.constants:
+                self.inline = {**self.inline, statement.identifier: self.constants[statement.identifier]}
+
+            if type(statement) is IfStatementNode:
+                branch = self.taken_branch(statement)
+                if branch is not None:
+                    block.extend(branch)
+                    # A program evaluates to its last statement, which was the if statement
+                    if kind == "program" and index == len(statements) - 1 and not branch:
+                        block.append(NullLiteralNode(statement.line, statement.column))
+                    continue
+
+            block.append(statement)
+            if isinstance(statement, ENDS.get(kind, ())):
+                break
+
+        if len(block) == len(statements) and all(a is b for a, b in zip(block, statements)):
+            return statements
+        return block
+
+    # The statements that can replace an if statement whose condition is made of literals, None when it
+    # has to stay. Statements that end a block or give a value to the caller act differently outside it.
+    def taken_branch(self, statement: IfStatementNode) -> list | None:
+        left = self.constant_value(statement.left_condition)
+        right = NULL if isinstance(statement.right_condition, NullValue) else self.constant_value(statement.right_condition)
+        if left is None or right is None:
+            return None
+
+        branch = statement.body if self.interpreter.check_condition(left, statement.operand, right) else statement.else_body
+        for node in self.resolver.walk(branch):
+            if isinstance(node, (ReturnNode, BreakNode, ContinueNode, ExportNode)):
+                return None
+        return branch
+
+    def constant_value(self, node) -> RuntimeValue | None:
+        if isinstance(node, (*FOLDABLE, NullLiteralNode)):
+            return self.interpreter.evaluate(node, None)
+        if type(node) is IdentifierNode and node.symbol in CONSTANTS:
+            return CONSTANTS[node.symbol]
+        return None
+
+    def fold(self, node: BinaryExpressionNode) -> ASTNode:
+        if not (isinstance(node.left, FOLDABLE) and isinstance(node.right, FOLDABLE)):
+            return node
+        left = self.interpreter.evaluate(node.left, None)
+        right = self.interpreter.evaluate(node.right, None)
+        if node.operand == "^" and type(left.value) is int and type(right.value) is int:
+            if abs(left.value).bit_length() * right.value > MAX_BITS:
+                return node
+
+        try:
+            value = self.interpreter.evaluate_binary_operation(left, right, node.operand)
+        except ArithmeticError:
+            return node
+        # Errors stay where the program reports them when it gets there
+        literal = LITERALS.get(type(value))
+        if literal is None or (type(value.value) is int and value.value.bit_length() > MAX_BITS):
+            return node
+        # The literal makes values at the position of the value the interpreter would have made
+        return literal(value.value, value.line, value.column)
@@ -0,0 +1,234 @@
+from frontend.ASTNodes import *
+from frontend.Parser import LazyBody
+from frontend.Error import Error
+from backend.Resolver import Resolver
+from backend.Environment import BUILTIN_NAMES
+
+# Builtins whose result or effect depends on more than their arguments
+IMPURE_BUILTINS = {"output", "input", "readFile", "wait", "now", "eval", "memoize", "memoInfo"}
+# Methods of the builtin values, by whether they change the value they are called on
+PURE_METHODS = {"length", "join", "format", "items", "keys", "values", "hasAttr"}
+MUTATING_METHODS = {"append", "update"}
+# Literals a constant can be read from a pure function with
+SCALAR_LITERALS = (IntegerLiteralNode, RealLiteralNode, StringLiteralNode, NullLiteralNode)
+
+
+# Whether a function declaration is pure, and why not when it isn't
+class FunctionPurity:
+    def __init__(self, declaration: FunctionDeclarationExpressionNode) -> None:
+        self.declaration = declaration
+        self.name = declaration.name
+        self.reasons = []
+        # Declarations of the functions the body calls
+        self.calls = []
+
+    @property
+    def pure(self) -> bool:
+        return not self.reasons
+
+    def __repr__(self) -> str:
+        return str({
+            "name": self.name,
+            "line": self.declaration.line,
+            "pure": self.pure,
+            "reasons": self.reasons
+        })
+
+
+# Finds out which function declarations of a program are pure: calling them with the same arguments
+# always gives the same result and changes nothing outside the call. A function isn't pure when it
+# uses an impure builtin, imports a module, assigns to or deletes a variable it didn't declare,
+# changes an array or object it didn't make itself, reads a variable it didn't declare, or calls
+# a function that isn't pure.
+# Phi is dynamically scoped, so a name used in a body is only known to be the function it looks
+# like when the whole program declares that name once, never assigns to it and declares it at the
+# top level or in the body itself. Functions called through anything else can't be vouched for.
+class PurityAnalyzer:
+    def __init__(self) -> None:
+        self.resolver = Resolver()
+
+    def analyze(self, program: ProgramNode) -> list[FunctionPurity]:
+        declarations = []
+        bodies = {}
+        declared = {}
+        rebound = set()
+
+        pending = [program.body]
+        while pending:
+            for node in self.resolver.walk(pending.pop()):
+                if isinstance(node, FunctionDeclarationExpressionNode):
+                    declarations.append(node)
+                    body = self.body(node)
+                    bodies[id(node)] = body
+                    if body is not None:
+                        pending.append(body)
+                    declared.setdefault(node.name, []).append(node)
+                    for parameter in node.parameters:
+                        declared.setdefault(parameter.symbol, []).append(parameter)
+                elif isinstance(node, VariableDeclarationExpressionNode):
+                    declared.setdefault(node.identifier, []).append(node)
+                elif isinstance(node, ImportNode):
+                    for name in node.names:
+                        if isinstance(name, IdentifierNode):
+                            declared.setdefault(name.symbol, []).append(name)
+                elif isinstance(node, (AssignmentExpressionNode, AssignmentBinaryExpressionNode)) and isinstance(node.assigne, IdentifierNode):
+                    rebound.add(node.assigne.symbol)
+                elif isinstance(node, DeleteNode):
+                    rebound.add(node.variable)
+
+        # Names every function body can rely on, declared once at the top level
+        top_level = {
+            node.name if isinstance(node, FunctionDeclarationExpressionNode) else node.identifier: node
+            for node in program.body
+            if isinstance(node, (FunctionDeclarationExpressionNode, VariableDeclarationExpressionNode))
+        }
+        unique = {
+            name: nodes[0] for name, nodes in declared.items()
+            if len(nodes) == 1 and name not in rebound and name != "~"
+        }
+        globals_ = {name: node for name, node in top_level.items() if unique.get(name) is node}
+
+        results = {}
+        for declaration in declarations:
+            purity = FunctionPurity(declaration)
+            body = bodies[id(declaration)]
+            if body is None:
+                purity.reasons.append("its body doesn't parse")
+            else:
+                self.analyze_body(purity, body, globals_)
+            results[id(declaration)] = purity
+
+        # A function calling an impure function is impure as well, until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            for purity in results.values():
+                if not purity.pure:
+                    continue
+                for callee in purity.calls:
+                    if not results[id(callee)].pure:
+                        purity.reasons.append(f"calls '{callee.name}', which isn't pure")
+                        changed = True
+                        break
+
+        return [results[id(declaration)] for declaration in declarations]
+
+    def body(self, declaration: FunctionDeclarationExpressionNode) -> list | None:
+        if isinstance(declaration.body, LazyBody):
+            body = declaration.body.parse()
+            return None if isinstance(body, Error) else body
+        return declaration.body
+
+    def scalar_constant(self, node) -> bool:
+        return isinstance(node, VariableDeclarationExpressionNode) and node.constant and isinstance(node.value, SCALAR_LITERALS)
+
+    def analyze_body(self, purity: FunctionPurity, body: list, globals_: dict) -> None:
+        declaration = purity.declaration
+        parameters = {parameter.symbol for parameter in declaration.parameters}
+        locals_ = set(parameters)
+        declarations = {}
+        assigned = set()
+        for node in self.resolver.walk(body):
+            if isinstance(node, VariableDeclarationExpressionNode):
+                declarations.setdefault(node.identifier, []).append(node)
+            elif isinstance(node, FunctionDeclarationExpressionNode):
+                declarations.setdefault(node.name, []).append(node)
+            elif isinstance(node, (AssignmentExpressionNode, AssignmentBinaryExpressionNode)) and isinstance(node.assigne, IdentifierNode):
+                assigned.add(node.assigne.symbol)
+            elif isinstance(node, DeleteNode):
+                assigned.add(node.variable)
+        locals_.update(declarations)
+
+        # Names the body declares once and never assigns to keep what they were declared with
+        settled = {
+            name: nodes[0] for name, nodes in declarations.items()
+            if len(nodes) == 1 and name not in assigned and name not in parameters and name != "~"
+        }
+        functions = {name: node for name, node in settled.items() if isinstance(node, FunctionDeclarationExpressionNode)}
+        # Local arrays and objects made by the body, changing them is not seen outside the call
+        fresh = {name for name, node in settled.items() if isinstance(node, VariableDeclarationExpressionNode) and isinstance(node.value, (ArrayLiteralNode, ObjectLiteralNode))}
+
+        def reason(text: str) -> None:
+            if text not in purity.reasons:
+                purity.reasons.append(text)
+
+        def changes(target) -> None:
+            while isinstance(target, MemberExpressionNode):
+                target = target.object
+            if not (isinstance(target, IdentifierNode) and target.symbol in fresh):
+                reason("changes an array or object it didn't make")
+
+        def function(symbol: str) -> FunctionDeclarationExpressionNode | None:
+            if symbol in locals_:
+                return functions.get(symbol)
+            node = globals_.get(symbol)
+            return node if isinstance(node, FunctionDeclarationExpressionNode) else None
+
+        # Identifiers that name something other than a variable being read
+        skip = set()
+        for node in self.resolver.walk(body):
+            if id(node) in skip:
+                continue
+
+            if isinstance(node, IdentifierNode):
+                symbol = node.symbol
+                if symbol in locals_ and symbol not in functions:
+                    continue
+                if symbol in BUILTIN_NAMES:
+                    if symbol in IMPURE_BUILTINS:
+                        reason(f"uses '{symbol}'")
+                elif (callee := function(symbol)) is not None:
+                    purity.calls.append(callee)
+                elif not self.scalar_constant(globals_.get(symbol)):
+                    reason(f"reads '{symbol}', which it doesn't declare")
+
+            elif isinstance(node, FunctionDeclarationExpressionNode):
+                skip.update(id(parameter) for parameter in node.parameters)
+
+            elif isinstance(node, MemberExpressionNode):
+                if node.computed:
+                    skip.add(id(node.property))
+
+            elif isinstance(node, CallExpression):
+                caller = node.caller
+                if isinstance(caller, MemberExpressionNode) and caller.computed and isinstance(caller.property, IdentifierNode):
+                    method = caller.property.symbol
+                    if method in MUTATING_METHODS:
+                        changes(caller.object)
+                    elif method not in PURE_METHODS:
+                        reason(f"calls the method '{method}'")
+                elif isinstance(caller, IdentifierNode):
+                    if caller.symbol not in BUILTIN_NAMES and function(caller.symbol) is None:
+                        reason(f"calls '{caller.symbol}', which isn't a declared function")
+                        skip.add(id(caller))
+                else:
+                    reason("calls a function it can't name")
+
+            elif isinstance(node, (AssignmentExpressionNode, AssignmentBinaryExpressionNode)):
+                if isinstance(node.assigne, IdentifierNode):
+                    if node.assigne.symbol not in locals_:
+                        reason(f"assigns to '{node.assigne.symbol}', which it doesn't declare")
+                        skip.add(id(node.assigne))
+                else:
+                    changes(node.assigne)
+
+            elif isinstance(node, DeleteNode):
+                if node.variable not in locals_:
+                    reason(f"deletes '{node.variable}', which it doesn't declare")
+
+            elif isinstance(node, ImportNode):
+                reason("imports a module")
+                skip.update(id(name) for name in node.names)
+
+
+# The bodies of the pure functions of an analysis, by id. Each entry keeps its body alive so the id
+# isn't reused while it is looked up.
+def pure_bodies(results: list[FunctionPurity]) -> dict:
+    bodies = {}
+    for purity in results:
+        if purity.pure:
+            body = purity.declaration.body
+            if isinstance(body, LazyBody):
+                body = body.statements
+            bodies[id(body)] = body
+    return bodies
@@ -0,0 +1,728 @@
+from frontend.ASTNodes import *
+from frontend.Error import *
+from frontend.Parser import LazyBody
+from backend.RuntimeValue import *
+from backend.Environment import CallFrame, Environment
+from backend.Interpreter import Interpreter, value_type_table
+from backend.Functions import call_memoized
+from backend.ClosureCompiler import INTEGER_OPERATIONS, INTEGER_DIVISIONS, COMPARISONS, MISSING, lookup, integer_constant
+from backend.VirtualMachine import VirtualMachine, LITERALS
+import builtins
+import math
+
+# What the value a node leaves can be besides an ordinary value, for leaving out checks that can never succeed
+SIGNAL = 2
+
+NUMBER_TYPES = frozenset((IntegerValue, RealValue))
+
+# Turns a program into the source of a Python module. Every node becomes Python statements that
+# leave the value the Interpreter would have returned for it in a local variable, and every Error
+# is returned from the generated function as soon as it is made, the same as the Interpreter
+# returning it up to whatever stops it. Code whose Errors the Interpreter keeps as a value, try
+# bodies and Phi function bodies get generated functions of their own.
+class PythonTranslator:
+    def __init__(self, file_path: str = "") -> None:
+        self.file_path = file_path
+        self.functions = []
+        self.function_count = 0
+        # Values the generated code refers to by name, mostly AST nodes for the runtime helpers
+        self.constants = {}
+        self.constant_names = {}
+        self.lines = []
+        self.indentation = 0
+        self.temporaries = 0
+        self.line = None
+        # False while compiling code whose Error is kept as its value
+        self.checked = True
+
+        self.compilers = {
+            BinaryExpressionNode: self.compile_binary_expression,
+            IdentifierNode: self.compile_identifier_expression,
+            AssignmentExpressionNode: self.compile_assignment_expression,
+            VariableDeclarationExpressionNode: self.compile_variable_declaration_expression,
+            FunctionDeclarationExpressionNode: self.compile_function_declaration,
+            ObjectLiteralNode: self.compile_object_expression,
+            CallExpression: self.compile_call_expression,
+            IfStatementNode: self.compile_if_statement,
+            WhileStatementNode: self.compile_while_statement,
+            ForStatementNode: self.compile_for_statement,
+            ForEachStatementNode: self.compile_for_each_statement,
+            ArrayLiteralNode: self.compile_array_expression,
+            ReturnNode: self.compile_return_expression,
+            AssignmentBinaryExpressionNode: self.compile_assignment_binary_expression,
+            ExportNode: self.compile_export_expression,
+            TryNode: self.compile_try_statement,
+            IntegerLiteralNode: self.compile_literal,
+            RealLiteralNode: self.compile_literal,
+            StringLiteralNode: self.compile_literal,
+            UnknownLiteralNode: self.compile_literal,
+            NullLiteralNode: self.compile_null_literal,
+        }
+
+    def source(self) -> str:
+        return "\n\n".join(self.functions) + "\n"
+
+    def constant(self, value) -> str:
+        name = self.constant_names.get(id(value))
+        if name is None:
+            name = f"k{len(self.constants)}"
+            self.constants[name] = value
+            self.constant_names[id(value)] = name
+        return name
+
+    def temporary(self) -> str:
+        self.temporaries += 1
+        return f"t{self.temporaries}"
+
+    def emit(self, line: str) -> None:
+        self.lines.append("    " * self.indentation + line)
+
+    # Generates a module level function taking the environment, body emits its statements
+    def function(self, prefix: str, body) -> str:
+        self.function_count += 1
+        name = f"{prefix}_{self.function_count}"
+        saved = (self.lines, self.indentation, self.line, self.checked)
+        self.lines, self.indentation, self.line, self.checked = [f"def {name}(env):"], 1, None, True
+
+        self.emit("variables = env.variables")
+        body()
+        self.functions.append("\n".join(self.lines))
+
+        self.lines, self.indentation, self.line, self.checked = saved
+        return name
+
+    def check(self, target: str) -> None:
+        if self.checked:
+            self.emit(f"if isinstance({target}, Error): return {target}")
+
+    def translate_program(self, program: ProgramNode) -> str:
+        return self.function("program", lambda: self.compile_program_body(program.body))
+
+    def translate_function(self, name: str, body: list) -> str:
+        return self.function("function", lambda: self.compile_function_body(body))
+
+    def statement(self, statement, target: str) -> int:
+        line = getattr(statement, "line", None)
+        if isinstance(line, int) and line > 0 and line != self.line:
+            self.line = line
+            self.emit(f"# Ln {line}")
+        return self.compile(statement, target)
+
+    # Emits the code leaving the value of the node in target and returns its SIGNAL flag
+    def compile(self, astNode, target: str) -> int:
+        compiler = self.compilers.get(type(astNode))
+        if compiler is not None:
+            return compiler(astNode, target)
+        return self.delegate("evaluate", astNode, target)
+
+    def delegate(self, method: str, astNode, target: str) -> int:
+        self.emit(f"{target} = interpreter.{method}({self.constant(astNode)}, env)")
+        self.check(target)
+        return SIGNAL
+
+    # Errors of the node end up as its value instead of being returned
+    def compile_unchecked(self, astNode, target: str) -> None:
+        if single_operation(astNode):
+            checked = self.checked
+            self.checked = False
+            self.compile(astNode, target)
+            self.checked = checked
+            return
+
+        def body():
+            self.compile(astNode, "v")
+            self.emit("return v")
+        self.emit(f"{target} = {self.function('unchecked', body)}(env)")
+
+    def compile_program_body(self, body: list) -> None:
+        if body == []:
+            self.emit("v = NULL")
+        for statement in body:
+            self.statement(statement, "v")
+        self.emit("return v")
+
+    # Only return statements at the top of the body end a call, the ones in nested blocks are plain values
+    def compile_function_body(self, body: list) -> None:
+        for statement in body:
+            self.statement(statement, "v")
+            if isinstance(statement, ReturnNode):
+                self.emit("return v")
+                return
+        self.emit("return NULL")
+
+    # Python expressions for the value of a literal node and for the runtime value it evaluates to
+    def literal_value(self, literal) -> str:
+        value = literal.value
+        if type(value) in (int, str) or (type(value) is float and math.isfinite(value)):
+            return repr(value)
+        return f"{self.constant(literal)}.value"
+
+    def literal(self, literal) -> str:
+        return f"{LITERALS[type(literal)].__name__}({self.literal_value(literal)}, {literal.line!r}, {literal.column!r})"
+
+    def compile_literal(self, literal, target: str) -> int:
+        self.emit(f"{target} = {self.literal(literal)}")
+        return 0
+
+    def compile_null_literal(self, literal: NullLiteralNode, target: str) -> int:
+        self.emit(f"{target} = NULL")
+        return 0
+
+    # The value of a variable, or MISSING when it is not declared. Declaring '~' again is allowed,
+    # so it can be a constant and a variable of the same scope at once and needs the full lookup.
+    def load(self, name: str) -> str:
+        if name == "~":
+            return f"lookup(env, {name!r})"
+        return f"variables[{name!r}] if {name!r} in variables else lookup(env, {name!r})"
+
+    def compile_identifier_expression(self, identifier: IdentifierNode, target: str) -> int:
+        self.emit(f"{target} = {self.load(identifier.symbol)}")
+        missing = f"env.lookup({self.constant(identifier)})"
+        self.emit(f"if {target} is MISSING: {'return' if self.checked else f'{target} ='} {missing}")
+        return 0
+
+    # Python arithmetic on the unboxed values of a tree of integer operations on variables and
+    # integer literals, with the variables it reads added to leaves. None when the tree has
+    # another node or an operation that can fail.
+    def unboxed(self, astNode, leaves: list) -> str | None:
+        if type(astNode) is IntegerLiteralNode and type(astNode.value) is int:
+            return repr(astNode.value)
+        if type(astNode) is IdentifierNode:
+            temporary = self.temporary()
+            leaves.append((temporary, astNode.symbol))
+            return f"{temporary}.value"
+        if type(astNode) is not BinaryExpressionNode:
+            return None
+
+        if astNode.operand in INTEGER_DIVISIONS and integer_constant(astNode.right) not in (None, 0):
+            leaves.append(None)
+        elif astNode.operand not in INTEGER_OPERATIONS:
+            return None
+
+        left = self.unboxed(astNode.left, leaves)
+        right = self.unboxed(astNode.right, leaves) if left is not None else None
+        if right is None:
+            return None
+        return f"({left} {astNode.operand} {right})"
+
+    # Emits the loads of the leaves and the start of an if statement taking the fast path when all
+    # of them are integers, or any numbers for trees without divisions. Returns the Python class
+    # name for the result of each fast path.
+    def unboxed_paths(self, leaves: list) -> list:
+        variables = [leaf for leaf in leaves if leaf is not None]
+        for temporary, name in variables:
+            self.emit(f"{temporary} = {self.load(name)}")
+
+        paths = [("if", " and ".join(f"type({temporary}) is IntegerValue" for temporary, _ in variables), "integer_value")]
+        if None not in leaves:
+            paths.append(("elif", " and ".join(f"type({temporary}) in NUMBER_TYPES" for temporary, _ in variables), "RealValue"))
+        return paths
+
+    def compile_binary_expression(self, binary_operation: BinaryExpressionNode, target: str) -> int:
+        leaves = []
+        expression = self.unboxed(binary_operation, leaves)
+        if expression is None or not any(leaves):
+            self.compile_binary_operation(binary_operation, target)
+            return 0
+
+        for keyword, condition, value_type in self.unboxed_paths(leaves):
+            self.emit(f"{keyword} {condition}: {target} = {value_type}({expression})")
+        self.emit("else:")
+        self.indentation += 1
+        self.compile_binary_operation(binary_operation, target)
+        self.indentation -= 1
+        return 0
+
+    # Both sides evaluated in order, then the type dispatch of Interpreter.evaluate_binary_expression
+    def compile_binary_operation(self, binary_operation: BinaryExpressionNode, target: str) -> None:
+        operand = binary_operation.operand
+        left = self.temporary()
+        self.compile(binary_operation.left, left)
+        right = self.temporary()
+        self.compile(binary_operation.right, right)
+
+        if operand in INTEGER_OPERATIONS or operand in INTEGER_DIVISIONS:
+            condition = f"type({left}) is IntegerValue and type({right}) is IntegerValue"
+            if operand in INTEGER_DIVISIONS:
+                condition += f" and {right}.value != 0"
+            self.emit(f"if {condition}: {target} = integer_value({left}.value {operand} {right}.value)")
+            self.emit("else:")
+            self.indentation += 1
+            self.emit(f"{target} = binary({left}, {right}, {operand!r})")
+            self.check(target)
+            self.indentation -= 1
+        else:
+            self.emit(f"{target} = binary({left}, {right}, {operand!r})")
+            self.check(target)
+
+    # Returns a Python expression for whether the condition holds
+    def compile_condition(self, left_condition, operand: str, right_condition) -> str:
+        result = self.temporary()
+
+        if operand in COMPARISONS and not isinstance(right_condition, NullValue):
+            leaves = []
+            left = self.unboxed(left_condition, leaves)
+            right = self.unboxed(right_condition, leaves) if left is not None else None
+            if right is not None and any(leaves):
+                for keyword, condition, _ in self.unboxed_paths(leaves):
+                    self.emit(f"{keyword} {condition}: {result} = {left} {operand} {right}")
+                self.emit("else:")
+                self.indentation += 1
+                self.compile_compare(left_condition, operand, right_condition, result)
+                self.indentation -= 1
+                return result
+
+        self.compile_compare(left_condition, operand, right_condition, result)
+        return result
+
+    def compile_compare(self, left_condition, operand: str, right_condition, result: str) -> None:
+        left = self.temporary()
+        self.compile(left_condition, left)
+        compare = operand in COMPARISONS
+
+        if isinstance(right_condition, NullValue):
+            self.emit(f"{result} = check_condition({left}, {operand!r}, NULL)")
+        elif type(right_condition) in (IntegerLiteralNode, RealLiteralNode) and compare:
+            value = self.literal_value(right_condition)
+            self.emit(f"{result} = ({left}.value {operand} {value}) if type({left}) in NUMBER_TYPES else check_condition({left}, {operand!r}, {self.literal(right_condition)})")
+        else:
+            right = self.temporary()
+            self.compile(right_condition, right)
+            if compare:
+                self.emit(f"{result} = ({left}.value {operand} {right}.value) if type({left}) in NUMBER_TYPES and type({right}) in NUMBER_TYPES else check_condition({left}, {operand!r}, {right})")
+            else:
+                self.emit(f"{result} = check_condition({left}, {operand!r}, {right})")
+
+    def compile_assignment_expression(self, assignment_expression: AssignmentExpressionNode, target: str) -> int:
+        if not isinstance(assignment_expression.assigne, IdentifierNode):
+            return self.delegate("evaluate", assignment_expression, target)
+
+        current = self.temporary()
+        self.compile_identifier_expression(assignment_expression.assigne, current)
+        value = self.temporary()
+        self.compile(assignment_expression.value, value)
+        self.emit(f"{target} = assign({self.constant(assignment_expression.assigne)}, {current}, {value}, env)")
+        self.check(target)
+        return 0
+
+    def compile_variable_declaration_expression(self, declaration: VariableDeclarationExpressionNode, target: str) -> int:
+        value = self.temporary()
+        self.compile(declaration.value, value)
+        self.emit(f"{target} = declare({self.constant(declaration)}, {value}, env)")
+        self.check(target)
+        return 0
+
+    # Loops declare their variable through evaluate_variable_declaration_expression whatever the node is
+    def compile_declaration(self, declaration) -> None:
+        if isinstance(declaration, VariableDeclarationExpressionNode):
+            self.compile_unchecked(declaration, self.temporary())
+        else:
+            self.emit(f"interpreter.evaluate_variable_declaration_expression({self.constant(declaration)}, env)")
+
+    # Bodies are generated with the program, except lazy ones which are generated on their first call
+    def compile_function_declaration(self, declaration: FunctionDeclarationExpressionNode, target: str) -> int:
+        function = "None"
+        if isinstance(declaration.body, list):
+            function = self.translate_function(declaration.name, declaration.body)
+        self.emit(f"{target} = make_function({self.constant(declaration)}, {function}, env)")
+        self.check(target)
+        return 0
+
+    def compile_object_expression(self, object: ObjectLiteralNode, target: str) -> int:
+        values = []
+        for prop in object.properties:
+            value = self.temporary()
+            self.compile(prop.value, value)
+            values.append((prop.key, value))
+        self.emit(f"{target} = ObjectValue({self.dictionary(values)}, {object.line!r}, {object.column!r})")
+        return 0
+
+    def compile_array_expression(self, array: ArrayLiteralNode, target: str) -> int:
+        values = []
+        for item in array.items:
+            value = self.temporary()
+            self.compile_unchecked(item.value, value)
+            values.append((item.index, value))
+        self.emit(f"{target} = ArrayValue({self.dictionary(values)}, {array.line!r}, {array.column!r})")
+        return 0
+
+    def dictionary(self, items: list) -> str:
+        if all(type(key) in (int, str) for key, _ in items):
+            return "{" + ", ".join(f"{key!r}: {value}" for key, value in items) + "}"
+        keys = self.constant(tuple(key for key, _ in items))
+        return f"dict(zip({keys}, ({''.join(f'{value}, ' for _, value in items)})))"
+
+    def compile_export_expression(self, export_expression: ExportNode, target: str) -> int:
+        value = self.temporary()
+        self.compile_unchecked(export_expression.value, value)
+        self.emit(f"{target} = ExportValue({value}, {export_expression.line!r}, {export_expression.column!r})")
+        return 0
+
+    def compile_call_expression(self, call_expression: CallExpression, target: str) -> int:
+        arguments = []
+        for arg in call_expression.arguments:
+            value = self.temporary()
+            self.compile(arg, value)
+            arguments.append(value)
+        fn = self.temporary()
+        self.compile(call_expression.caller, fn)
+        self.emit(f"{target} = call({fn}, [{', '.join(arguments)}], env)")
+        self.check(target)
+        return SIGNAL
+
+    def compile_return_expression(self, return_expression: ReturnNode, target: str) -> int:
+        return self.compile(return_expression.value, target)
+
+    def compile_assignment_binary_expression(self, expr: AssignmentBinaryExpressionNode, target: str) -> int:
+        if not isinstance(expr, AssignmentBinaryExpressionNode) or not isinstance(expr.assigne, IdentifierNode):
+            return self.delegate("evaluate_assignment_binary_expression", expr, target)
+
+        name = expr.assigne.symbol
+        operand = expr.operand[0]
+        leaves = []
+        value = self.unboxed(expr.value, leaves) if operand in INTEGER_OPERATIONS and name != "~" else None
+
+        # Adding an integer expression to an integer variable of the current scope needs no boxing in between
+        if value is not None:
+            leaves = [leaf for leaf in leaves if leaf is not None]
+            current = self.temporary()
+            self.emit(f"{current} = variables.get({name!r})")
+            for temporary, leaf in leaves:
+                self.emit(f"{temporary} = {self.load(leaf)}")
+            condition = " and ".join(f"type({temporary}) is IntegerValue" for temporary in [current] + [leaf[0] for leaf in leaves])
+            self.emit(f"if {condition}: {target} = variables[{name!r}] = IntegerValue({current}.value {operand} {value}, {expr.line!r}, {expr.column!r})")
+            self.emit("else:")
+            self.indentation += 1
+            self.compile_augmented_assignment(expr, target)
+            self.indentation -= 1
+            return 0
+
+        self.compile_augmented_assignment(expr, target)
+        return 0
+
+    def compile_augmented_assignment(self, expr: AssignmentBinaryExpressionNode, target: str) -> None:
+        if type(expr.value) in LITERALS:
+            self.emit(f"{target} = augmented_store({self.constant(expr)}, None, {self.literal(expr.value)}, env)")
+            self.check(target)
+            return
+
+        current = self.temporary()
+        self.emit(f"{current} = augmented_load({self.constant(expr)}, env)")
+        self.check(current)
+        value = self.temporary()
+        self.compile(expr.value, value)
+        self.emit(f"{target} = augmented_store({self.constant(expr)}, {current}, {value}, env)")
+        self.check(target)
+
+    def compile_if_statement(self, if_statement: IfStatementNode, target: str) -> int:
+        condition = self.compile_condition(if_statement.left_condition, if_statement.operand, if_statement.right_condition)
+
+        self.emit(f"if {condition}:")
+        self.indentation += 1
+        flags = self.compile_if_body(if_statement.body, target)
+        self.indentation -= 1
+        self.emit("else:")
+        self.indentation += 1
+        if if_statement.else_body != []:
+            flags |= self.compile_if_body(if_statement.else_body, target)
+        else:
+            self.emit(f"{target} = NULL")
+        self.indentation -= 1
+        return flags
+
+    # Break and continue statements are the value of the if statement, for the loop around it to act on
+    def compile_if_body(self, statements: list, target: str) -> int:
+        for statement in statements:
+            if isinstance(statement, (ContinueNode, BreakNode)):
+                self.emit(f"{target} = {self.constant(statement)}")
+                return SIGNAL
+            self.statement(statement, target)
+        self.emit(f"{target} = NULL")
+        return 0
+
+    # A break value leaves the Python loop with it as the result, a continue value runs next and
+    # goes on with the loop. Loops stop at break and return statements in their own body and keep
+    # the previous result.
+    def compile_loop_body(self, statements: list, target: str, next) -> int:
+        flags = 0
+        for index, statement in enumerate(statements):
+            if isinstance(statement, (Error, ReturnNode, BreakNode)):
+                if index == 0:
+                    self.emit(f"{target} = NULL")
+                self.emit("break")
+                return flags
+
+            if self.statement(statement, target) & SIGNAL:
+                flags = SIGNAL
+                self.emit(f"if isinstance({target}, BreakNode): break")
+                self.emit(f"if isinstance({target}, ContinueNode):")
+                self.indentation += 1
+                next()
+                self.emit("continue")
+                self.indentation -= 1
+
+        next()
+        return flags
+
+    def compile_while_statement(self, while_statement: WhileStatementNode, target: str) -> int:
+        self.emit("while True:")
+        self.indentation += 1
+        condition = self.compile_condition(while_statement.left_condition, while_statement.operand, while_statement.right_condition)
+
+        # The else body runs inside a loop of its own that a break or continue value leaves early
+        self.emit(f"if not {condition}:")
+        self.indentation += 1
+        flags = 0
+        if while_statement.else_body != []:
+            self.emit("while True:")
+            self.indentation += 1
+            for statement in while_statement.else_body:
+                if self.statement(statement, target) & SIGNAL:
+                    flags = SIGNAL
+                    self.emit(f"if isinstance({target}, BreakNode): break")
+                    self.emit(f"if isinstance({target}, ContinueNode):")
+                    self.emit(f"    {target} = NULL")
+                    self.emit("    break")
+            self.emit(f"{target} = NULL")
+            self.emit("break")
+            self.indentation -= 1
+        else:
+            self.emit(f"{target} = NULL")
+        self.emit("break")
+        self.indentation -= 1
+
+        flags |= self.compile_loop_body(while_statement.body, target, lambda: None)
+        self.indentation -= 1
+        return flags
+
+    def compile_for_statement(self, for_statement: ForStatementNode, target: str) -> int:
+        self.compile_declaration(for_statement.declaration)
+
+        self.emit("while True:")
+        self.indentation += 1
+        condition = self.compile_condition(for_statement.left_condition, for_statement.operand, for_statement.right_condition)
+        self.emit(f"if not {condition}:")
+        self.emit(f"    {target} = NULL")
+        self.emit("    break")
+
+        flags = self.compile_loop_body(for_statement.body, target, self.compile_step(for_statement.step))
+        self.indentation -= 1
+        return flags
+
+    # Returns what emits the step, which runs at the end of the body and before each continue
+    def compile_step(self, step):
+        if not isinstance(step, AssignmentBinaryExpressionNode):
+            return lambda: self.emit(f"interpreter.evaluate_assignment_binary_expression({self.constant(step)}, env)")
+
+        target = self.temporary()
+        if single_operation(step):
+            return lambda: self.compile_unchecked(step, target)
+
+        def body():
+            self.compile(step, "v")
+            self.emit("return v")
+        function = self.function("unchecked", body)
+        return lambda: self.emit(f"{target} = {function}(env)")
+
+    def compile_for_each_statement(self, for_each_statement: ForEachStatementNode, target: str) -> int:
+        self.compile_declaration(for_each_statement.declaration)
+        iterable = self.temporary()
+        self.compile_unchecked(for_each_statement.iterable, iterable)
+        item = self.temporary()
+
+        self.emit(f"{iterable} = {iterable}.items")
+        self.emit(f"for {item} in ({iterable}[key].value for key in {iterable}):")
+        self.indentation += 1
+        self.emit(f"{target} = assign_each({self.constant(for_each_statement.declaration)}, {item}, env)")
+        self.check(target)
+        flags = self.compile_loop_body(for_each_statement.body, target, lambda: None)
+        self.indentation -= 1
+        self.emit("else:")
+        self.emit(f"    {target} = NULL")
+        return flags
+
+    # The try body is a function of its own, so an Error anywhere in it comes back as its result.
+    # The catch body runs when the type of that Error matches and otherwise the Error is returned.
+    def compile_try_statement(self, try_statement: TryNode, target: str) -> int:
+        self.emit(f"{target} = {self.function('try', lambda: self.compile_try_body(try_statement.try_body))}(env)")
+        self.emit(f"if isinstance({target}, Error) and {target}.type == {try_statement.exception.symbol!r}:")
+        self.indentation += 1
+
+        # Leaving the loop early keeps the value, running the catch body to its end leaves no result
+        self.emit("while True:")
+        self.indentation += 1
+        for statement in try_statement.except_body:
+            if isinstance(statement, (Error, BreakNode)):
+                self.emit(f"{target} = {self.constant(statement)}")
+                self.emit("break")
+                break
+            if isinstance(statement, ContinueNode):
+                self.emit(f"{target} = None")
+                self.emit("break")
+                break
+            if self.statement(statement, target) & SIGNAL:
+                self.emit(f"if isinstance({target}, BreakNode): break")
+                self.emit(f"if isinstance({target}, ContinueNode):")
+                self.emit(f"    {target} = None")
+                self.emit("    break")
+        else:
+            self.emit(f"{target} = None")
+            self.emit("break")
+        self.indentation -= 2
+
+        self.check(target)
+        return SIGNAL
+
+    def compile_try_body(self, statements: list) -> None:
+        index = 0
+        for index, statement in enumerate(statements):
+            if isinstance(statement, (ReturnNode, Error, BreakNode, ContinueNode)):
+                break
+            if self.statement(statement, "v") & SIGNAL:
+                self.emit("if isinstance(v, (BreakNode, ContinueNode)): return v")
+        else:
+            index = len(statements)
+
+        if index == 0:
+            self.emit("v = NULL")
+        self.emit("return v")
+
+# Nodes compiled to a single operation, whose Error can be kept as the value without leaving any code out
+def single_operation(astNode) -> bool:
+    if type(astNode) in LITERALS or type(astNode) in (NullLiteralNode, IdentifierNode):
+        return True
+    if type(astNode) is VariableDeclarationExpressionNode:
+        return type(astNode.value) in LITERALS or type(astNode.value) is NullLiteralNode
+    if type(astNode) is AssignmentBinaryExpressionNode:
+        return type(astNode.assigne) is IdentifierNode and type(astNode.value) in LITERALS
+    return False
+
+# Runs programs as Python functions compiled from the source PythonTranslator makes. Scopes are
+# still Environments, as Phi calls see the variables of their caller, and the operations the
+# generated code does not inline go through the helpers of a VirtualMachine. Programs Python
+# cannot compile, such as ones nested deeper than its parser allows, run on that VirtualMachine.
+class PythonCompiler:
+    def __init__(self, file_path: str = "") -> None:
+        self.file_path = file_path
+        self.machine = VirtualMachine(file_path)
+        self.interpreter = self.machine.interpreter
+        # Generated functions of function bodies by id of the body list, the list is kept so the id stays unique
+        self.function_code = {}
+
+        self.runtime = {
+            "IntegerValue": IntegerValue,
+            "RealValue": RealValue,
+            "StringValue": StringValue,
+            "UnknownValue": UnknownValue,
+            "NullValue": NullValue,
+            "NULL": NULL,
+            "integer_value": integer_value,
+            "ArrayValue": ArrayValue,
+            "ObjectValue": ObjectValue,
+            "ExportValue": ExportValue,
+            "Error": Error,
+            "BreakNode": BreakNode,
+            "ContinueNode": ContinueNode,
+            "NUMBER_TYPES": NUMBER_TYPES,
+            "MISSING": MISSING,
+            "lookup": lookup,
+            "interpreter": self.interpreter,
+            "check_condition": self.interpreter.check_condition,
+            "binary": self.machine.binary_operation,
+            "augmented_load": self.machine.augmented_load,
+            "augmented_store": self.augmented_store,
+            "assign_each": self.machine.assign_each,
+            "assign": self.assign,
+            "declare": self.declare,
+            "make_function": self.make_function,
+            "call": self.call,
+        }
+
+    def __str__(self) -> str:
+        return "Interpreter"
+
+    def evaluate(self, astNode: ASTNode, env: Environment) -> RuntimeValue | None:
+        if isinstance(astNode, ProgramNode):
+            program = self.load(lambda translator: translator.translate_program(astNode))
+            if program is None:
+                return self.machine.evaluate(astNode, env)
+            return program(env)
+        return self.interpreter.evaluate(astNode, env)
+
+    # Translates with generate and returns the generated function it names, None when Python cannot compile it
+    def load(self, generate):
+        translator = PythonTranslator(self.file_path)
+        try:
+            name = generate(translator)
+            code = compile(translator.source(), f"<phi {self.file_path}>", "exec")
+        except (builtins.SyntaxError, RecursionError, MemoryError):
+            return None
+
+        namespace = dict(self.runtime)
+        namespace.update(translator.constants)
+        exec(code, namespace)
+        return namespace[name]
+
+    def function_body(self, name: str, body: list):
+        compiled = self.function_code.get(id(body))
+        if compiled is None or compiled[0] is not body:
+            function = self.load(lambda translator: translator.translate_function(name, body))
+            if function is None:
+                code = self.machine.function_body(name, body)
+                function = lambda env: self.machine.execute(code, env)
+            compiled = (body, function)
+            self.function_code[id(body)] = compiled
+        return compiled[1]
+
+    def call(self, fn, args: list, env: Environment):
+        if type(fn) is MemoizedFunction:
+            return call_memoized(self.file_path, fn, self.call, args, env)
+        if isinstance(fn, NativeFunction):
+            return fn.call(args, env)
+        elif not isinstance(fn, Function):
+            return SyntaxError(self.file_path, self, f"'{fn.type}' is not a function", fn.column, fn.line)
+
+        scope = CallFrame(env)
+
+        if len(fn.parameters) == len(args):
+            for i in range(len(fn.parameters)):
+                scope.declare_variable(fn.parameters[i].symbol, args[i])
+        else:
+            if len(fn.parameters) > 0:
+                column = fn.parameters[-1].column
+                line = fn.parameters[-1].line
+            else:
+                column = fn.column
+                line = fn.line
+            return SyntaxError(self.file_path, self, f"Insufficient arguments provided. Expected {len(fn.parameters)}, but received {len(args)}\nExpected [{', '.join([i.symbol for i in fn.parameters])}]", column, line)
+
+        if isinstance(fn.body, LazyBody):
+            body = fn.body.parse()
+            if isinstance(body, Error):
+                return body
+            fn.body = body
+
+        return self.function_body(fn.name, fn.body)(scope)
+
+    def make_function(self, declaration: FunctionDeclarationExpressionNode, function, env: Environment):
+        if function is not None:
+            self.function_code[id(declaration.body)] = (declaration.body, function)
+        return env.declare_variable(declaration.name, Function(declaration.name, declaration.parameters, env, declaration.body))
+
+    def declare(self, declaration: VariableDeclarationExpressionNode, value, env: Environment):
+        if value.type in value_type_table[value.type]:
+            return env.declare_variable(declaration.identifier, value, declaration.constant)
+        return TypeError(self.file_path, self, f"'{value.type}' is incompatible with '{declaration.dataType}'", value.column, value.line)
+
+    def assign(self, identifier: IdentifierNode, current_value, value, env: Environment):
+        if value.type in value_type_table[value.type]:
+            return env.assign_variable(identifier.symbol, value)
+        return TypeError(self.file_path, self, f"'{value.type}' is incompatible with '{current_value.type}'", value.column, value.line)
+
+    # With a literal right hand side the current value is loaded here, left is None
+    def augmented_store(self, expr: AssignmentBinaryExpressionNode, left, right, env: Environment):
+        if left is None:
+            left = self.machine.augmented_load(expr, env)
+            if isinstance(left, Error):
+                return left
+        return self.machine.augmented_store(expr, left, right, env)
@@ -0,0 +1,80 @@
+from frontend.ASTNodes import *
+from backend.Environment import BUILTIN_NAMES
+
+# Names that can be declared in a scope more than once keep being looked up by name
+UNSLOTTED = {"~"}
+
+
+class Scope:
+    def __init__(self, names: list) -> None:
+        self.names = list(dict.fromkeys(name for name in names if name not in UNSLOTTED))
+        self.slots = {name: index for index, name in enumerate(self.names)}
+        # Every name a call scope of the function can ever hold
+        self.declarable = frozenset(self.names) | UNSLOTTED
+
+    def __repr__(self) -> str:
+        return str({
+            "names": self.names
+        })
+
+
+# Lays out the variables of a function's call scope and points the identifiers of its body at them.
+# Phi is dynamically scoped, so only the scope of the call itself is known before running the body;
+# everything else an identifier may refer to is found at runtime by name.
+class Resolver:
+    def __init__(self) -> None:
+        self.scopes = {}
+        self.fields = {}
+
+    def resolve_function(self, parameters: list, body: list) -> Scope:
+        cached = self.scopes.get(id(body))
+        if cached is not None and cached[0] is body:
+            return cached[1]
+
+        # Every call frame starts with the builtins, CallFrame fills their slots in this order
+        names = [*BUILTIN_NAMES, *[parameter.symbol for parameter in parameters]]
+        identifiers = []
+        for node in self.walk(body):
+            if isinstance(node, IdentifierNode):
+                identifiers.append(node)
+            elif isinstance(node, VariableDeclarationExpressionNode):
+                names.append(node.identifier)
+            elif isinstance(node, FunctionDeclarationExpressionNode):
+                names.append(node.name)
+            elif isinstance(node, ImportNode):
+                names.extend(name.symbol for name in node.names if isinstance(name, IdentifierNode))
+
+        scope = Scope(names)
+        for identifier in identifiers:
+            identifier.slot = scope.slots.get(identifier.symbol, -1)
+
+        self.scopes[id(body)] = (body, scope)
+        return scope
+
+    def walk(self, nodes):
+        stack = list(reversed(nodes))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+                continue
+            if not isinstance(node, ASTNode):
+                continue
+            yield node
+            for field in self.node_fields(type(node)):
+                # Nested functions get their own scope when they are called
+                if field == "body" and isinstance(node, FunctionDeclarationExpressionNode):
+                    continue
+                stack.append(getattr(node, field, None))
+
+    def node_fields(self, node_type: type) -> tuple:
+        fields = self.fields.get(node_type)
+        if fields is None:
+            fields = tuple(
+                field
+                for cls in reversed(node_type.__mro__)
+                for field in getattr(cls, "__slots__", ())
+                if field not in ("line", "column")
+            )
+            self.fields[node_type] = fields
+        return fields
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 class RuntimeValue:
     def __init__(self, line: int = -1, column: int = -1) -> None:
         self.line = line
@@ -55,15 +57,16 @@ class RealValue(RuntimeValue):
         })
 
 class StringValue(RuntimeValue):
+    # Shared by every string, Interpreter.evaluate_member_expression binds the string when it looks a method up
+    methods = {
+        "length": lambda string, args, scope: bim.string_length(string),
+        "format": lambda string, args, scope: bim.string_format(args, string)
+    }
+
     def __init__(self, value:str, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        import backend.Methods as bim
         self.type = "stringValue"
         self.value = value
-        self.methods = {
-            "length": NativeFunction(lambda args, scope: bim.string_length(self)),
-            "format": NativeFunction(lambda args, scope: bim.string_format(args, self))
-        }
 
     def __repr__(self) -> str:
         return str({
@@ -84,16 +87,16 @@ class BooleanValue(RuntimeValue):
         })
 
 class ArrayValue(RuntimeValue):
+    methods = {
+        "append": lambda array, args, scope: bim.array_append(array, args[0]),
+        "length": lambda array, args, scope: bim.array_length(array),
+        "join": lambda array, args, scope: bim.array_join(array, args[0])
+    }
+
     def __init__(self, items: dict, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        import backend.Methods as bim
         self.type = "arrayValue"
         self.items = items
-        self.methods = {
-            "append": NativeFunction(lambda args, scope: bim.array_append(self, args[0])),
-            "length": NativeFunction(lambda args, scope: bim.array_length(self)),
-            "join": NativeFunction(lambda args, scope: bim.array_join(self, args[0]))
-        }
 
     def __repr__(self) -> str:
         return str({
@@ -103,17 +106,17 @@ class ArrayValue(RuntimeValue):
         })
 
 class ObjectValue(RuntimeValue):
+    methods = {
+        "items": lambda obj, args, scope: bim.object_items(obj),
+        "keys": lambda obj, args, scope: bim.object_keys(obj),
+        "update": lambda obj, args, scope: bim.object_update(obj, args[0]),
+        "hasAttr": lambda obj, args, scope: bim.object_has_attribute(obj, args[0])
+    }
+
     def __init__(self, properties: dict, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        import backend.Methods as bim
         self.type = "objectValue"
         self.properties = properties
-        self.methods = {
-            "items": NativeFunction(lambda args, scope: bim.object_items(self)),
-            "keys": NativeFunction(lambda args, scope: bim.object_keys(self)),
-            "update": NativeFunction(lambda args, scope: bim.object_update(self, args[0])),
-            "hasAttr": NativeFunction(lambda args, scope: bim.object_has_attribute(self, args[0]))
-        }
 
     def __repr__(self) -> str:
         return str({
@@ -152,6 +155,27 @@ class Function(RuntimeValue):
             "body": self.body
         })
 
+# A Phi function whose results are kept by its arguments, made by the memoize builtin. Calling it
+# runs the function like a NativeFunction, it is a functionValue so it can be stored wherever the
+# function could.
+class MemoizedFunction(NativeFunction):
+    def __init__(self, function: Function, size: int, call) -> None:
+        super().__init__(call)
+        self.type = "functionValue"
+        self.function = function
+        # At most this many results are kept, the least recently used goes first. 0 keeps them all.
+        self.size = size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return str({
+            "type": self.type,
+            "function": self.function,
+            "size": self.size
+        })
+
 class ExportValue(RuntimeValue):
     def __init__(self, value, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
@@ -174,4 +198,21 @@ class FileValue(RuntimeValue):
         return str({
             "type": self.type,
             "value": self.value
-        })
\ No newline at end of file
+        })
+
+# Values that are the same wherever they are made are shared instead. Nothing assigns to the
+# attributes of a value once it is made, which is what makes sharing them safe.
+NULL = NullValue()
+TRUE = BooleanValue("T")
+FALSE = BooleanValue("F")
+
+# The IntegerValue without a position of every int from -5 to 1024
+SMALL_INTEGERS = [IntegerValue(value) for value in range(-5, 1025)]
+
+def integer_value(value) -> IntegerValue:
+    if type(value) is int and -5 <= value <= 1024:
+        return SMALL_INTEGERS[value + 5]
+    return IntegerValue(value)
+
+# Methods makes values of the classes above, so it can only be imported once they are defined
+import backend.Methods as bim
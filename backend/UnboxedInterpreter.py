@@ -0,0 +1,123 @@
+from frontend.ASTNodes import *
+from frontend.Error import *
+from backend.RuntimeValue import *
+from backend.Environment import Environment
+from backend.Interpreter import Interpreter
+import operator
+
+COMPARISONS = {
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+}
+
+# Python numbers an IntegerValue or RealValue stands for while it is unboxed
+NUMBERS = (int, float)
+# Nodes evaluate_unboxed works out without making a runtime value
+UNBOXED_NODES = (BinaryExpressionNode, IntegerLiteralNode, RealLiteralNode)
+
+# The Python number a value stands for, or the value itself when it is not a number. An IntegerValue
+# holding a float (what % and // make of reals) is left boxed, unboxing it would turn it into a real.
+def unbox(value):
+    kind = type(value)
+    if kind is IntegerValue:
+        return value.value if type(value.value) is int else value
+    if kind is RealValue:
+        return value.value if type(value.value) is float else value
+    return value
+
+# The runtime value of an unboxed number, made the way Interpreter.evaluate_numeric_binary_expression makes its results
+def box(value, line: int = -1, column: int = -1):
+    kind = type(value)
+    if kind is int:
+        return integer_value(value) if line == -1 else IntegerValue(value, line, column)
+    if kind is float or kind is complex:
+        return RealValue(value, line, column)
+    return value
+
+# An Interpreter that works out arithmetic on plain Python ints and floats. The subexpressions of a
+# binary expression and both sides of a condition are evaluated unboxed; a number is only made a
+# runtime value again once the whole expression is done, when it is stored, passed or returned.
+# An operation Python numbers do not give the interpreter's result for is handed to it boxed.
+class UnboxedInterpreter(Interpreter):
+    def __init__(self, file_path: str = "") -> None:
+        super().__init__(file_path)
+        self.evaluate_operand = self.evaluate_unboxed
+        self.evaluators[BinaryExpressionNode] = self.evaluate_boxed_binary_expression
+
+    def check_condition(self, left, operand: str, right):
+        compare = COMPARISONS.get(operand)
+        if compare is not None and type(left) in NUMBERS and type(right) in NUMBERS:
+            return compare(left, right)
+        return super().check_condition(box(left), operand, box(right))
+
+    def evaluate_boxed_binary_expression(self, binary_operation: BinaryExpressionNode, env: Environment) -> RuntimeValue | Error:
+        return box(self.evaluate_unboxed_binary_expression(binary_operation, env))
+
+    # Evaluates a node, giving a Python number for anything numeric
+    def evaluate_unboxed(self, astNode: ASTNode, env: Environment):
+        kind = type(astNode)
+        if kind is BinaryExpressionNode:
+            return self.evaluate_unboxed_binary_expression(astNode, env)
+        if kind is IntegerLiteralNode and type(astNode.value) is int:
+            return astNode.value
+        if kind is RealLiteralNode and type(astNode.value) is float:
+            return astNode.value
+        return unbox(self.evaluate(astNode, env))
+
+    def evaluate_unboxed_binary_expression(self, binary_operation: BinaryExpressionNode, env: Environment):
+        # The runtime values the operands were unboxed from, None for a literal or a binary expression
+        left_value = right_value = None
+        if type(binary_operation.left) in UNBOXED_NODES:
+            left = self.evaluate_unboxed(binary_operation.left, env)
+        else:
+            left_value = self.evaluate(binary_operation.left, env)
+            left = unbox(left_value)
+        if isinstance(left, Error):
+            return left
+        if type(binary_operation.right) in UNBOXED_NODES:
+            right = self.evaluate_unboxed(binary_operation.right, env)
+        else:
+            right_value = self.evaluate(binary_operation.right, env)
+            right = unbox(right_value)
+        if isinstance(right, Error):
+            return right
+
+        if type(left) in NUMBERS and type(right) in NUMBERS:
+            integers = type(left) is int and type(right) is int
+            match binary_operation.operand:
+                case "+":
+                    return left + right
+                case "-":
+                    return left - right
+                case "*":
+                    return left * right
+                case "/":
+                    if right != 0:
+                        return left / right
+                case "^":
+                    # A negative integer power is still an IntegerValue in the interpreter
+                    if not integers or right >= 0:
+                        return left ** right
+                case "%":
+                    if integers and right != 0:
+                        return left % right
+                case "//":
+                    if integers and right != 0:
+                        return left // right
+
+        # The interpreter reports errors at the position of the value, so the operands are handed to it
+        # as the values they were unboxed from, and a literal as the value the interpreter makes of it
+        left = self.rebox(left, left_value, binary_operation.left)
+        right = self.rebox(right, right_value, binary_operation.right)
+        return unbox(self.evaluate_binary_operation(left, right, binary_operation.operand))
+
+    def rebox(self, number, value: RuntimeValue | None, astNode: ASTNode):
+        if value is not None:
+            return value
+        if type(astNode) is BinaryExpressionNode:
+            return box(number)
+        return box(number, astNode.line, astNode.column)
@@ -0,0 +1,474 @@
+from frontend.ASTNodes import *
+from frontend.Error import *
+from frontend.Parser import LazyBody
+from backend.RuntimeValue import *
+from backend.Environment import CallFrame, Environment
+from backend.Interpreter import Interpreter, value_type_table
+from backend.Functions import memo_lookup, memo_store
+from backend.ClosureCompiler import INTEGER_OPERATIONS, INTEGER_DIVISIONS, COMPARISONS, NUMBERS, MISSING, lookup
+from backend.Bytecode import Opcode, Code, BytecodeCompiler
+
+# The opcodes as module globals, the dispatch loop compares against them for every instruction
+POP = Opcode.POP
+LOAD_NULL = Opcode.LOAD_NULL
+LOAD_LITERAL = Opcode.LOAD_LITERAL
+LOAD_CONSTANT = Opcode.LOAD_CONSTANT
+LOAD_NAME = Opcode.LOAD_NAME
+DECLARE = Opcode.DECLARE
+ASSIGN = Opcode.ASSIGN
+AUGMENTED_LOAD = Opcode.AUGMENTED_LOAD
+AUGMENTED_STORE = Opcode.AUGMENTED_STORE
+AUGMENTED_LITERAL = Opcode.AUGMENTED_LITERAL
+BINARY = Opcode.BINARY
+BINARY_LITERAL = Opcode.BINARY_LITERAL
+COMPARE_JUMP_IF_FALSE = Opcode.COMPARE_JUMP_IF_FALSE
+COMPARE_LITERAL_JUMP_IF_FALSE = Opcode.COMPARE_LITERAL_JUMP_IF_FALSE
+MAKE_FUNCTION = Opcode.MAKE_FUNCTION
+MAKE_ARRAY = Opcode.MAKE_ARRAY
+MAKE_OBJECT = Opcode.MAKE_OBJECT
+MAKE_EXPORT = Opcode.MAKE_EXPORT
+CALL = Opcode.CALL
+DELEGATE = Opcode.DELEGATE
+JUMP = Opcode.JUMP
+JUMP_IF_ERROR = Opcode.JUMP_IF_ERROR
+JUMP_IF_BREAK = Opcode.JUMP_IF_BREAK
+JUMP_IF_SIGNAL = Opcode.JUMP_IF_SIGNAL
+POP_JUMP_IF_CONTINUE = Opcode.POP_JUMP_IF_CONTINUE
+GET_ITERATOR = Opcode.GET_ITERATOR
+FOR_ITER = Opcode.FOR_ITER
+ASSIGN_EACH = Opcode.ASSIGN_EACH
+POP_BELOW = Opcode.POP_BELOW
+CATCH = Opcode.CATCH
+RETURN = Opcode.RETURN
+
+LITERALS = {
+    IntegerLiteralNode: IntegerValue,
+    RealLiteralNode: RealValue,
+    StringLiteralNode: StringValue,
+    UnknownLiteralNode: UnknownValue,
+}
+
+NUMBER_LITERALS = (IntegerLiteralNode, RealLiteralNode)
+
+LITERAL_NODES = {
+    IntegerValue: IntegerLiteralNode,
+    RealValue: RealLiteralNode,
+    StringValue: StringLiteralNode,
+}
+
+# Runs the Code made by BytecodeCompiler on a value stack. Scopes are still Environments, as
+# Phi calls see the variables of their caller. A call of a Phi function gets its own stack, and
+# the code, stack, scope and instruction of its caller are kept on a list of frames in the same
+# execute(), so how deep Phi calls go is not bound by Python's recursion limit. Nodes handed to
+# the Interpreter still make their calls in the Interpreter.
+class VirtualMachine:
+    def __init__(self, file_path: str = "") -> None:
+        self.file_path = file_path
+        self.interpreter = Interpreter(file_path)
+        # Code of function bodies by id of the body list, the list is kept so the id stays unique
+        self.function_code = {}
+
+    def __str__(self) -> str:
+        return "Interpreter"
+
+    def evaluate(self, astNode: ASTNode, env: Environment) -> RuntimeValue | None:
+        if isinstance(astNode, ProgramNode):
+            return self.execute(BytecodeCompiler(self.file_path).compile_program(astNode), env)
+        return self.interpreter.evaluate(astNode, env)
+
+    def function_body(self, name: str, body: list) -> Code:
+        compiled = self.function_code.get(id(body))
+        if compiled is None or compiled[0] is not body:
+            compiled = (body, BytecodeCompiler(self.file_path, name).compile_function_body(body))
+            self.function_code[id(body)] = compiled
+        return compiled[1]
+
+    # What a call of anything but a Phi function gives back
+    def call(self, fn, args: list, env: Environment):
+        if isinstance(fn, NativeFunction):
+            return fn.call(args, env)
+        return SyntaxError(self.file_path, self, f"'{fn.type}' is not a function", fn.column, fn.line)
+
+    # The scope a call of the Phi function fn runs its body in
+    def enter_function(self, fn: Function, args: list, env: Environment) -> CallFrame | Error:
+        scope = CallFrame(env)
+
+        if len(fn.parameters) == len(args):
+            for i in range(len(fn.parameters)):
+                scope.declare_variable(fn.parameters[i].symbol, args[i])
+        else:
+            if len(fn.parameters) > 0:
+                column = fn.parameters[-1].column
+                line = fn.parameters[-1].line
+            else:
+                column = fn.column
+                line = fn.line
+            return SyntaxError(self.file_path, self, f"Insufficient arguments provided. Expected {len(fn.parameters)}, but received {len(args)}\nExpected [{', '.join([i.symbol for i in fn.parameters])}]", column, line)
+
+        if isinstance(fn.body, LazyBody):
+            body = fn.body.parse()
+            if isinstance(body, Error):
+                return body
+            fn.body = body
+
+        scope.names = self.interpreter.resolver.resolve_function(fn.parameters, fn.body).declarable
+        scope.outside = env.outside if env.names is scope.names else env
+        return scope
+
+    # The type dispatch of Interpreter.evaluate_binary_expression once both sides are evaluated
+    def binary_operation(self, left, right, operand: str):
+        if type(left) is IntegerValue and type(right) is IntegerValue:
+            if operand in INTEGER_OPERATIONS:
+                return integer_value(INTEGER_OPERATIONS[operand](left.value, right.value))
+            if operand in INTEGER_DIVISIONS and right.value != 0:
+                return integer_value(INTEGER_DIVISIONS[operand](left.value, right.value))
+
+        if isinstance(left, NUMBERS) and isinstance(right, NUMBERS):
+            return self.interpreter.evaluate_numeric_binary_expression(left, right, operand)
+        elif isinstance(left, StringValue) and isinstance(right, (StringValue, NUMBERS)):
+            return self.interpreter.evaluate_string_binary_expression(left, right, operand)
+        elif isinstance(left, ArrayValue):
+            return self.interpreter.evaluate_array_append_binary_expression(left, right, operand)
+        return TypeError(self.file_path, self, f"Incompatible types. '{left.type}' and '{right.type}'", right.column, right.line)
+
+    # The Interpreter turns the current value into a literal node with line and column swapped
+    def augmented_load(self, expr: AssignmentBinaryExpressionNode, env: Environment):
+        current_value = lookup(env, expr.assigne.symbol)
+        if current_value is MISSING:
+            current_value = env.lookup(expr.assigne)
+
+        current_type = type(current_value)
+        if current_type in LITERAL_NODES:
+            return current_type(current_value.value, expr.column, expr.line)
+        return TypeError(self.file_path, self, f"Incompatible type '{current_value}'", expr.column, expr.line)
+
+    def augmented_store(self, expr: AssignmentBinaryExpressionNode, left, right, env: Environment):
+        new_value = self.binary_operation(left, right, expr.operand[0])
+        new_type = type(new_value)
+
+        if isinstance(new_value, Error):
+            return new_value
+        elif new_type is RealValue or new_type is IntegerValue:
+            new_value = new_type(new_value.value, expr.line, expr.column)
+        elif new_type is StringValue:
+            new_value = StringValue(new_value.value, expr.column, expr.line)
+        else:
+            literal = LITERAL_NODES[type(left)](left.value, left.line, left.column)
+            return TypeError(self.file_path, self, f"Incompatible types. '{literal}' and '{new_value}'", expr.column, expr.line)
+
+        if lookup(env, expr.assigne.symbol) is MISSING:
+            return env.lookup(expr.assigne)
+        return env.assign_variable(expr.assigne.symbol, new_value)
+
+    def assign_each(self, declaration: VariableDeclarationExpressionNode, value, env: Environment):
+        if lookup(env, declaration.identifier) is MISSING:
+            return env.lookup(IdentifierNode(declaration.identifier, declaration.line, declaration.column))
+        return env.assign_variable(declaration.identifier, integer_value(value))
+
+    # Opcodes that can fail carry the stack depth to cut back to and the instruction to go on at
+    # with the Error as their last two arguments
+    def execute(self, code: Code, env: Environment) -> RuntimeValue | None:
+        instructions = code.instructions
+        constants = code.constants
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        # The callers of the running code, each as its instructions, constants, stack, scope and CALL
+        # instruction, and the memoized function and key the result of the call is kept by
+        frames = []
+
+        while True:
+            opcode = instructions[pc]
+
+            if opcode == LOAD_NAME:
+                identifier = constants[instructions[pc + 1]]
+                name = identifier.symbol
+                scope = env
+                while scope is not None:
+                    if name in scope.constants:
+                        push(scope.constants[name])
+                        break
+                    if name in scope.variables:
+                        push(scope.variables[name])
+                        break
+                    # None of the frames of a recursion can hold a name the first of them can not
+                    scope = scope.parent if scope.names is None or name in scope.names else scope.outside
+                else:
+                    del stack[instructions[pc + 2]:]
+                    push(env.lookup(identifier))
+                    pc = instructions[pc + 3]
+                    continue
+                pc += 4
+            elif opcode == LOAD_LITERAL:
+                literal = constants[instructions[pc + 1]]
+                push(LITERALS[type(literal)](literal.value, literal.line, literal.column))
+                pc += 2
+            elif opcode == BINARY_LITERAL:
+                left = stack[-1]
+                operand = constants[instructions[pc + 1]]
+                literal = constants[instructions[pc + 2]]
+                if type(left) is IntegerValue and type(literal) is IntegerLiteralNode and operand in INTEGER_OPERATIONS:
+                    stack[-1] = integer_value(INTEGER_OPERATIONS[operand](left.value, literal.value))
+                    pc += 5
+                    continue
+                value = self.binary_operation(left, LITERALS[type(literal)](literal.value, literal.line, literal.column), operand)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 3]:]
+                    push(value)
+                    pc = instructions[pc + 4]
+                else:
+                    stack[-1] = value
+                    pc += 5
+            elif opcode == COMPARE_LITERAL_JUMP_IF_FALSE:
+                left = pop()
+                operand = constants[instructions[pc + 1]]
+                literal = constants[instructions[pc + 2]]
+                if type(left) in NUMBERS and type(literal) in NUMBER_LITERALS and operand in COMPARISONS:
+                    result = COMPARISONS[operand](left.value, literal.value)
+                else:
+                    result = self.interpreter.check_condition(left, operand, LITERALS[type(literal)](literal.value, literal.line, literal.column))
+                pc = pc + 4 if result else instructions[pc + 3]
+            elif opcode == AUGMENTED_LITERAL:
+                expr = constants[instructions[pc + 1]]
+                name = expr.assigne.symbol
+                literal = expr.value
+                variables = env.variables
+                if name in variables and type(variables[name]) is IntegerValue and type(literal) is IntegerLiteralNode and expr.operand[0] in INTEGER_OPERATIONS:
+                    value = IntegerValue(INTEGER_OPERATIONS[expr.operand[0]](variables[name].value, literal.value), expr.line, expr.column)
+                    variables[name] = value
+                    push(value)
+                    pc += 4
+                    continue
+                value = self.augmented_load(expr, env)
+                if not isinstance(value, Error):
+                    value = self.augmented_store(expr, value, LITERALS[type(literal)](literal.value, literal.line, literal.column), env)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    push(value)
+                    pc += 4
+            elif opcode == POP:
+                pop()
+                pc += 1
+            elif opcode == JUMP:
+                pc = instructions[pc + 1]
+            elif opcode == BINARY:
+                right = pop()
+                left = stack[-1]
+                operand = constants[instructions[pc + 1]]
+                if type(left) is IntegerValue and type(right) is IntegerValue and operand in INTEGER_OPERATIONS:
+                    stack[-1] = integer_value(INTEGER_OPERATIONS[operand](left.value, right.value))
+                    pc += 4
+                    continue
+                value = self.binary_operation(left, right, operand)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    stack[-1] = value
+                    pc += 4
+            elif opcode == COMPARE_JUMP_IF_FALSE:
+                right = pop()
+                left = pop()
+                operand = constants[instructions[pc + 1]]
+                if type(left) in NUMBERS and type(right) in NUMBERS and operand in COMPARISONS:
+                    result = COMPARISONS[operand](left.value, right.value)
+                else:
+                    result = self.interpreter.check_condition(left, operand, right)
+                pc = pc + 3 if result else instructions[pc + 2]
+            elif opcode == CALL:
+                count = instructions[pc + 1]
+                fn = pop()
+                args = stack[len(stack) - count:]
+                del stack[len(stack) - count:]
+                # A memoized function without a result for the arguments is called like the function it
+                # wraps, and the RETURN of that call keeps the result
+                memo = None
+                if type(fn) is MemoizedFunction:
+                    key, value = memo_lookup(self.file_path, fn, args)
+                    if value is None:
+                        memo = (fn, key)
+                        fn = fn.function
+                if isinstance(fn, Function):
+                    value = self.enter_function(fn, args, env)
+                    if not isinstance(value, Error):
+                        frames.append((instructions, constants, stack, env, pc, memo))
+                        code = self.function_body(fn.name, fn.body)
+                        instructions = code.instructions
+                        constants = code.constants
+                        stack = []
+                        push = stack.append
+                        pop = stack.pop
+                        env = value
+                        pc = 0
+                        continue
+                elif type(fn) is not MemoizedFunction:
+                    value = self.call(fn, args, env)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    push(value)
+                    pc += 4
+            elif opcode == JUMP_IF_ERROR:
+                if isinstance(stack[-1], Error):
+                    error = stack[-1]
+                    del stack[instructions[pc + 1]:]
+                    push(error)
+                    pc = instructions[pc + 2]
+                else:
+                    pc += 3
+            elif opcode == JUMP_IF_BREAK:
+                pc = instructions[pc + 1] if isinstance(stack[-1], BreakNode) else pc + 2
+            elif opcode == POP_JUMP_IF_CONTINUE:
+                if isinstance(stack[-1], ContinueNode):
+                    pop()
+                    pc = instructions[pc + 1]
+                else:
+                    pc += 2
+            elif opcode == LOAD_NULL:
+                push(NULL)
+                pc += 1
+            elif opcode == AUGMENTED_LOAD:
+                value = self.augmented_load(constants[instructions[pc + 1]], env)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    push(value)
+                    pc += 4
+            elif opcode == AUGMENTED_STORE:
+                right = pop()
+                value = self.augmented_store(constants[instructions[pc + 1]], stack[-1], right, env)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    stack[-1] = value
+                    pc += 4
+            elif opcode == ASSIGN:
+                value = pop()
+                if value.type in value_type_table[value.type]:
+                    value = env.assign_variable(constants[instructions[pc + 1]].symbol, value)
+                else:
+                    value = TypeError(self.file_path, self, f"'{value.type}' is incompatible with '{stack[-1].type}'", value.column, value.line)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    stack[-1] = value
+                    pc += 4
+            elif opcode == DECLARE:
+                declaration = constants[instructions[pc + 1]]
+                value = stack[-1]
+                if value.type in value_type_table[value.type]:
+                    value = env.declare_variable(declaration.identifier, value, declaration.constant)
+                else:
+                    value = TypeError(self.file_path, self, f"'{value.type}' is incompatible with '{declaration.dataType}'", value.column, value.line)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    stack[-1] = value
+                    pc += 4
+            elif opcode == LOAD_CONSTANT:
+                push(constants[instructions[pc + 1]])
+                pc += 2
+            elif opcode == JUMP_IF_SIGNAL:
+                pc = instructions[pc + 1] if isinstance(stack[-1], (BreakNode, ContinueNode)) else pc + 2
+            elif opcode == FOR_ITER:
+                value = next(stack[-1], MISSING)
+                if value is MISSING:
+                    pop()
+                    pc = instructions[pc + 1]
+                else:
+                    push(value)
+                    pc += 2
+            elif opcode == ASSIGN_EACH:
+                value = self.assign_each(constants[instructions[pc + 1]], stack[-1], env)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    stack[-1] = value
+                    pc += 4
+            elif opcode == GET_ITERATOR:
+                push(value.value for value in pop().items.values())
+                pc += 1
+            elif opcode == POP_BELOW:
+                del stack[-2]
+                pc += 1
+            elif opcode == MAKE_FUNCTION:
+                declaration, function_code = constants[instructions[pc + 1]]
+                if function_code is not None:
+                    self.function_code[id(declaration.body)] = (declaration.body, function_code)
+                value = env.declare_variable(declaration.name, Function(declaration.name, declaration.parameters, env, declaration.body))
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    push(value)
+                    pc += 4
+            elif opcode == MAKE_ARRAY:
+                indexes, line, column = constants[instructions[pc + 1]]
+                values = stack[len(stack) - len(indexes):]
+                del stack[len(stack) - len(indexes):]
+                push(ArrayValue(dict(zip(indexes, values)), line, column))
+                pc += 2
+            elif opcode == MAKE_OBJECT:
+                keys, line, column = constants[instructions[pc + 1]]
+                values = stack[len(stack) - len(keys):]
+                del stack[len(stack) - len(keys):]
+                push(ObjectValue(dict(zip(keys, values)), line, column))
+                pc += 2
+            elif opcode == MAKE_EXPORT:
+                line, column = constants[instructions[pc + 1]]
+                stack[-1] = ExportValue(stack[-1], line, column)
+                pc += 2
+            elif opcode == DELEGATE:
+                method, astNode = constants[instructions[pc + 1]]
+                value = getattr(self.interpreter, method)(astNode, env)
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    push(value)
+                    pc += 4
+            elif opcode == CATCH:
+                if stack[-1].type == constants[instructions[pc + 1]]:
+                    pop()
+                    pc += 3
+                else:
+                    pc = instructions[pc + 2]
+            elif opcode == RETURN:
+                value = pop()
+                if not frames:
+                    return value
+
+                # Back to the CALL of the caller, which goes on as if the call had returned value
+                instructions, constants, stack, env, pc, memo = frames.pop()
+                push = stack.append
+                pop = stack.pop
+                if isinstance(value, Error):
+                    del stack[instructions[pc + 2]:]
+                    push(value)
+                    pc = instructions[pc + 3]
+                else:
+                    if memo is not None:
+                        memo_store(*memo, value)
+                    push(value)
+                    pc += 4
+            else:
+                return NotImplementedError(self.file_path, self, f"opcode {opcode}", 0, 0)
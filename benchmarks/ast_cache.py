@@ -0,0 +1,34 @@
+# Times shell.parse with an empty .phic cache and with a warm one on generated programs.
+#
+#   python -m benchmarks.ast_cache [max lines]
+
+from frontend.ASTCache import ASTCache
+from benchmarks.incremental_parsing import generate_source
+from time import perf_counter
+import shell
+import sys
+import tempfile
+import os
+
+SIZES = [100, 1000, 10000]
+REPEATS = 5
+
+def time_parse(source_code: str, file_path: str, cache: bool) -> float:
+    start = perf_counter()
+    for _ in range(REPEATS):
+        shell.parse(source_code, file_path, cache)
+    return (perf_counter() - start) / REPEATS
+
+if __name__ == "__main__":
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+
+    with tempfile.TemporaryDirectory() as directory:
+        shell.ast_cache = ASTCache(directory)
+        print(f"{'lines':>10} {'parse ms':>10} {'cached ms':>10} {'speedup':>10}")
+        for lines in [s for s in SIZES if s <= max_size]:
+            source_code = generate_source(lines)
+            file_path = os.path.join(directory, f"program{lines}.phi")
+            parse = time_parse(source_code, file_path, False)
+            shell.parse(source_code, file_path)
+            cached = time_parse(source_code, file_path, True)
+            print(f"{source_code.count(chr(10)):>10} {parse * 1e3:>10.2f} {cached * 1e3:>10.2f} {parse / cached:>10.1f}")
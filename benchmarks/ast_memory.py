@@ -0,0 +1,57 @@
+# Measures the memory held by parsed programs and the time to evaluate a loop heavy one.
+#
+#   python -m benchmarks.ast_memory [max lines]
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from frontend.ASTNodes import ASTNode
+from backend.Interpreter import Interpreter
+from backend.Environment import create_global_environment
+from benchmarks.incremental_parsing import generate_source
+from time import perf_counter
+import tracemalloc
+import sys
+
+SIZES = [1000, 10000, 50000]
+LOOP = '''int total = 0
+int i = 0
+while (i < 20000){
+    i += 1
+    if (i % 3 == 0){
+        total += i * 2 - 1
+    }
+}
+'''
+
+def count_nodes(node) -> int:
+    if isinstance(node, list):
+        return sum(count_nodes(item) for item in node)
+    if not isinstance(node, ASTNode):
+        return 0
+    fields = [field for cls in type(node).__mro__ for field in getattr(cls, "__slots__", ())]
+    return 1 + sum(count_nodes(getattr(node, field, None)) for field in fields)
+
+def measure(source_code: str) -> tuple[int, int]:
+    tokens = Lexer(source_code).tokenize()
+    tracemalloc.start()
+    ast = Parser(tokens).generate_AST()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, count_nodes(ast)
+
+def time_evaluate(source_code: str) -> float:
+    ast = Parser(Lexer(source_code).tokenize()).generate_AST()
+    start = perf_counter()
+    Interpreter().evaluate(ast, create_global_environment())
+    return perf_counter() - start
+
+if __name__ == "__main__":
+    sys.setrecursionlimit(10000)
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+
+    print(f"{'lines':>10} {'nodes':>10} {'KB':>10} {'bytes/node':>10}")
+    for lines in [s for s in SIZES if s <= max_size]:
+        size, nodes = measure(generate_source(lines))
+        print(f"{lines:>10} {nodes:>10} {size / 1024:>10.0f} {size / nodes:>10.1f}")
+
+    print(f"evaluate loop: {time_evaluate(LOOP) * 1e3:.1f} ms")
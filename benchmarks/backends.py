@@ -0,0 +1,55 @@
+# Times every backend in shell.BACKENDS on the example programs that run without input and on
+# a loop heavy program. Parsing is done once up front, only evaluation (including any compile step) is timed.
+#
+#   python -m benchmarks.backends [repeats]
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Environment import create_global_environment
+from time import perf_counter
+import contextlib
+import shell
+import sys
+import io
+
+LOOP = '''fn count(n) {
+    int total = 0
+    int i = 0
+    while (i < n) {
+        if (i % 3 == 0) {
+            total += i * 2 - 1
+        }
+        i += 1
+    }
+    <- total
+}
+output(count(20000))
+'''
+
+EXAMPLES = ["arrayMethods", "checkPrime", "factorial", "ifStatements", "output", "prime", "stringMethods"]
+
+PROGRAMS = {f"{name}.phi": open(f"ExamplePrograms/{name}.phi").read() for name in EXAMPLES}
+PROGRAMS["loop"] = LOOP
+
+def time_backend(backend, ast, repeats: int) -> float:
+    best = None
+    for _ in range(repeats):
+        env = create_global_environment()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = perf_counter()
+            backend().evaluate(ast, env)
+            elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"{'program':>18} {'backend':>12} {'ms':>10} {'speedup':>10}")
+    for name, source_code in PROGRAMS.items():
+        ast = Parser(Lexer(source_code).tokenize()).generate_AST()
+        baseline = None
+        for backend_name, backend in shell.BACKENDS.items():
+            seconds = time_backend(backend, ast, repeats)
+            baseline = baseline or seconds
+            print(f"{name:>18} {backend_name:>12} {seconds * 1e3:>10.2f} {baseline / seconds:>10.1f}")
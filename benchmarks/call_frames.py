@@ -0,0 +1,60 @@
+# Times setting up the scope of a one parameter call, the way every call used to (a global
+# environment declaring all the builtins again) and with a CallFrame, then times a recursive
+# function on every backend in shell.BACKENDS, where that setup is most of the work of a call.
+#
+#   python -m benchmarks.call_frames [repeats]
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Environment import CallFrame, create_global_environment
+from backend.RuntimeValue import IntegerValue
+from time import perf_counter
+import contextlib
+import shell
+import sys
+import io
+
+# Returns only work at the top level of a body, so the recursion is done for its calls alone
+RECURSION = '''fn depth(n){
+    if (n > 0){
+        depth(n - 1)
+    }
+    <- n
+}
+int i = 0
+while (i < 300) {
+    depth(20)
+    i += 1
+}
+'''
+
+def time_scopes(make_scope, repeats: int) -> float:
+    env = create_global_environment()
+    argument = IntegerValue(1)
+    start = perf_counter()
+    for _ in range(repeats):
+        make_scope(env).declare_variable("n", argument)
+    return (perf_counter() - start) / repeats
+
+def time_backend(backend, ast, repeats: int) -> float:
+    best = None
+    for _ in range(repeats):
+        env = create_global_environment()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = perf_counter()
+            backend().evaluate(ast, env)
+            elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"{'scope':>26} {'ns/call':>10}")
+    for name, make_scope in [("create_global_environment", create_global_environment), ("CallFrame", CallFrame)]:
+        print(f"{name:>26} {time_scopes(make_scope, repeats * 20000) * 1e9:>10.1f}")
+
+    ast = Parser(Lexer(RECURSION).tokenize()).generate_AST()
+    print(f"\n{'backend':>12} {'recursion ms':>14}")
+    for backend_name, backend in shell.BACKENDS.items():
+        print(f"{backend_name:>12} {time_backend(backend, ast, repeats) * 1e3:>14.2f}")
@@ -0,0 +1,42 @@
+# Times a Phi function that recurses before it returns, at growing depths, on every backend in
+# shell.BACKENDS. Backends that make a Python call for every Phi call stop at Python's recursion
+# limit.
+#
+#   python -m benchmarks.deep_recursion
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Environment import create_global_environment
+from time import perf_counter
+import contextlib
+import shell
+import io
+
+DEPTH = '''fn depth(n) {{
+    int below = 0
+    if (n > 0) {{
+        below = depth(n - 1)
+    }}
+    <- below + 1
+}}
+output(depth({depth}))
+'''
+
+DEPTHS = [100, 1000, 10000, 100000]
+
+def time_backend(backend, ast) -> float | None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = perf_counter()
+        try:
+            backend().evaluate(ast, create_global_environment())
+        except RecursionError:
+            return None
+        return perf_counter() - start
+
+if __name__ == "__main__":
+    print(f"{'depth':>8} {'backend':>12} {'ms':>12}")
+    for depth in DEPTHS:
+        ast = Parser(Lexer(DEPTH.format(depth=depth)).tokenize()).generate_AST()
+        for backend_name, backend in shell.BACKENDS.items():
+            seconds = time_backend(backend, ast)
+            print(f"{depth:>8} {backend_name:>12} {'RecursionError' if seconds is None else f'{seconds * 1e3:.2f}':>12}")
@@ -0,0 +1,128 @@
+# Records every node Interpreter.evaluate sees while running ExamplePrograms/prime.phi and
+# times only the dispatch step for that sequence: the string match over kind that evaluate
+# used to do, the list indexed by tag and the table keyed by node class it uses now.
+#
+#   python -m benchmarks.dispatch [repeats]
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from frontend.ASTNodes import *
+from frontend.Error import Error
+from backend.Interpreter import Interpreter
+from backend.Environment import create_global_environment
+from time import perf_counter
+import contextlib
+import io
+import sys
+
+PROGRAM = "ExamplePrograms/prime.phi"
+KINDS = [
+    "program", "binaryExpression", "identifier", "assignmentExpression", "variableDeclarationExpression",
+    "functionDeclaration", "objectLiteral", "callExpression", "memberExpression", "ifStatement",
+    "whileStatement", "forStatement", "forEachStatement", "doWhileStatement", "arrayLiteral",
+    "returnExpression", "assignmentBinaryExpression", "exportExpression", "importExpression", "tryStatement",
+    "throwStatement", "matchStatement", "delete", "integerLiteral", "realLiteral",
+    "stringLiteral", "unknownLiteral", "nullLiteral"
+]
+
+def record_nodes() -> list:
+    with open(PROGRAM) as f:
+        source_code = f.read()
+    ast = Parser(Lexer(source_code, PROGRAM).tokenize(), PROGRAM).generate_AST()
+
+    nodes = []
+    interpreter = Interpreter(PROGRAM)
+    evaluate = interpreter.evaluate
+
+    def record(node, env):
+        nodes.append(node)
+        return evaluate(node, env)
+
+    interpreter.evaluate = record
+    with contextlib.redirect_stdout(io.StringIO()):
+        interpreter.evaluate(ast, create_global_environment(None, PROGRAM))
+    return nodes
+
+def match_dispatch(node):
+    if isinstance(node, (str, float, int, Error)):
+        return node
+    match node.kind:
+        case "program": return 0
+        case "binaryExpression": return 1
+        case "identifier": return 2
+        case "assignmentExpression": return 3
+        case "variableDeclarationExpression": return 4
+        case "functionDeclaration": return 5
+        case "objectLiteral": return 6
+        case "callExpression": return 7
+        case "memberExpression": return 8
+        case "ifStatement": return 9
+        case "whileStatement": return 10
+        case "forStatement": return 11
+        case "forEachStatement": return 12
+        case "doWhileStatement": return 13
+        case "arrayLiteral": return 14
+        case "returnExpression": return 15
+        case "assignmentBinaryExpression": return 16
+        case "exportExpression": return 17
+        case "importExpression": return 18
+        case "tryStatement": return 19
+        case "throwStatement": return 20
+        case "matchStatement": return 21
+        case "delete": return 22
+        case "integerLiteral": return 23
+        case "realLiteral": return 24
+        case "stringLiteral": return 25
+        case "unknownLiteral": return 26
+        case "nullLiteral": return 27
+        case _: return None
+
+def make_tag_dispatch():
+    handlers = [None] * (max(NodeKind.__dict__[kind] for kind in KINDS) + 1)
+    for index, kind in enumerate(KINDS):
+        handlers[NodeKind.__dict__[kind]] = lambda node, index=index: index
+
+    def dispatch(node):
+        if isinstance(node, (str, float, int, Error)):
+            return node
+        handler = handlers[node.tag]
+        return handler(node) if handler is not None else None
+    return dispatch
+
+def make_class_dispatch():
+    handlers = {}
+    for cls in Interpreter().evaluators:
+        handlers[cls] = lambda node, index=KINDS.index(cls.kind): index
+
+    def dispatch(node):
+        handler = handlers.get(type(node))
+        if handler is not None:
+            return handler(node)
+        if isinstance(node, (str, float, int, Error)):
+            return node
+        return None
+    return dispatch
+
+def time_dispatch(dispatch, nodes: list, repeats: int) -> float:
+    start = perf_counter()
+    for _ in range(repeats):
+        for node in nodes:
+            dispatch(node)
+    return (perf_counter() - start) / (repeats * len(nodes))
+
+def time_loop(nodes: list, repeats: int) -> float:
+    start = perf_counter()
+    for _ in range(repeats):
+        for node in nodes:
+            pass
+    return (perf_counter() - start) / (repeats * len(nodes))
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    nodes = record_nodes()
+    loop = time_loop(nodes, repeats)
+
+    print(f"{len(nodes)} nodes evaluated by {PROGRAM}")
+    print(f"{'dispatch':>12} {'ns/node':>10}")
+    for name, dispatch in [("kind match", match_dispatch), ("tag list", make_tag_dispatch()), ("class table", make_class_dispatch())]:
+        print(f"{name:>12} {(time_dispatch(dispatch, nodes, repeats) - loop) * 1e9:>10.1f}")
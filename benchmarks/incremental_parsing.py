@@ -0,0 +1,57 @@
+# Times a one character edit in the middle of generated files, reparsed from scratch
+# and with IncrementalParser. The incremental column should stay flat as files grow.
+#
+#   python -m benchmarks.incremental_parsing [max lines]
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from frontend.IncrementalParser import IncrementalParser
+from time import perf_counter
+import sys
+
+SNIPPET = '''fn step{index}(value) {{
+    int total = value
+    while (total < 10){{
+        total += 1
+    }}
+    <- total * 3 + 1
+}}
+
+'''
+
+SIZES = [625, 1250, 2500, 5000]
+EDITS = 20
+
+def generate_source(lines: int) -> str:
+    repeats = lines // SNIPPET.count('\n') + 1
+    return ''.join(SNIPPET.format(index=index) for index in range(repeats))
+
+def edits(source_code: str) -> list[str]:
+    position = source_code.index("total * 3", len(source_code) // 2)
+    return [source_code[:position] + "total * " + str(digit) + source_code[position + 9:] for digit in range(EDITS)]
+
+def time_full(versions: list[str]) -> float:
+    start = perf_counter()
+    for source_code in versions:
+        Parser(Lexer(source_code).tokenize()).generate_AST()
+    return (perf_counter() - start) / len(versions)
+
+def time_incremental(source_code: str, versions: list[str]) -> float:
+    parser = IncrementalParser()
+    parser.update(source_code)
+
+    start = perf_counter()
+    for version in versions:
+        parser.update(version)
+    return (perf_counter() - start) / len(versions)
+
+if __name__ == "__main__":
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+
+    print(f"{'lines':>10} {'full ms':>10} {'incr ms':>10} {'speedup':>10}")
+    for lines in [s for s in SIZES if s <= max_size]:
+        source_code = generate_source(lines)
+        versions = edits(source_code)
+        full = time_full(versions)
+        incremental = time_incremental(source_code, versions)
+        print(f"{source_code.count(chr(10)):>10} {full * 1e3:>10.2f} {incremental * 1e3:>10.2f} {full / incremental:>10.1f}")
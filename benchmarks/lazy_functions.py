@@ -0,0 +1,32 @@
+# Times parsing and running a library style file that declares many functions and calls one,
+# with function bodies parsed up front and lazily on first call.
+#
+#   python -m benchmarks.lazy_functions [max functions]
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Interpreter import Interpreter
+from backend.Environment import create_global_environment
+from benchmarks.incremental_parsing import generate_source
+from time import perf_counter
+import sys
+
+SIZES = [100, 1000, 5000]
+LINES_PER_FUNCTION = 8
+
+def time_run(tokens: list, lazy: bool) -> float:
+    start = perf_counter()
+    ast = Parser(tokens, lazy=lazy).generate_AST()
+    Interpreter().evaluate(ast, create_global_environment())
+    return perf_counter() - start
+
+if __name__ == "__main__":
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+
+    print(f"{'functions':>10} {'eager ms':>10} {'lazy ms':>10} {'speedup':>10}")
+    for functions in [s for s in SIZES if s <= max_size]:
+        source_code = generate_source(functions * LINES_PER_FUNCTION) + "output(step0(4))\n"
+        tokens = Lexer(source_code).tokenize()
+        eager = time_run(tokens, False)
+        lazy = time_run(tokens, True)
+        print(f"{functions:>10} {eager * 1e3:>10.2f} {lazy * 1e3:>10.2f} {eager / lazy:>10.1f}")
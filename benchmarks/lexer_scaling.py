@@ -0,0 +1,45 @@
+# Times Lexer.tokenize on generated sources from 1 KB to 10 MB.
+# Linear scaling shows up as a constant time per KB column.
+#
+#   python -m benchmarks.lexer_scaling [max size in KB] [cursor|regex]
+
+from frontend.Lexer import Lexer
+from time import perf_counter
+import sys
+
+SNIPPET = '''fn checkPrime(number){
+    array factors = []
+    int i = 2
+    # count the factors
+    while (i < number){
+        if (number % i == 0){
+            factors.append(i)
+        }
+        i += 1
+    }
+    str message = "done checking"
+    real ratio = 1.5 * i
+    <- factors.length() == 0
+}
+'''
+
+SIZES = [1, 10, 100, 1000, 10000]
+
+def generate_source(size: int) -> str:
+    repeats = size // len(SNIPPET) + 1
+    return (SNIPPET * repeats)[:size].rsplit('\n', 1)[0] + '\n'
+
+def time_tokenize(source_code: str, mode: str = 'cursor') -> tuple[float, int]:
+    start = perf_counter()
+    tokens = Lexer(source_code, mode=mode).tokenize()
+    return perf_counter() - start, len(tokens)
+
+if __name__ == "__main__":
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    mode = sys.argv[2] if len(sys.argv) > 2 else 'cursor'
+
+    print(f"{'size (KB)':>10} {'tokens':>10} {'seconds':>10} {'us/KB':>10}")
+    for kilobytes in [s for s in SIZES if s <= max_size]:
+        source_code = generate_source(kilobytes * 1024)
+        seconds, tokens = time_tokenize(source_code, mode)
+        print(f"{kilobytes:>10} {tokens:>10} {seconds:>10.4f} {seconds / kilobytes * 1e6:>10.1f}")
@@ -0,0 +1,39 @@
+# Times a naively recursive Fibonacci function in Phi with and without memoize, on every backend
+# in shell.BACKENDS. The memoized version computes each number once, so it stays fast as n grows.
+#
+#   python -m benchmarks.memoization
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Environment import create_global_environment
+from time import perf_counter
+import contextlib
+import shell
+import io
+
+FIB = '''fn fib(n) {{
+    int result = n
+    if (n > 1) {{
+        result = fib(n - 1) + fib(n - 2)
+    }}
+    <- result
+}}
+{memoize}
+output(fib({n}))
+'''
+
+SIZES = [10, 15, 20]
+
+def time_backend(backend, ast) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = perf_counter()
+        backend().evaluate(ast, create_global_environment())
+        return perf_counter() - start
+
+if __name__ == "__main__":
+    print(f"{'n':>4} {'backend':>12} {'plain ms':>12} {'memoized ms':>12}")
+    for n in SIZES:
+        plain = Parser(Lexer(FIB.format(memoize="", n=n)).tokenize()).generate_AST()
+        memoized = Parser(Lexer(FIB.format(memoize="fib = memoize(fib)", n=n)).tokenize()).generate_AST()
+        for backend_name, backend in shell.BACKENDS.items():
+            print(f"{n:>4} {backend_name:>12} {time_backend(backend, plain) * 1e3:>12.2f} {time_backend(backend, memoized) * 1e3:>12.2f}")
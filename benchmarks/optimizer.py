@@ -0,0 +1,46 @@
+# Times a Phi loop full of constant arithmetic and constant conditions at every optimization level,
+# on every backend in shell.BACKENDS, and counts the nodes the Optimizer eliminated.
+#
+#   python -m benchmarks.optimizer
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Environment import create_global_environment
+from backend.Optimizer import Optimizer
+from time import perf_counter
+import contextlib
+import shell
+import io
+
+LOOP = '''int SIZE = 60 * 60 + 400
+int STEP = 2 ^ 3 - 7
+int total = 0
+int i = 0
+while (i < SIZE) {
+    total += i * (4 * 25) + 7 % 4
+    if (1 == 1) {
+        total -= 3 + 2 * 10
+    }
+    if (T) {
+        i += STEP
+    }
+}
+output(total)
+'''
+
+LEVELS = [0, 1, 2]
+
+def time_backend(backend, ast) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = perf_counter()
+        backend().evaluate(ast, create_global_environment())
+        return perf_counter() - start
+
+if __name__ == "__main__":
+    ast = Parser(Lexer(LOOP).tokenize()).generate_AST()
+    print(f"{'level':>6} {'eliminated':>11}" + "".join(f"{name:>12}" for name in shell.BACKENDS))
+    for level in LEVELS:
+        optimizer = Optimizer(level)
+        optimized = optimizer.optimize(ast)
+        times = [time_backend(backend, optimized) for backend in shell.BACKENDS.values()]
+        print(f"{level:>6} {optimizer.eliminated:>11}" + "".join(f"{seconds * 1e3:>12.2f}" for seconds in times))
@@ -0,0 +1,40 @@
+# Times Parser.generate_AST on generated programs from 1k to 1M tokens.
+# Linear scaling shows up as a constant time per 1k tokens column.
+#
+#   python -m benchmarks.parser_scaling [max tokens in thousands]
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from time import perf_counter
+import sys
+
+SNIPPET = '''int total = 0
+while (total < 10){
+    total += 1
+    if (total % 2 == 0){
+        output(total * 3 + 1)
+    }
+}
+'''
+
+SIZES = [1, 10, 100, 1000]
+
+def generate_tokens(thousands: int) -> list:
+    tokens_per_snippet = len(Lexer(SNIPPET).tokenize()) - 1
+    repeats = thousands * 1000 // tokens_per_snippet + 1
+    return Lexer(SNIPPET * repeats, mode='regex').tokenize()
+
+def time_parse(tokens: list) -> float:
+    start = perf_counter()
+    Parser(tokens).generate_AST()
+    return perf_counter() - start
+
+if __name__ == "__main__":
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+
+    print(f"{'tokens':>10} {'seconds':>10} {'us/1k':>10}")
+    for thousands in [s for s in SIZES if s <= max_size]:
+        tokens = generate_tokens(thousands)
+        count = len(tokens)
+        seconds = time_parse(tokens)
+        print(f"{count:>10} {seconds:>10.4f} {seconds / count * 1e9:>10.1f}")
@@ -0,0 +1,41 @@
+# Times Phi programs on the interpreter with and without caching the calls of pure functions, and
+# lists the functions the purity analysis found pure. Only programs that call a pure function with
+# the same arguments more than once get faster.
+#
+#   python -m benchmarks.pure_calls
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Environment import create_global_environment
+from backend.Interpreter import Interpreter
+from backend.Purity import PurityAnalyzer, pure_bodies
+from benchmarks.backends import PROGRAMS
+from time import perf_counter
+import contextlib
+import io
+
+FIB = '''fn fib(n) {
+    int result = n
+    if (n > 1) {
+        result = fib(n - 1) + fib(n - 2)
+    }
+    <- result
+}
+output(fib(20))
+'''
+
+def time_program(ast, cache: bool) -> float:
+    interpreter = Interpreter()
+    if cache:
+        interpreter.pure_bodies = pure_bodies(PurityAnalyzer().analyze(ast))
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = perf_counter()
+        interpreter.evaluate(ast, create_global_environment())
+        return perf_counter() - start
+
+if __name__ == "__main__":
+    print(f"{'program':>18} {'plain ms':>12} {'cached ms':>12}  pure functions")
+    for name, source in {**PROGRAMS, "fib": FIB}.items():
+        ast = Parser(Lexer(source).tokenize()).generate_AST()
+        pure = [purity.name for purity in PurityAnalyzer().analyze(ast) if purity.pure]
+        print(f"{name:>18} {time_program(ast, False) * 1e3:>12.2f} {time_program(ast, True) * 1e3:>12.2f}  {', '.join(pure)}")
@@ -0,0 +1,68 @@
+# Times the Interpreter on function bodies that mostly read their own variables, once with the
+# identifiers the Resolver points at slots of the call scope and once with every identifier looked
+# up by name through Environment.resolve. Each run parses the program again, so no slot survives.
+#
+#   python -m benchmarks.scope_resolution [repeats]
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Interpreter import Interpreter
+from backend.Environment import create_global_environment
+from backend.Resolver import Resolver, Scope
+from time import perf_counter
+import contextlib
+import io
+import sys
+
+READS = '''fn sum(n) {
+    int a = 1
+    int b = 2
+    int c = 0
+    int i = 0
+    while (i < n) {
+        c = a + b + a + b + a + b + a + b
+        i += 1
+    }
+    <- c
+}
+output(sum(20000))
+'''
+
+CALLS = '''fn square(x) {
+    <- x * x
+}
+fn squares(n) {
+    int total = 0
+    for (int i = 0, i < n, i += 1) {
+        total += square(i)
+    }
+    <- total
+}
+output(squares(5000))
+'''
+
+class NameResolver(Resolver):
+    def resolve_function(self, parameters: list, body: list) -> Scope:
+        return Scope([])
+
+def time_program(source_code: str, resolver: type, repeats: int) -> float:
+    best = None
+    for _ in range(repeats):
+        ast = Parser(Lexer(source_code).tokenize()).generate_AST()
+        interpreter = Interpreter()
+        interpreter.resolver = resolver()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = perf_counter()
+            interpreter.evaluate(ast, create_global_environment())
+            elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"{'program':>10} {'by name ms':>12} {'slots ms':>10} {'speedup':>10}")
+    for name, source_code in [("reads", READS), ("calls", CALLS)]:
+        by_name = time_program(source_code, NameResolver, repeats)
+        slots = time_program(source_code, Resolver, repeats)
+        print(f"{name:>10} {by_name * 1e3:>12.2f} {slots * 1e3:>10.2f} {by_name / slots:>10.2f}")
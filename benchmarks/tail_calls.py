@@ -0,0 +1,42 @@
+# Times a self-recursive Phi function whose recursive call is in tail position, at growing depths,
+# on every backend in shell.BACKENDS. The recursion ends by throwing an error, as a '<-' nested in
+# an if statement does not end a call. Backends that make a Python call for every Phi call stop at
+# Python's recursion limit.
+#
+#   python -m benchmarks.tail_calls
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Environment import create_global_environment
+from time import perf_counter
+import contextlib
+import shell
+import io
+
+COUNT = '''fn count(n, total) {{
+    if (n == 0) {{
+        throw zeroDivisionError "done"
+    }}
+    <- count(n - 1, total + n)
+}}
+count({depth}, 0)
+'''
+
+DEPTHS = [100, 1000, 10000, 100000]
+
+def time_backend(backend, ast) -> float | None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = perf_counter()
+        try:
+            backend().evaluate(ast, create_global_environment())
+        except RecursionError:
+            return None
+        return perf_counter() - start
+
+if __name__ == "__main__":
+    print(f"{'depth':>8} {'backend':>12} {'ms':>12}")
+    for depth in DEPTHS:
+        ast = Parser(Lexer(COUNT.format(depth=depth)).tokenize()).generate_AST()
+        for backend_name, backend in shell.BACKENDS.items():
+            seconds = time_backend(backend, ast)
+            print(f"{depth:>8} {backend_name:>12} {'RecursionError' if seconds is None else f'{seconds * 1e3:.2f}':>12}")
@@ -0,0 +1,32 @@
+# Compares the memory held by a list of Token objects with a TokenBuffer for the same source.
+#
+#   python -m benchmarks.token_memory [size in KB]
+
+from benchmarks.lexer_scaling import generate_source
+from frontend.Lexer import Lexer
+from time import perf_counter
+import tracemalloc
+import sys
+
+def measure(tokenize) -> tuple[object, int, float]:
+    tracemalloc.start()
+    start = perf_counter()
+    tokens = tokenize()
+    seconds = perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tokens, size, seconds
+
+if __name__ == "__main__":
+    kilobytes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    source_code = generate_source(kilobytes * 1024)
+
+    tokens, list_size, list_seconds = measure(lambda: Lexer(source_code, mode='regex').tokenize())
+    count = len(tokens)
+    del tokens
+    buffer, buffer_size, buffer_seconds = measure(lambda: Lexer(source_code).tokenize_compact())
+
+    print(f"{count} tokens from {kilobytes} KB")
+    print(f"Token list:   {list_size / count:>7.1f} bytes/token {list_seconds:>8.3f} s")
+    print(f"TokenBuffer:  {buffer_size / count:>7.1f} bytes/token {buffer_seconds:>8.3f} s")
+    print(f"Reduction:    {list_size / buffer_size:>7.1f}x")
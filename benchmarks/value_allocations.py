@@ -0,0 +1,46 @@
+# Counts the runtime values each backend in shell.BACKENDS makes while running the loop heavy
+# program of benchmarks.backends, and how many of them are nulls, booleans or integers from -5 to
+# 1024 that the shared values of backend.RuntimeValue could have stood for.
+#
+#   python -m benchmarks.value_allocations
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from backend.Environment import create_global_environment
+from backend.RuntimeValue import RuntimeValue, IntegerValue, NullValue, BooleanValue
+from benchmarks.backends import LOOP
+from time import perf_counter
+import contextlib
+import shell
+import io
+
+def count_values(backend, ast) -> tuple:
+    made = []
+    initialize = RuntimeValue.__init__
+
+    def record(value, *args, **kwargs):
+        initialize(value, *args, **kwargs)
+        made.append(value)
+
+    RuntimeValue.__init__ = record
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = perf_counter()
+            backend().evaluate(ast, create_global_environment())
+            elapsed = perf_counter() - start
+    finally:
+        RuntimeValue.__init__ = initialize
+
+    shareable = sum(
+        1 for value in made
+        if type(value) in (NullValue, BooleanValue)
+        or (type(value) is IntegerValue and value.line == -1 and type(value.value) is int and -5 <= value.value <= 1024)
+    )
+    return len(made), shareable, elapsed
+
+if __name__ == "__main__":
+    ast = Parser(Lexer(LOOP).tokenize()).generate_AST()
+    print(f"{'backend':>12} {'values':>10} {'shareable':>10} {'ms':>10}")
+    for backend_name, backend in shell.BACKENDS.items():
+        made, shareable, elapsed = count_values(backend, ast)
+        print(f"{backend_name:>12} {made:>10} {shareable:>10} {elapsed * 1e3:>10.2f}")
@@ -0,0 +1,80 @@
+# Creates strings, arrays and objects the way values used to be made, each with its own dict of
+# NativeFunction closures over itself, and with the shared per-type method tables they use now.
+# Reports the memory allocated per value, the garbage collections the creation triggered and the
+# time per value.
+#
+#   python -m benchmarks.value_methods [count]
+
+from backend.RuntimeValue import *
+from time import perf_counter
+import tracemalloc
+import gc
+import sys
+
+import backend.Methods as bim
+
+class OwnMethodsString(StringValue):
+    def __init__(self, value: str, line: int = -1, column: int = -1) -> None:
+        super().__init__(value, line, column)
+        self.methods = {
+            "length": NativeFunction(lambda args, scope: bim.string_length(self)),
+            "format": NativeFunction(lambda args, scope: bim.string_format(args, self))
+        }
+
+class OwnMethodsArray(ArrayValue):
+    def __init__(self, items: dict, line: int = -1, column: int = -1) -> None:
+        super().__init__(items, line, column)
+        self.methods = {
+            "append": NativeFunction(lambda args, scope: bim.array_append(self, args[0])),
+            "length": NativeFunction(lambda args, scope: bim.array_length(self)),
+            "join": NativeFunction(lambda args, scope: bim.array_join(self, args[0]))
+        }
+
+class OwnMethodsObject(ObjectValue):
+    def __init__(self, properties: dict, line: int = -1, column: int = -1) -> None:
+        super().__init__(properties, line, column)
+        self.methods = {
+            "items": NativeFunction(lambda args, scope: bim.object_items(self)),
+            "keys": NativeFunction(lambda args, scope: bim.object_keys(self)),
+            "update": NativeFunction(lambda args, scope: bim.object_update(self, args[0])),
+            "hasAttr": NativeFunction(lambda args, scope: bim.object_has_attribute(self, args[0]))
+        }
+
+CASES = [
+    ("string", OwnMethodsString, StringValue, lambda: "phi"),
+    ("array", OwnMethodsArray, ArrayValue, lambda: {}),
+    ("object", OwnMethodsObject, ObjectValue, lambda: {}),
+]
+
+# Bytes still allocated per value while count of them are alive
+def allocated(make, argument, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    values = [make(argument()) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del values
+    return size / count
+
+# Collections of the youngest generation while making and dropping count values one at a time
+def collections(make, argument, count: int) -> int:
+    gc.collect()
+    before = gc.get_stats()[0]["collections"]
+    for _ in range(count):
+        make(argument())
+    return gc.get_stats()[0]["collections"] - before
+
+def time_per_value(make, argument, count: int) -> float:
+    gc.collect()
+    start = perf_counter()
+    for _ in range(count):
+        make(argument())
+    return (perf_counter() - start) / count
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print(f"{'value':>8} {'methods':>8} {'bytes/value':>12} {'gen0 GCs':>10} {'ns/value':>10}")
+    for name, own, shared, argument in CASES:
+        for label, make in [("own", own), ("shared", shared)]:
+            print(f"{name:>8} {label:>8} {allocated(make, argument, count):>12.1f} {collections(make, argument, count):>10} {time_per_value(make, argument, count) * 1e9:>10.1f}")
@@ -0,0 +1,133 @@
+from frontend.ASTNodes import ProgramNode
+from version import VERSION
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import sys
+import tempfile
+
+# Bump when the layout of the AST nodes or of the cache files changes
+FORMAT_VERSION = 4
+MAGIC = b"PHIC"
+CACHE_DIRECTORY = "__phicache__"
+HEADER = MAGIC + f"{VERSION}:{FORMAT_VERSION}".encode().ljust(28, b"\0")
+DIGEST_SIZE = hashlib.sha256().digest_size
+RECURSION_LIMIT = 20000
+# The secret cache files are signed with, one per user, readable by nobody else
+KEY_PATH = os.path.join(os.path.expanduser("~"), ".phi", "cache.key")
+KEY_SIZE = 32
+
+def source_hash(source_code: str, variant: str = "") -> bytes:
+    return hashlib.sha256(variant.encode() + b"\0" + source_code.encode("utf-8", "surrogatepass")).digest()
+
+# The key of the user at path, made the first time. None when it can't be read or made, or when
+# someone else could read or change it, as then anyone could sign a cache file.
+def load_key(path: str = KEY_PATH) -> bytes | None:
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        try:
+            descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(secrets.token_bytes(KEY_SIZE))
+
+        with open(path, "rb") as f:
+            if os.name == "posix":
+                status = os.fstat(f.fileno())
+                if status.st_uid != os.getuid() or status.st_mode & 0o077:
+                    return None
+            key = f.read()
+    except OSError:
+        return None
+    return key if len(key) == KEY_SIZE else None
+
+# Parsed programs are stored as <directory>/__phicache__/<name>.phic, a fixed header with the
+# interpreter version, the hash of the source and a signature followed by the pickled ProgramNode.
+# The signature is an HMAC of the rest of the file with the user's key, a file is only unpickled
+# once it checks out, so writing to __phicache__ is not enough to run code in whoever loads it.
+# A cache that cannot be read or written, or that has no key, is treated as a miss, never as an error.
+# Subclasses keep other compiled forms of a program by changing the extension, header and value_type.
+class ASTCache:
+    extension = ".phic"
+    header = HEADER
+    value_type = ProgramNode
+
+    def __init__(self, directory: str = None, key_path: str = KEY_PATH) -> None:
+        self.directory = directory
+        self.key_path = key_path
+        self._key = None
+
+    @property
+    def key(self) -> bytes | None:
+        if self._key is None:
+            self._key = load_key(self.key_path)
+        return self._key
+
+    def sign(self, key: bytes, data: bytes) -> bytes:
+        return hmac.new(key, data, hashlib.sha256).digest()
+
+    def path(self, file_path: str) -> str:
+        directory, name = os.path.split(os.path.abspath(file_path))
+        directory = self.directory or os.path.join(directory, CACHE_DIRECTORY)
+        return os.path.join(directory, os.path.splitext(name)[0] + self.extension)
+
+    # variant tells apart programs parsed from the same source with different parser options
+    def load(self, source_code: str, file_path: str, variant: str = "") -> ProgramNode | None:
+        if not file_path or self.key is None:
+            return None
+
+        try:
+            with open(self.path(file_path), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        signature = len(self.header) + DIGEST_SIZE
+        body = signature + DIGEST_SIZE
+        if data[:len(self.header)] != self.header or data[len(self.header):signature] != source_hash(source_code, variant):
+            return None
+        if not hmac.compare_digest(data[signature:body], self.sign(self.key, data[:signature] + data[body:])):
+            return None
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, RECURSION_LIMIT))
+        try:
+            ast = pickle.loads(data[body:])
+        except Exception:
+            return None
+        finally:
+            sys.setrecursionlimit(limit)
+
+        return ast if isinstance(ast, self.value_type) else None
+
+    def store(self, source_code: str, file_path: str, ast: ProgramNode, variant: str = "") -> None:
+        if not file_path or self.key is None:
+            return
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, RECURSION_LIMIT))
+        try:
+            body = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError, TypeError):
+            return
+        finally:
+            sys.setrecursionlimit(limit)
+        signed = self.header + source_hash(source_code, variant)
+        data = signed + self.sign(self.key, signed + body) + body
+
+        path = self.path(file_path)
+        temporary = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written next to the target and renamed so readers never see a partial file
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            if temporary is not None and os.path.exists(temporary):
+                os.remove(temporary)
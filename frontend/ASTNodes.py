@@ -1,17 +1,25 @@
 from backend.RuntimeValue import *
 from frontend.Lexer import *
+from frontend.NodeKind import NodeKind
 
 class ASTNode:
+    __slots__ = ("line", "column")
+
     def __init__(self, line: int, column: int) -> None:
         self.line = line
         self.column = column
 
 # datatypes
 class IdentifierNode(ASTNode):
+    __slots__ = ("symbol", "slot")
+    kind = "identifier"
+    tag = NodeKind.identifier
+
     def __init__(self, symbol: str, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "identifier"
         self.symbol = symbol
+        # Index of the variable in the slots of the call scope, set by the Resolver, -1 when it is looked up by name
+        self.slot = -1
 
     def __repr__(self) -> str:
         return str({
@@ -20,9 +28,12 @@ class IdentifierNode(ASTNode):
         })
 
 class RealLiteralNode(ASTNode):
+    __slots__ = ("value",)
+    kind = "realLiteral"
+    tag = NodeKind.realLiteral
+
     def __init__(self, value, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "realLiteral"
         self.value = value
 
     def __repr__(self) -> str:
@@ -32,9 +43,12 @@ class RealLiteralNode(ASTNode):
         })
     
 class UnknownLiteralNode(ASTNode):
+    __slots__ = ("value",)
+    kind = "unknownLiteral"
+    tag = NodeKind.unknownLiteral
+
     def __init__(self, value, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "unknownLiteral"
         self.value = value
 
     def __repr__(self) -> str:
@@ -44,9 +58,12 @@ class UnknownLiteralNode(ASTNode):
         })
 
 class IntegerLiteralNode(ASTNode):
+    __slots__ = ("value",)
+    kind = "integerLiteral"
+    tag = NodeKind.integerLiteral
+
     def __init__(self, value, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "integerLiteral"
         self.value = value
 
     def __repr__(self) -> str:
@@ -56,9 +73,12 @@ class IntegerLiteralNode(ASTNode):
         })
 
 class StringLiteralNode(ASTNode):
+    __slots__ = ("value",)
+    kind = "stringLiteral"
+    tag = NodeKind.stringLiteral
+
     def __init__(self, value, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "stringLiteral"
         self.value = value
 
     def __repr__(self) -> str:
@@ -68,9 +88,12 @@ class StringLiteralNode(ASTNode):
         })
 
 class NullLiteralNode(ASTNode):
+    __slots__ = ("value",)
+    kind = "nullLiteral"
+    tag = NodeKind.nullLiteral
+
     def __init__(self, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "nullLiteral"
         self.value = "null"
 
     def __repr__(self) -> str:
@@ -80,9 +103,12 @@ class NullLiteralNode(ASTNode):
         })
 
 class ObjectLiteralNode(ASTNode):
+    __slots__ = ("properties",)
+    kind = "objectLiteral"
+    tag = NodeKind.objectLiteral
+
     def __init__(self, properties: list, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "objectLiteral"
         self.properties = properties
 
     def __repr__(self) -> str:
@@ -92,9 +118,12 @@ class ObjectLiteralNode(ASTNode):
         })
 
 class PropertyLiteralNode(ASTNode):
+    __slots__ = ("key", "value")
+    kind = "propertyLiteral"
+    tag = NodeKind.propertyLiteral
+
     def __init__(self, key, value, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "propertyLiteral"
         self.key = key
         self.value = value
 
@@ -106,9 +135,12 @@ class PropertyLiteralNode(ASTNode):
         })
 
 class ArrayLiteralNode(ASTNode):
+    __slots__ = ("items",)
+    kind = "arrayLiteral"
+    tag = NodeKind.arrayLiteral
+
     def __init__(self, items: list, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "arrayLiteral"
         self.items = items
 
     def __repr__(self) -> str:
@@ -118,9 +150,12 @@ class ArrayLiteralNode(ASTNode):
         })
 
 class ItemLiteralNode(ASTNode):
+    __slots__ = ("index", "value")
+    kind = "itemLiteral"
+    tag = NodeKind.itemLiteral
+
     def __init__(self, index, value, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "itemLiteral"
         self.index = index
         self.value = value
 
@@ -132,11 +167,14 @@ class ItemLiteralNode(ASTNode):
         })
 
 class ProgramNode(ASTNode):
+    __slots__ = ("body",)
+    kind = "program"
+    tag = NodeKind.program
+
     def __init__(self, body: list = None, line: int = -1, column: int = -1) -> None:
         if body is None:
             body = []
         super().__init__(line, column)
-        self.kind = "program"
         self.body = body
 
     def __repr__(self) -> str:
@@ -146,9 +184,12 @@ class ProgramNode(ASTNode):
         }).replace("'", '"')                # for some wierd reason this is needed to prevent an error which doesn't make sense at all
 
 class ExpressionNode(ASTNode):
+    __slots__ = ()
+    kind = "expression"
+    tag = NodeKind.expression
+
     def __init__(self, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "expression"
 
     def __repr__(self) -> str:
         return str({
@@ -156,9 +197,12 @@ class ExpressionNode(ASTNode):
         })
 
 class BinaryExpressionNode(ASTNode):
+    __slots__ = ("left", "operand", "right")
+    kind = "binaryExpression"
+    tag = NodeKind.binaryExpression
+
     def __init__(self, left, operand: str, right, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "binaryExpression"
         self.left = left
         self.operand = operand
         self.right = right
@@ -173,11 +217,14 @@ class BinaryExpressionNode(ASTNode):
 
 # statements
 class IfStatementNode(ASTNode):
+    __slots__ = ("left_condition", "operand", "right_condition", "body", "else_body")
+    kind = "ifStatement"
+    tag = NodeKind.ifStatement
+
     def __init__(self, left_condition, operand, right_condition, body, else_body=None, line: int = -1, column: int = -1) -> None:
         if else_body is None:
             else_body = []
         super().__init__(line, column)
-        self.kind = "ifStatement"
         self.left_condition = left_condition
         self.operand = operand
         self.right_condition = right_condition
@@ -196,11 +243,14 @@ class IfStatementNode(ASTNode):
 
 
 class WhileStatementNode(ASTNode):
+    __slots__ = ("left_condition", "operand", "right_condition", "body", "else_body")
+    kind = "whileStatement"
+    tag = NodeKind.whileStatement
+
     def __init__(self, left_condition, operand, right_condition, body, else_body=None, line: int = -1, column: int = -1) -> None:
         if else_body is None:
             else_body = []
         super().__init__(line, column)
-        self.kind = "whileStatement"
         self.left_condition = left_condition
         self.operand = operand
         self.right_condition = right_condition
@@ -218,9 +268,12 @@ class WhileStatementNode(ASTNode):
         })
 
 class ForStatementNode(ASTNode):
+    __slots__ = ("declaration", "left_condition", "operand", "right_condition", "body", "step")
+    kind = "forStatement"
+    tag = NodeKind.forStatement
+
     def __init__(self, declaration, left_condition, operand, right_condition, step, body, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "forStatement"
         self.declaration = declaration
         self.left_condition = left_condition
         self.operand = operand
@@ -240,9 +293,12 @@ class ForStatementNode(ASTNode):
         })
 
 class ForEachStatementNode(ASTNode):
+    __slots__ = ("declaration", "body", "iterable")
+    kind = "forEachStatement"
+    tag = NodeKind.forEachStatement
+
     def __init__(self, declaration, iterable, body, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "forEachStatement"
         self.declaration = declaration
         self.body = body
         self.iterable = iterable
@@ -256,9 +312,12 @@ class ForEachStatementNode(ASTNode):
         })
 
 class DoWhileStatementNode(ASTNode):
+    __slots__ = ("body", "left_condition", "operand", "right_condition")
+    kind = "doWhileStatement"
+    tag = NodeKind.doWhileStatement
+
     def __init__(self, body, left_condition, operand, right_condition, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "doWhileStatement"
         self.body = body
         self.left_condition = left_condition
         self.operand = operand
@@ -274,9 +333,12 @@ class DoWhileStatementNode(ASTNode):
         })
 
 class AssignmentExpressionNode(ASTNode):
+    __slots__ = ("assigne", "value")
+    kind = "assignmentExpression"
+    tag = NodeKind.assignmentExpression
+
     def __init__(self, assigne, value, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "assignmentExpression"
         self.assigne = assigne
         self.value = value
 
@@ -288,9 +350,12 @@ class AssignmentExpressionNode(ASTNode):
         })
 
 class AssignmentBinaryExpressionNode(ASTNode):
+    __slots__ = ("assigne", "operand", "value")
+    kind = "assignmentBinaryExpression"
+    tag = NodeKind.assignmentBinaryExpression
+
     def __init__(self, assigne, operand, value, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "assignmentBinaryExpression"
         self.assigne = assigne
         self.operand = operand
         self.value = value
@@ -304,9 +369,12 @@ class AssignmentBinaryExpressionNode(ASTNode):
         })
 
 class VariableDeclarationExpressionNode(ASTNode):
+    __slots__ = ("dataType", "identifier", "value", "constant")
+    kind = "variableDeclarationExpression"
+    tag = NodeKind.variableDeclarationExpression
+
     def __init__(self, datatype: str, identifier: IdentifierNode, value, constant: bool = False, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "variableDeclarationExpression"
         self.dataType = datatype
         self.identifier = identifier
         self.value = value
@@ -322,13 +390,16 @@ class VariableDeclarationExpressionNode(ASTNode):
         })
 
 class FunctionDeclarationExpressionNode(ASTNode):
+    __slots__ = ("name", "parameters", "body")
+    kind = "functionDeclaration"
+    tag = NodeKind.functionDeclaration
+
     def __init__(self, name: str, parameters: list = None, body: list = None, line: int = -1, column: int = -1) -> None:
         if parameters is None:
             parameters = []
         if body is None:
             body = []
         super().__init__(line, column)
-        self.kind = "functionDeclaration"
         self.name = name
         self.parameters = parameters
         self.body = body
@@ -342,9 +413,12 @@ class FunctionDeclarationExpressionNode(ASTNode):
         })
 
 class MemberExpressionNode(ASTNode):
+    __slots__ = ("object", "property", "computed")
+    kind = "memberExpression"
+    tag = NodeKind.memberExpression
+
     def __init__(self, object, property, computed: bool, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "memberExpression"
         self.object = object
         self.property = property
         self.computed = computed
@@ -358,9 +432,12 @@ class MemberExpressionNode(ASTNode):
         })
 
 class CallExpression(ASTNode):
+    __slots__ = ("caller", "arguments")
+    kind = "callExpression"
+    tag = NodeKind.callExpression
+
     def __init__(self, caller, arguments: list, line: int = -1, column: int = -1) -> None:
         super().__init__(line, column)
-        self.kind = "callExpression"
         self.caller = caller
         self.arguments = arguments
 
@@ -372,9 +449,12 @@ class CallExpression(ASTNode):
         })
 
 class ReturnNode(ASTNode):
+    __slots__ = ("value",)
+    kind = "returnExpression"
+    tag = NodeKind.returnExpression
+
     def __init__(self, value, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "returnExpression"
         self.value = value
 
     def __repr__(self) -> str:
@@ -384,9 +464,12 @@ class ReturnNode(ASTNode):
         })
 
 class ExportNode(ASTNode):
+    __slots__ = ("value",)
+    kind = "exportExpression"
+    tag = NodeKind.exportExpression
+
     def __init__(self, value, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "exportExpression"
         self.value = value
 
     def __repr__(self) -> str:
@@ -396,10 +479,13 @@ class ExportNode(ASTNode):
         })
 
 class ImportNode(ASTNode):
+    __slots__ = ("names", "values")
+    kind = "importExpression"
+    tag = NodeKind.importExpression
+
     def __init__(self, names, values:list, line: int, column: int) -> None:
         super().__init__(line, column)
         self.names = names
-        self.kind = "importExpression"
         self.values = values
 
     def __repr__(self) -> str:
@@ -410,9 +496,12 @@ class ImportNode(ASTNode):
         })
 
 class BreakNode(ASTNode):
+    __slots__ = ()
+    kind = "breakExpression"
+    tag = NodeKind.breakExpression
+
     def __init__(self, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "breakExpression"
 
     def __repr__(self) -> str:
         return str({
@@ -420,9 +509,12 @@ class BreakNode(ASTNode):
         })
 
 class ContinueNode(ASTNode):
+    __slots__ = ()
+    kind = "continueExpression"
+    tag = NodeKind.continueExpression
+
     def __init__(self, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "continueExpression"
 
     def __repr__(self) -> str:
         return str({
@@ -430,9 +522,12 @@ class ContinueNode(ASTNode):
         })
 
 class TryNode(ASTNode):
+    __slots__ = ("try_body", "exception", "except_body")
+    kind = "tryStatement"
+    tag = NodeKind.tryStatement
+
     def __init__(self, try_body, exception, except_body, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "tryStatement"
         self.try_body = try_body
         self.exception = exception
         self.except_body = except_body
@@ -446,9 +541,12 @@ class TryNode(ASTNode):
         })
 
 class ThrowNode(ASTNode):
+    __slots__ = ("error", "msg")
+    kind = "throwStatement"
+    tag = NodeKind.throwStatement
+
     def __init__(self, error, message:str, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "throwStatement"
         self.error = error
         self.msg = message
 
@@ -460,9 +558,12 @@ class ThrowNode(ASTNode):
         })
 
 class MatchNode(ASTNode):
+    __slots__ = ("value", "matches")
+    kind = "matchStatement"
+    tag = NodeKind.matchStatement
+
     def __init__(self, value, matches, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "matchStatement"
         self.value = value
         self.matches = matches
 
@@ -474,9 +575,12 @@ class MatchNode(ASTNode):
         })
 
 class CaseNode(ASTNode):
+    __slots__ = ("value", "body")
+    kind = "case"
+    tag = NodeKind.case
+
     def __init__(self, value, body, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "case"
         self.value = value
         self.body = body
 
@@ -488,9 +592,12 @@ class CaseNode(ASTNode):
         })
     
 class DeleteNode(ASTNode):
+    __slots__ = ("variable",)
+    kind = "delete"
+    tag = NodeKind.delete
+
     def __init__(self, variable, line: int, column: int) -> None:
         super().__init__(line, column)
-        self.kind = "delete"
         self.variable = variable
 
     def __repr__(self) -> str:
@@ -0,0 +1,219 @@
+from frontend.Lexer import Lexer, TT
+from frontend.Parser import Parser
+from frontend.Token import TokenBuffer
+from frontend.ASTNodes import *
+from frontend.Error import *
+import copy
+
+BLOCK_SIZE = 4096
+OPENING_TYPES = (TT.open_parenthesis, TT.open_brace, TT.open_bracket)
+CLOSING_TYPES = (TT.close_parenthesis, TT.close_brace, TT.close_bracket)
+UNTERMINATED_STRING_MESSAGES = ("Expected a '\"'", "Expected a '''")
+
+def common_prefix_length(a: str, b: str, limit: int) -> int:
+    i = 0
+    while i < limit and a[i:i + BLOCK_SIZE] == b[i:i + BLOCK_SIZE]:
+        i += BLOCK_SIZE
+    i = min(i, limit)
+    end = min(i + BLOCK_SIZE, limit)
+    while i < end and a[i] == b[i]:
+        i += 1
+    return i
+
+def common_suffix_length(a: str, b: str, limit: int) -> int:
+    i = 0
+    while i < limit and a[len(a) - i - BLOCK_SIZE:len(a) - i] == b[len(b) - i - BLOCK_SIZE:len(b) - i] and i + BLOCK_SIZE <= limit:
+        i += BLOCK_SIZE
+    while i < limit and a[len(a) - i - 1] == b[len(b) - i - 1]:
+        i += 1
+    return i
+
+# A run of whole lines holding one top-level statement, or the text before the first one.
+# Error lines are relative to the first line of the segment.
+class Segment:
+    def __init__(self, text: str, statements: list, errors: list, lexer_errors: list, min_depth: int, depth: int, failure: Exception = None) -> None:
+        self.text = text
+        self.lines = text.count('\n')
+        self.statements = statements
+        self.errors = errors
+        self.lexer_errors = lexer_errors
+        self.min_depth = min_depth
+        self.depth = depth
+        self.failure = failure
+
+# Keeps the segments of the last parse so that an edit only relexes and reparses the
+# statements it touches. Positions inside reused statements are not moved when lines are
+# added above them, so run() keeps parsing from scratch. Error positions are always current.
+class IncrementalParser:
+    def __init__(self, file_path: str = "") -> None:
+        self.file_path = file_path
+        self.source_code = ""
+        self.segments = []
+
+    def update(self, source_code: str) -> ProgramNode | list[Error]:
+        old = self.source_code
+        limit = min(len(old), len(source_code))
+        prefix = common_prefix_length(old, source_code, limit)
+        suffix = common_suffix_length(old, source_code, limit - prefix)
+
+        if prefix == len(old) == len(source_code) and self.segments:
+            return self.result()
+
+        first, last, start, end = self.find_damaged_segments(prefix, len(old) - suffix)
+        shift = len(source_code) - len(old)
+
+        segments, depth, unterminated, cut_short = self.parse_region(source_code[start:end + shift], first == 0)
+
+        # A statement still open at the end of the region goes on into the segments after it
+        while (depth > 0 or unterminated or cut_short) and last + 1 < len(self.segments):
+            for last in range(last + 1, len(self.segments)):
+                segment = self.segments[last]
+                end += len(segment.text)
+                if not unterminated and depth + segment.min_depth <= 0:
+                    break
+                depth += segment.depth
+            segments, depth, unterminated, cut_short = self.parse_region(source_code[start:end + shift], first == 0)
+
+        self.segments[first:last + 1] = segments
+        self.source_code = source_code
+        return self.result()
+
+    def find_damaged_segments(self, damage_start: int, damage_end: int) -> tuple[int, int, int, int]:
+        if len(self.segments) == 0:
+            return 0, -1, 0, 0
+
+        first = last = None
+        first_start = last_end = 0
+        offset = 0
+
+        for index, segment in enumerate(self.segments):
+            segment_end = offset + len(segment.text)
+            if first is None and damage_start < segment_end:
+                first, first_start = index, offset
+            if first is not None and damage_end <= segment_end:
+                last, last_end = index, segment_end
+                break
+            offset = segment_end
+
+        if first is None:
+            first, first_start = len(self.segments) - 1, offset - len(self.segments[-1].text)
+        if last is None:
+            last, last_end = len(self.segments) - 1, offset
+
+        # The statements on either side of an edit can end or start differently, so they are reparsed too
+        if first > 0:
+            first -= 1
+            first_start -= len(self.segments[first].text)
+        if damage_end == last_end and last + 1 < len(self.segments):
+            last += 1
+            last_end += len(self.segments[last].text)
+
+        return first, last, first_start, last_end
+
+    # Also tells whether the region ends inside a statement, when the parser read up to its end
+    def parse_region(self, text: str, at_start: bool) -> tuple[list[Segment], int, bool, bool]:
+        lexer = Lexer(text, self.file_path)
+        if not at_start:
+            lexer.line_start = 0
+
+        tokens = TokenBuffer(text)
+        for type, start, end, column, line in lexer.regex_spans(text):
+            tokens.append(type, start, end, column, line)
+        tokens.append(TT.eof, lexer.position, lexer.position, lexer.column + 1, lexer.line)
+
+        # depths[i] is the bracket depth before token i, the last entry the depth at the end
+        depths = []
+        depth = 0
+        for kind in tokens.kinds:
+            depths.append(depth)
+            if kind in OPENING_TYPES:
+                depth += 1
+            elif kind in CLOSING_TYPES:
+                depth -= 1
+        depths.append(depth)
+
+        parser = Parser(tokens, self.file_path)
+        boundaries = [0]
+        boundary_tokens = [0]
+        groups = [[]]
+        previous_end = 0
+        failure = None
+        cut_short = False
+
+        while parser.get().type != TT.eof:
+            if parser.get().type == TT.lineend:
+                parser.eat()
+                continue
+
+            index = parser.position
+            line_start = text.rfind('\n', 0, tokens.starts[index]) + 1
+
+            # A statement starts a new segment when it is the first thing on its line
+            if depths[index] == 0 and line_start >= previous_end and line_start > boundaries[-1]:
+                boundaries.append(line_start)
+                boundary_tokens.append(index)
+                groups.append([])
+
+            # A full parse raises here too, but only once the whole file lexes cleanly
+            try:
+                groups[-1].append(parser.parse_statement())
+            except Exception as exception:
+                failure = exception
+                break
+
+            # A statement cut short by the end of the region leaves the parser on or past the eof token
+            cut_short = parser.position >= len(tokens) - 1
+            consumed = min(max(parser.position - 1, index), len(tokens) - 1)
+            previous_end = tokens.starts[consumed] + tokens.lengths[consumed]
+
+        boundaries.append(len(text))
+        boundary_tokens.append(len(depths) - 1)
+        first_lines = [text.count('\n', 0, boundary) + 1 for boundary in boundaries]
+        unterminated = any(isinstance(error, SyntaxError) and error.msg in UNTERMINATED_STRING_MESSAGES for error in lexer.errors)
+
+        segments = []
+        for index, results in enumerate(groups):
+            start, end = boundaries[index], boundaries[index + 1]
+            first_line, next_line = first_lines[index], first_lines[index + 1]
+            last_group = index == len(groups) - 1
+
+            statements = [result for result in results if isinstance(result, ASTNode)]
+            errors = [self.move_error(result, 1 - first_line) for result in results if isinstance(result, Error)]
+            lexer_errors = [
+                self.move_error(error, 1 - first_line) for error in lexer.errors
+                if first_line <= error.line and (error.line < next_line or last_group)
+            ]
+            segment_depths = depths[boundary_tokens[index]:boundary_tokens[index + 1] + 1]
+
+            segments.append(Segment(
+                text[start:end], statements, errors, lexer_errors,
+                min(segment_depths), segment_depths[-1] - segment_depths[0],
+                failure if last_group else None
+            ))
+
+        return segments, depth, unterminated, cut_short
+
+    def move_error(self, error: Error, lines: int) -> Error:
+        error = copy.copy(error)
+        error.line += lines
+        return error
+
+    def result(self) -> ProgramNode | list[Error]:
+        lexer_errors = []
+        errors = []
+        statements = []
+        failures = []
+        line = 0
+
+        for segment in self.segments:
+            lexer_errors.extend(self.move_error(error, line) for error in segment.lexer_errors)
+            errors.extend(self.move_error(error, line) for error in segment.errors)
+            statements.extend(segment.statements)
+            if segment.failure is not None:
+                failures.append(segment.failure)
+            line += segment.lines
+
+        if failures and not lexer_errors:
+            raise failures[0]
+
+        return lexer_errors or errors or ProgramNode(statements)
@@ -1,8 +1,9 @@
 from frontend.Error import *
 from frontend.TokenType import TokenType
-from frontend.Token import Token
+from frontend.Token import Token, TokenBuffer, VALUE_CONVERSIONS
+import re
 
-TT = TokenType()
+TT = TokenType
 DIGITS = '12345678890'
 ALPHABET = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_-?'
 
@@ -36,35 +37,109 @@ KEYWORDS = {
     'del':TT._del
 }
 
+IDENTIFIER_CHARACTERS = frozenset(f'{ALPHABET}{DIGITS}')
+NUMBER_CHARACTERS = frozenset(f'{DIGITS}.')
+
+SINGLE_CHARACTER_TOKENS = {
+    '(': TT.open_parenthesis,
+    ')': TT.close_parenthesis,
+    '{': TT.open_brace,
+    '}': TT.close_brace,
+    '[': TT.open_bracket,
+    ']': TT.close_bracket,
+    ':': TT.colon,
+    ',': TT.comma,
+    '.': TT.period,
+    '&': TT._and,
+    '|': TT._or,
+    '~': TT.anonymous,
+    '=': TT.assignment_operator,
+    '>': TT.greater_than,
+    '<': TT.less_than,
+    '>=': TT.greater_than_equal,
+    '<=': TT.less_than_equal,
+    '<-': TT._return
+}
+
+# Alternatives are tried in order, so longer operators come before their prefixes.
+# Tokens in the "split" groups take their column after the first character,
+# like the cursor scanner does for '==', '!=', '//' and the compound assignments.
+TOKEN_PATTERNS = [
+    ('whitespace', r'[ \t]+'),
+    ('lineend', r'\n'),
+    ('comment', r'#[^\n]*'),
+    ('assignment_binary_operation', r'[-+*/^%]='),
+    ('floor_division', r'//'),
+    ('binary_operation', r'[-+*/^%]'),
+    ('equal', r'=='),
+    ('not_equal', r'!(?s:.)?'),
+    ('symbol', r'<-|<=|>=|[(){}\[\]:,.&|~=<>]'),
+    ('string', r'"[^"]*"|\'[^\']*\''),
+    ('unterminated_string', r'["\'](?s:.)*'),
+    ('number', f'[{re.escape(DIGITS)}][{re.escape(DIGITS)}.]*'),
+    ('identifier', f"[{re.escape(ALPHABET.replace('-', ''))}][{re.escape(ALPHABET + DIGITS)}]*"),
+    ('invalid', r'(?s:.)')
+]
+
+MASTER_PATTERN = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_PATTERNS))
+
 class Lexer:
-    def __init__(self, source_code: str, file_path:str=''):
+    def __init__(self, source_code: str, file_path:str='', mode:str='cursor'):
         self.file_path = file_path
         self.source_code = source_code
+        self.mode = mode
         self.errors = []
         self.tokens = []
+        self.position = 0
         self.line = 1
-        self.column = 1
+        # columns on the first line start at 1, on every other line at 0
+        self.line_start = -1
 
     def __str__(self) -> str:
         return "Lexer"
 
-    def eat(self) -> None:
-        self.column += 1
-        char = self.source_code[0]
+    @property
+    def column(self) -> int:
+        return self.position - self.line_start
+
+    def eat(self) -> str:
+        char = self.source_code[self.position]
+        self.position += 1
 
         if char == '\n':
-            self.column = 0
             self.line += 1
-            
-        self.source_code = self.source_code[1:]
+            self.line_start = self.position
+
         return char
 
+    def eat_until(self, end: int) -> str:
+        text = self.source_code[self.position:end]
+        newlines = text.count('\n')
+
+        if newlines:
+            self.line += newlines
+            self.line_start = self.position + text.rfind('\n') + 1
+
+        self.position = end
+        return text
+
     def get(self) -> str:
-        return self.source_code[0]
+        return self.source_code[self.position:self.position + 1]
 
     def tokenize(self) -> list[Token] | list[Error]:
+        if self.mode == 'regex':
+            self.scan_regex()
+        else:
+            self.scan_cursor()
+
+        self.tokens.append(Token(TT.eof, 'eof', self.column + 1, self.line))
 
-        while len(self.source_code) > 0:
+        return self.errors or self.tokens
+
+    def scan_cursor(self) -> None:
+        length = len(self.source_code)
+
+        while self.position < length:
             char = self.get()
             match char:
                 case ' ' | '\t':
@@ -106,8 +181,8 @@ class Lexer:
                 case '.':
                     self.tokens.append(Token(TT.period, self.eat(), self.column, self.line))
                 case '#':
-                    while self.get() != '\n':
-                        self.eat()
+                    end = self.source_code.find('\n', self.position)
+                    self.position = length if end == -1 else end
                 case '"':
                     self.process_string('"')
                 case "'":
@@ -136,9 +211,110 @@ class Lexer:
                             self.file_path, self, self.eat(), self.column, self.line
                         ))
 
-        self.tokens.append(Token(TT.eof, 'eof', self.column + 1, self.line))
+    def scan_regex(self) -> None:
+        self.tokens.extend(self.regex_tokens(self.source_code))
 
-        return self.errors or self.tokens
+    def iter_tokens(self, file=None, chunk_size: int = 65536):
+        # Streams with the regex scanner. A match that reaches the end of a chunk
+        # could still grow, so it is held back and rescanned with the next chunk.
+        if file is None:
+            yield from self.regex_tokens(self.source_code)
+        else:
+            pending = ''
+            offset = 0
+            while chunk := file.read(chunk_size):
+                source_code = pending + chunk
+                consumed = yield from self.regex_tokens(source_code, offset, False)
+                pending = source_code[consumed:]
+                offset += consumed
+            yield from self.regex_tokens(pending, offset)
+
+        yield Token(TT.eof, 'eof', self.column + 1, self.line)
+
+    def tokenize_compact(self) -> TokenBuffer | list[Error]:
+        tokens = TokenBuffer(self.source_code)
+        append = tokens.append
+
+        for type, start, end, column, line in self.regex_spans(self.source_code):
+            append(type, start, end, column, line)
+        append(TT.eof, self.position, self.position, self.column + 1, self.line)
+
+        return self.errors or tokens
+
+    def regex_tokens(self, source_code: str, offset: int = 0, final: bool = True):
+        conversions = VALUE_CONVERSIONS
+
+        for type, start, end, column, line in self.regex_spans(source_code, offset, final):
+            text = source_code[start - offset:end - offset]
+            convert = conversions.get(type)
+            yield Token(type, text if convert is None else convert(text), column, line)
+        return self.position - offset
+
+    def regex_spans(self, source_code: str, offset: int = 0, final: bool = True):
+        errors = self.errors
+        line = self.line
+        line_start = self.line_start
+        consumed = len(source_code)
+
+        for match in MASTER_PATTERN.finditer(source_code):
+            if not final and match.end() == consumed:
+                consumed = match.start()
+                break
+
+            kind = match.lastgroup
+            start, end = match.span()
+            start += offset
+            end += offset
+
+            match kind:
+                case 'whitespace' | 'comment':
+                    continue
+                case 'lineend':
+                    line += 1
+                    line_start = end
+                    yield TT.lineend, start, end, 0, line
+                case 'identifier':
+                    yield KEYWORDS.get(match.group(), TT.identifier), start, end, end - line_start, line
+                case 'symbol':
+                    yield SINGLE_CHARACTER_TOKENS[match.group()], start, end, end - line_start, line
+                case 'number':
+                    number = match.group()
+                    decimal = number.count('.')
+                    if decimal == 0:
+                        yield TT.int_value, start, end, end - line_start, line
+                    elif decimal == 1:
+                        yield TT.real_value, start, end, end - line_start, line
+                    else:
+                        second = number.index('.', number.index('.') + 1)
+                        errors.append(SyntaxError(self.file_path, self, "Found two '.' ", start + second - line_start, line))
+                case 'binary_operation':
+                    yield TT.binary_operation, start, end, end - line_start, line
+                case 'assignment_binary_operation':
+                    yield TT.assignment_binary_operation, start, end, end - line_start - 1, line
+                case 'floor_division':
+                    yield TT.binary_operation, start, end, end - line_start - 1, line
+                case 'equal':
+                    yield TT.equal, start, end, end - line_start - 1, line
+                case 'string' | 'unterminated_string' | 'not_equal':
+                    text = match.group()
+                    if kind == 'not_equal':
+                        if text != '!=':
+                            errors.append(InvalidCharacterError(self.file_path, self, '!', start + 1 - line_start, line))
+                        yield TT.not_equal, start, end, start + 1 - line_start, line
+                    if newlines := text.count('\n'):
+                        line += newlines
+                        line_start = start + text.rfind('\n') + 1
+                    if kind == 'string':
+                        yield TT.string_value, start, end, end - line_start, line
+                    elif kind == 'unterminated_string':
+                        errors.append(SyntaxError(self.file_path, self, f"Expected a '{text[0]}'", end - line_start, line))
+                case 'invalid':
+                    errors.append(InvalidCharacterError(self.file_path, self, match.group(), end - line_start, line))
+
+        self.position = offset + consumed
+        self.line = line
+        self.line_start = line_start
+        return consumed
 
     def process_greater_than(self, char):
         self.eat()
@@ -178,7 +354,8 @@ class Lexer:
         self.tokens.append(
                         Token(TT.not_equal, f'{char}=', self.column, self.line)
                     )
-        self.eat()
+        if self.get():
+            self.eat()
 
     def process_equal_sign(self, char):
         self.eat()
@@ -211,34 +388,27 @@ class Lexer:
 
     def process_string(self, single_or_double: str):
         self.eat()
+        end = self.source_code.find(single_or_double, self.position)
 
-        if len(self.source_code) > 0:
-            string = ''
-            while len(self.source_code) > 0 and self.get() != single_or_double:
-                string += self.get()
-                self.eat()
-                if self.source_code == '':
-                    self.errors.append(SyntaxError(self.file_path, self, f"Expected a '{single_or_double}'", self.column, self.line))
-            if len(self.source_code) > 0:
-                self.eat()
-                self.tokens.append(
-                                Token(TT.string_value, string, self.column, self.line)
-                            )
-            else:
-                self.errors.append(SyntaxError(self.file_path, self, f"Expected a '{single_or_double}'", self.column, self.line))
-        else:
+        if end == -1:
+            self.eat_until(len(self.source_code))
             self.errors.append(SyntaxError(self.file_path, self, f"Expected a '{single_or_double}'", self.column, self.line))
+        else:
+            string = self.eat_until(end)
+            self.eat()
+            self.tokens.append(
+                            Token(TT.string_value, string, self.column, self.line)
+                        )
 
     def process_variables_and_identifiers(self):
-        name = ''
+        source_code = self.source_code
+        length = len(source_code)
+        end = self.position
 
-        while len(self.source_code) > 0:
-            char = self.get()
-            if char in f'{ALPHABET}{DIGITS}':
-                name += char
-            else:
-                break
-            self.eat()
+        while end < length and source_code[end] in IDENTIFIER_CHARACTERS:
+            end += 1
+
+        name = self.eat_until(end)
 
         if name in KEYWORDS:
             self.tokens.append(
@@ -250,27 +420,25 @@ class Lexer:
                             )
 
     def process_numbers(self):
-        number = ''
+        source_code = self.source_code
+        length = len(source_code)
+        end = self.position
         decimal = 0
 
-        while len(self.source_code) > 0:
-            char = self.get()
-            if char in DIGITS:
-                number += char
-            elif char == '.':
-                if decimal != 0:
-                    self.errors.append(SyntaxError(self.file_path, self, "Found two '.' ", self.column, self.line))
-                number += char
+        while end < length and source_code[end] in NUMBER_CHARACTERS:
+            if source_code[end] == '.':
                 decimal += 1
-            else:
-                break
-            self.eat()
+                if decimal == 2:
+                    self.errors.append(SyntaxError(self.file_path, self, "Found two '.' ", end - self.line_start, self.line))
+            end += 1
+
+        number = self.eat_until(end)
 
         if decimal == 0:
             self.tokens.append(
                                 Token(TT.int_value, int(number), self.column, self.line)
                             )
-        else:
+        elif decimal == 1:
             self.tokens.append(
                                 Token(TT.real_value, float(number), self.column, self.line)
-                            )
\ No newline at end of file
+                            )
@@ -0,0 +1,36 @@
+# Small integer tags for the AST node classes, kept as plain ints since enum member lookups are slow in the evaluate loop
+class NodeKind:
+    identifier = 0
+    realLiteral = 1
+    unknownLiteral = 2
+    integerLiteral = 3
+    stringLiteral = 4
+    nullLiteral = 5
+    objectLiteral = 6
+    propertyLiteral = 7
+    arrayLiteral = 8
+    itemLiteral = 9
+    program = 10
+    expression = 11
+    binaryExpression = 12
+    ifStatement = 13
+    whileStatement = 14
+    forStatement = 15
+    forEachStatement = 16
+    doWhileStatement = 17
+    assignmentExpression = 18
+    assignmentBinaryExpression = 19
+    variableDeclarationExpression = 20
+    functionDeclaration = 21
+    memberExpression = 22
+    callExpression = 23
+    returnExpression = 24
+    exportExpression = 25
+    importExpression = 26
+    breakExpression = 27
+    continueExpression = 28
+    tryStatement = 29
+    throwStatement = 30
+    matchStatement = 31
+    case = 32
+    delete = 33
@@ -1,16 +1,92 @@
-from frontend.Lexer import Token, TT
+from frontend.Lexer import Token, TokenBuffer, TT
 from frontend.ASTNodes import *
 from frontend.Error import *
+from itertools import islice
+
+LOOKAHEAD = 16
+
+# Binding powers for the Pratt expression parser, a higher power binds tighter.
+# Binary operators are keyed by their value, everything else by token type.
+ASSIGNMENT_POWER = 10
+CONDITION_POWER = 20
+ADDITIVE_POWER = 30
+MULTIPLICATIVE_POWER = 40
+CALL_POWER = 50
+MEMBER_POWER = 60
+
+BINDING_POWERS = {
+    TT.assignment_operator: ASSIGNMENT_POWER,
+    TT.assignment_binary_operation: ASSIGNMENT_POWER,
+    TT.equal: CONDITION_POWER,
+    TT.not_equal: CONDITION_POWER,
+    TT.greater_than: CONDITION_POWER,
+    TT.less_than: CONDITION_POWER,
+    TT.greater_than_equal: CONDITION_POWER,
+    TT.less_than_equal: CONDITION_POWER,
+    TT._and: CONDITION_POWER,
+    TT._or: CONDITION_POWER,
+    '+': ADDITIVE_POWER,
+    '-': ADDITIVE_POWER,
+    '*': MULTIPLICATIVE_POWER,
+    '/': MULTIPLICATIVE_POWER,
+    '^': MULTIPLICATIVE_POWER,
+    '%': MULTIPLICATIVE_POWER,
+    '//': MULTIPLICATIVE_POWER,
+    TT.open_parenthesis: CALL_POWER,
+    TT.period: MEMBER_POWER,
+    TT.open_bracket: MEMBER_POWER
+}
+
+# The tokens of a function body that was only brace matched in lazy mode. The body is
+# parsed the first time the function is called and the statements are kept from then on.
+# Syntax errors inside it are therefore reported on that first call, not when the file loads.
+class LazyBody:
+    def __init__(self, tokens: list[Token], file_path: str = "") -> None:
+        self.tokens = tokens
+        self.file_path = file_path
+        self.statements = None
+
+    def parse(self) -> list | Error:
+        if self.statements is not None:
+            return self.statements
+
+        parser = Parser(self.tokens, self.file_path, True)
+        statements = []
+
+        while parser.get().type != TT.eof:
+            statement = parser.parse_statement()
+            if isinstance(statement, Error):
+                return statement
+            if statement:
+                statements.append(statement)
+
+        self.statements = statements
+        self.tokens = None
+        return statements
+
+    def __repr__(self) -> str:
+        return str(self.statements if self.statements is not None else {"kind": "lazyBody"})
 
 class Parser:
-    def __init__(self, tokens: list, file_path:str="") -> None:
+    def __init__(self, tokens, file_path:str="", lazy: bool = False) -> None:
         self.file_path = file_path
-        self.tokens = tokens
+        self.lazy = lazy
         self.program = ProgramNode([])
         self.conditional_operators = (TT.equal, TT.not_equal, TT.greater_than, TT.less_than, TT.greater_than_equal, TT.less_than_equal, TT._and, TT._or)
         self.column = 0
         self.line = 0
 
+        # Tokens are read through a cursor. Any iterable other than a list or a TokenBuffer,
+        # such as Lexer.iter_tokens(), is pulled into a small lookahead buffer as it is needed.
+        if isinstance(tokens, (list, TokenBuffer)):
+            self.tokens = tokens
+            self.token_stream = None
+        else:
+            self.tokens = []
+            self.token_stream = iter(tokens)
+        self.position = 0
+        self.current = self.peek()
+
         self.datatypeMap = {
             "int":IntegerLiteralNode(0, self.line, self.column),
             "real":RealLiteralNode(0.0, self.line, self.column),
@@ -22,29 +98,54 @@ class Parser:
             "unknown":NullLiteralNode(self.line, self.column)
         }
 
+    def fill(self, index: int) -> None:
+        if index < len(self.tokens):
+            return
+
+        # Consumed tokens are dropped, the parser never goes back to them
+        if self.position >= len(self.tokens):
+            index -= self.position
+            self.tokens.clear()
+            self.position = 0
+
+        self.tokens.extend(islice(self.token_stream, index - len(self.tokens) + LOOKAHEAD))
+
+    def peek(self, offset: int = 0) -> Token:
+        if self.token_stream is not None:
+            self.fill(self.position + offset)
+
+        index = self.position + offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+
+        return Token(TT.eof, "", self.column, self.line)
+
     def eat(self) -> Token:
-        self.column = self.tokens[0].column
-        self.line = self.tokens[0].line
-        return self.tokens.pop(0)
+        token = self.current
+        self.column = token.column
+        self.line = token.line
+        self.position += 1
+        self.current = self.peek()
+        return token
 
     def get(self) -> Token:
-        if len(self.tokens) == 0:
-            return Token(TT.eof, "", self.column, self.line)
-        
-        return self.tokens[0]
-
-    def generate_AST(self) -> ProgramNode | list[Error]:
-        errors = []
+        return self.current
 
-        while len(self.tokens) > 0 and self.get().type != TT.eof:
+    def iter_statements(self):
+        while self.get().type != TT.eof:
             if self.get().type == TT.lineend:
                 self.eat()
             else:
-                statement = self.parse_statement()
-                if isinstance(statement, Error):
-                    errors.append(statement)
-                elif isinstance(statement, ASTNode):
-                    self.program.body.append(statement)
+                yield self.parse_statement()
+
+    def generate_AST(self) -> ProgramNode | list[Error]:
+        errors = []
+
+        for statement in self.iter_statements():
+            if isinstance(statement, Error):
+                errors.append(statement)
+            elif isinstance(statement, ASTNode):
+                self.program.body.append(statement)
 
         return errors or self.program
 
@@ -89,8 +190,67 @@ class Parser:
             case _:
                 return self.parse_expression()
 
-    def parse_expression(self) -> None:
-        return self.parse_assignment_expression()
+    def binding_power(self, token: Token) -> int:
+        if token.type == TT.binary_operation:
+            return BINDING_POWERS.get(token.value, 0)
+        return BINDING_POWERS.get(token.type, 0)
+
+    def parse_expression(self, min_power: int = 0) -> None:
+        # Object and array literals only start a full expression and can only be assigned to.
+        # Once an operator is applied nothing that binds tighter may follow it, which keeps
+        # 'f(x).y' and '[1][0]' invalid like they are without the Pratt loop.
+        if min_power < ASSIGNMENT_POWER and self.get().type == TT.open_brace:
+            left = self.parse_object_expression()
+            ceiling = ASSIGNMENT_POWER
+        elif min_power < ASSIGNMENT_POWER and self.get().type == TT.open_bracket:
+            left = self.parse_array_expression()
+            ceiling = ASSIGNMENT_POWER
+        else:
+            left = self.parse_primary_expression()
+            ceiling = MEMBER_POWER
+
+        if isinstance(left, Error):
+            return left
+
+        while True:
+            power = self.binding_power(self.get())
+
+            if power <= min_power or power > ceiling or power == CONDITION_POWER:
+                return left
+
+            if power == MEMBER_POWER:
+                left = self.parse_member_expression(left)
+            elif power == CALL_POWER:
+                left = self.parse_call_expression(left)
+            elif power == ASSIGNMENT_POWER:
+                return self.parse_assignment_expression(left)
+            else:
+                operand = self.eat().value
+                right = self.parse_expression(power)
+
+                if isinstance(right, Error):
+                    return right
+                left = BinaryExpressionNode(
+                    left, str(operand), right, self.line, self.column)
+
+            if isinstance(left, Error):
+                return left
+            ceiling = power
+
+    def parse_condition(self) -> None:
+        left_condition = self.parse_expression()
+
+        if isinstance(left_condition, Error):
+            return left_condition
+
+        if self.binding_power(self.get()) != CONDITION_POWER:
+            return left_condition, '', NullValue()
+        operand = self.eat().value
+        right_condition = self.parse_expression()
+
+        if isinstance(right_condition, Error):
+            return right_condition
+        return left_condition, operand, right_condition
 
     def parse_delete_statement(self) -> None:
         self.eat()
@@ -124,7 +284,7 @@ class Parser:
                     matches.append(statement)
                 if self.get().type == TT.eof:
                     return SyntaxError(self.file_path, self, "Expected a '}'", self.column, self.line)
-            elif self.get().type in (TT.lineend):
+            elif self.get().type == TT.lineend:
                 self.eat()
             else:
                 return SyntaxError(self.file_path, self, "Expected 'case'", self.column, self.line)
@@ -228,8 +388,6 @@ class Parser:
     def parse_do_while_statement(self) -> None:
         self.eat()
 
-        operand = ''
-        
         if self.get().type != TT.open_brace:
             return SyntaxError(self.file_path, self, "Expected a '{'", self.column, self.line)
 
@@ -253,18 +411,11 @@ class Parser:
         if self.get().type != TT.open_parenthesis:
             return SyntaxError(self.file_path, self, "Expected a '('", self.column, self.line)
         self.eat()
-        left_condition = self.parse_expression()
-        
-        if isinstance(left_condition, Error):
-            return left_condition
-        
-        if self.get().type in self.conditional_operators:
-            operand = self.eat().value
-            right_condition = self.parse_expression()
-            if isinstance(right_condition, Error):
-                return right_condition
-        else:
-            right_condition = NullValue()
+        condition = self.parse_condition()
+
+        if isinstance(condition, Error):
+            return condition
+        left_condition, operand, right_condition = condition
         
         if self.get().type == TT.close_parenthesis:
             self.eat()
@@ -275,23 +426,14 @@ class Parser:
     def parse_while_statement(self) -> None:
         self.eat()
 
-        operand = ''
-        
         if self.get().type != TT.open_parenthesis:
             return SyntaxError(self.file_path, self, "Expected a '('", self.column, self.line)
         self.eat()
-        left_condition = self.parse_expression()
-        
-        if isinstance(left_condition, Error):
-            return left_condition
-        
-        if self.get().type in self.conditional_operators:
-            operand = self.eat().value
-            right_condition = self.parse_expression()
-            if isinstance(right_condition, Error):
-                return right_condition
-        else:
-            right_condition = NullValue()
+        condition = self.parse_condition()
+
+        if isinstance(condition, Error):
+            return condition
+        left_condition, operand, right_condition = condition
 
         if self.get().type != TT.close_parenthesis:
             return SyntaxError(self.file_path, self, "Expected a ')'", self.column, self.line)
@@ -345,18 +487,14 @@ class Parser:
             if self.get().type != TT.comma:
                 return SyntaxError(self.file_path, self, "Expected a comma", self.column, self.line)
             self.eat()
-            left_condition = self.parse_expression()
+            condition = self.parse_condition()
             
-            if isinstance(left_condition, Error):
-                return left_condition
-            
-            if self.get().type not in self.conditional_operators:
-                return SyntaxError(self.file_path, self, f"Expected one of the following operators: {self.conditional_operators}", self.column, self.line)
-            operand = self.eat().value
-            right_condition = self.parse_expression()
-            
-            if isinstance(right_condition, Error):
-                return right_condition
+            if isinstance(condition, Error):
+                return condition
+            left_condition, operand, right_condition = condition
+
+            if operand == '':
+                return SyntaxError(self.file_path, self, f"Expected one of the following operators: {tuple(map(str, self.conditional_operators))}", self.column, self.line)
             
             if self.get().type != TT.comma:
                 return SyntaxError(self.file_path, self, "Expected a comma after the condition", self.column, self.line)
@@ -398,7 +536,7 @@ class Parser:
 
         self.eat()
 
-        if self.get().type not in ("int", "real", "string"):
+        if self.get().type not in (TT.int, TT.real, TT.string):
             return SyntaxError(self.file_path, self, "Expected variable declaration", self.column, self.line)
         declaration = self.parse_variable_declaration()
 
@@ -436,23 +574,14 @@ class Parser:
     def parse_if_statement(self) -> None:
         self.eat()
 
-        operand = ''
         if self.get().type != TT.open_parenthesis:
             return SyntaxError(self.file_path, self, "Expected a '('", self.column, self.line)
         self.eat()
-        left_condition = self.parse_expression()
+        condition = self.parse_condition()
 
-        if isinstance(left_condition, Error):
-            return left_condition
-        
-        if self.get().type in self.conditional_operators:
-            operand = self.eat().value
-            right_condition = self.parse_expression()
-
-            if isinstance(right_condition, Error):
-                return right_condition
-        else:
-            right_condition = NullValue()
+        if isinstance(condition, Error):
+            return condition
+        left_condition, operand, right_condition = condition
 
         if self.get().type == TT.close_parenthesis:
             self.eat()
@@ -517,6 +646,12 @@ class Parser:
         else:
             return SyntaxError(self.file_path, self, "Expected a '{'", self.column, self.line)
 
+        if self.lazy:
+            body = self.skip_function_body()
+            if isinstance(body, Error):
+                return body
+            return FunctionDeclarationExpressionNode(str(name), parameters, body, self.line, self.column)
+
         body = []
 
         while self.get().type != TT.close_brace:
@@ -532,8 +667,56 @@ class Parser:
 
         return FunctionDeclarationExpressionNode(str(name), parameters, body, self.line, self.column)
 
+    def skip_function_body(self) -> LazyBody | Error:
+        end = self.find_closing_brace()
+        if end is not None:
+            if isinstance(self.tokens, TokenBuffer):
+                tokens = [self.tokens[index] for index in range(self.position, end)]
+            else:
+                tokens = self.tokens[self.position:end]
+            self.position = end
+            self.current = self.peek()
+            end = self.eat()
+            tokens.append(Token(TT.eof, "", end.column, end.line))
+            return LazyBody(tokens, self.file_path)
+
+        tokens = []
+        depth = 0
+
+        while depth > 0 or self.get().type != TT.close_brace:
+            if self.get().type == TT.eof:
+                return SyntaxError(self.file_path, self, "Expected a '}'", self.column, self.line)
+            if self.get().type == TT.open_brace:
+                depth += 1
+            elif self.get().type == TT.close_brace:
+                depth -= 1
+            tokens.append(self.eat())
+
+        end = self.eat()
+        tokens.append(Token(TT.eof, "", end.column, end.line))
+        return LazyBody(tokens, self.file_path)
+
+    # Index of the '}' closing the current block when every token is already in memory
+    def find_closing_brace(self) -> int | None:
+        if self.token_stream is not None:
+            return None
+
+        tokens = self.tokens
+        kinds = tokens.kinds if isinstance(tokens, TokenBuffer) else None
+        depth = 0
+
+        for index in range(self.position, len(tokens)):
+            kind = kinds[index] if kinds is not None else tokens[index].type
+            if kind == TT.open_brace:
+                depth += 1
+            elif kind == TT.close_brace:
+                if depth == 0:
+                    return index
+                depth -= 1
+        return None
+
     def parse_variable_declaration(self) -> None:
-        datatype = self.eat().type
+        datatype = str(self.eat().type)
         
         if self.get().type == TT.eof:
             return SyntaxError(self.file_path, self, "Expected an identifier", self.column, self.line)
@@ -559,11 +742,7 @@ class Parser:
             else:
                 return SyntaxError(self.file_path, self, "Expected a value", self.column, self.line)
 
-    def parse_assignment_expression(self) -> None:
-        left = self.parse_object_expression()
-        if isinstance(left, Error):
-            return left
-
+    def parse_assignment_expression(self, left) -> None:
         if self.get().type == TT.assignment_operator:
             self.eat()
             value = self.parse_statement()
@@ -571,22 +750,16 @@ class Parser:
             if isinstance(value, Error):
                 return value
             return AssignmentExpressionNode(left, value)
-        elif self.get().type == TT.assignment_binary_operation:
+        else:
             operand = self.eat().value
             value = self.parse_expression()
 
             if isinstance(value, Error):
                 return value
             return AssignmentBinaryExpressionNode(left, operand, value, self.line, self.column)
-        else:
-            return left
 
     def parse_object_expression(self) -> None:
-
-        if self.get().type != TT.open_brace:
-            return self.parse_array_expression()
-        else:
-            self.eat()
+        self.eat()
 
         properties = []
 
@@ -620,10 +793,7 @@ class Parser:
         return ObjectLiteralNode(properties, self.line, self.column)
 
     def parse_array_expression(self) -> None:
-        if self.get().type != TT.open_bracket:
-            return self.parse_additive_expression()
-        else:
-            self.eat()
+        self.eat()
 
         items = []
         index = -1
@@ -651,76 +821,26 @@ class Parser:
         self.eat()
         return ArrayLiteralNode(items, self.line, self.column)
 
-    def parse_additive_expression(self) -> None:
-        left = self.parse_multiplicative_expression()
-
-        if isinstance(left, Error):
-            return left
-
-        while self.get().value in ['+', '-',]:
-            operand = self.eat().value
-            right = self.parse_multiplicative_expression()
-
-            if isinstance(right, Error):
-                return right
-            
-            left = BinaryExpressionNode(
-                left, str(operand), right, self.line, self.column)
-
-        return left
-
-    def parse_multiplicative_expression(self) -> None:
-        left = self.parse_call_member_expression()
-        if isinstance(left, Error):
-            return left
-
-        while self.get().value in ['*', '/', '^', '%', '//']:
-            operand = self.eat().value
-            right = self.parse_call_member_expression()
-
-            if isinstance(right, Error):
-                return right
-            left = BinaryExpressionNode(
-                left, str(operand), right, self.line, self.column)
-
-        return left
-
-    def parse_call_member_expression(self) -> None:
-        member = self.parse_member_expression()
-        if isinstance(member, Error):
-            return member
-
-        if self.get().type == TT.open_parenthesis:
-            return self.parse_call_expression(member)
-        return member
-
     def parse_call_expression(self, caller) -> None:
         value = self.parse_arguments()
         if isinstance(value, Error):
             return value
         
-        call_expression = CallExpression(caller, value, self.line, self.column)
-
-        if self.get().type == TT.open_parenthesis:
-            call_expression = self.parse_call_expression(call_expression)
-            if isinstance(call_expression, Error):
-                return call_expression
-
-        return call_expression
+        return CallExpression(caller, value, self.line, self.column)
 
     def parse_arguments(self) -> None:
-        if self.get().type == TT.open_parenthesis:
+        if self.get().type != TT.open_parenthesis:
+            return SyntaxError(self.file_path, self, "Expected a '('", self.column, self.line)
+
+        self.eat()
+        if self.get().type == TT.close_parenthesis:
             self.eat()
-            args = []
+            return []
+
+        args = self.parse_arguments_list()
+        if isinstance(args, Error):
+            return args
 
-            if self.get().type == TT.close_parenthesis:
-                self.eat()
-                return []
-            else:
-                args = self.parse_arguments_list()
-                if isinstance(args, Error):
-                    return args
-                
         if self.get().type == TT.close_parenthesis:
             self.eat()
         else:
@@ -729,14 +849,14 @@ class Parser:
         return args
 
     def parse_arguments_list(self) -> None:
-        args = [self.parse_assignment_expression()]
+        args = [self.parse_expression()]
 
         if isinstance(args[0], Error):
             return args[0]
 
         while (self.get().type == TT.comma):
             self.eat()
-            value = self.parse_assignment_expression()
+            value = self.parse_expression()
 
             if isinstance(value, Error):
                 return value
@@ -744,35 +864,29 @@ class Parser:
 
         return args
 
-    def parse_member_expression(self) -> None:
-        obj = self.parse_primary_expression()
-        if isinstance(obj, Error):
-            return obj
-
-        while self.get().type in [TT.period, TT.open_bracket]:
-            operand = self.eat()
-
-            if operand.type == TT.period:
-                computed = True
-                prop = self.parse_primary_expression()
-                if prop != None:
-                    if isinstance(prop, Error):
-                        return prop
-                    if prop.kind != ("identifier"):
-                        return SyntaxError(self.file_path, self, "Invalid syntax", self.column, self.line)
-            else:
-                computed = False
-                prop = self.parse_expression()
+    def parse_member_expression(self, obj) -> None:
+        operand = self.eat()
+
+        if operand.type == TT.period:
+            computed = True
+            prop = self.parse_primary_expression()
+            if prop != None:
                 if isinstance(prop, Error):
                     return prop
-                if self.get().type != TT.close_bracket:
-                    return SyntaxError(self.file_path, self, "Expected a ']'", self.column, self.line)
-                else:
-                    self.eat()
+                if prop.kind != ("identifier"):
+                    return SyntaxError(self.file_path, self, "Invalid syntax", self.column, self.line)
+        else:
+            computed = False
+            prop = self.parse_expression()
+            if isinstance(prop, Error):
+                return prop
+            if self.get().type != TT.close_bracket:
+                return SyntaxError(self.file_path, self, "Expected a ']'", self.column, self.line)
+            else:
+                self.eat()
 
-            obj = MemberExpressionNode(
-                obj, prop, computed, self.line, self.column)
-        return obj
+        return MemberExpressionNode(
+            obj, prop, computed, self.line, self.column)
 
     def parse_primary_expression(self) -> None:
         match self.get().type:
@@ -1,9 +1,64 @@
+from frontend.TokenType import TokenType
+from array import array
+
 class Token:
-    def __init__(self, type: str, value: str | int | float, column: int, line: int) -> None:
+    __slots__ = ("type", "value", "column", "line")
+
+    def __init__(self, type: TokenType, value: str | int | float, column: int, line: int) -> None:
         self.type = type
         self.value = value
         self.column = column
         self.line = line
 
     def __repr__(self) -> str:
-        return f"{self.type}:{repr(self.value)}"
\ No newline at end of file
+        return f"{self.type}:{repr(self.value)}"
+
+# Every other kind uses its lexeme as the value
+VALUE_CONVERSIONS = {
+    TokenType.int_value: int,
+    TokenType.real_value: float,
+    TokenType.string_value: lambda text: text[1:-1],
+    TokenType.not_equal: lambda text: "!=",
+    TokenType.eof: lambda text: "eof"
+}
+
+def token_value(type: TokenType, text: str) -> str | int | float:
+    convert = VALUE_CONVERSIONS.get(type)
+    return text if convert is None else convert(text)
+
+# Struct-of-arrays token store. Only the kind and the position of each lexeme are kept,
+# values are sliced out of the source and Token objects built when they are read.
+class TokenBuffer:
+    def __init__(self, source_code: str) -> None:
+        self.source_code = source_code
+        self.kinds = array('B')
+        self.starts = array('q')
+        self.lengths = array('i')
+        self.columns = array('i')
+        self.lines = array('i')
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        start = self.starts[index]
+        type = TokenType(self.kinds[index])
+        text = self.source_code[start:start + self.lengths[index]]
+        return Token(type, token_value(type, text), self.columns[index], self.lines[index])
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def append(self, type, start: int, end: int, column: int, line: int) -> None:
+        self.kinds.append(type)
+        self.starts.append(start)
+        self.lengths.append(end - start)
+        self.columns.append(column)
+        self.lines.append(line)
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in (self.kinds, self.starts, self.lengths, self.columns, self.lines))
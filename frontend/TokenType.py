@@ -1,66 +1,80 @@
-class TokenType:
-    def __init__(self):
-        self.int_value = "intvalue"
-        self.string_value = "stringvalue"
-        self.real_value = "realvalue"
-        self.anonymous = "anonymous"
+from enum import IntEnum
 
-        self.binary_operation = "binaryoperation"
-        self.assignment_binary_operation = "assignmentbinaryoperation"
-        self.assignment_operator = "assignmentoperator"
+class TokenType(IntEnum):
+    # Kinds compare as small integers, str() and format() still give the original names
+    def __new__(cls, value: int, label: str):
+        member = int.__new__(cls, value)
+        member._value_ = value
+        member.label = label
+        return member
 
-        self.equal = "equal"
-        self.not_equal = "notequal"
-        self.greater_than = "greaterthan"
-        self.greater_than_equal = "greaterthanequal"
-        self.less_than = "lessthan"
-        self.less_than_equal = "lessthanequal"
-        self._and = "and"
-        self._or = "or"
+    def __str__(self) -> str:
+        return self.label
 
-        self.lineend = "lineend"
-        self.eof = "eof"
+    def __format__(self, format_spec: str) -> str:
+        return format(self.label, format_spec)
 
-        self.open_parenthesis = "openparenthesis"
-        self.close_parenthesis = "closeparenthesis"
-        self.open_brace = "openbrace"
-        self.close_brace = "closebrace"
-        self.open_bracket = "openbracket"
-        self.close_bracket = "closebracket"
-        self.colon = "colon"
-        self.comma = "comma"
-        self.period = "period"
-        self.single_quote = "singlequote"
-        self.double_quote = "doublequote"
-        self._return = "return"
+    int_value = 0, "intvalue"
+    string_value = 1, "stringvalue"
+    real_value = 2, "realvalue"
+    anonymous = 3, "anonymous"
 
-        self.identifier = "identifier"
+    binary_operation = 4, "binaryoperation"
+    assignment_binary_operation = 5, "assignmentbinaryoperation"
+    assignment_operator = 6, "assignmentoperator"
 
-        # keywords
-        self._continue = "continue"
-        self.unknown = "unknown"
-        self._lambda = "lambda"
-        self._import = "import"
-        self.string = "string"
-        self.export = "export"
-        self._while = "while"
-        self._break = "break"
-        self.array = "array"
-        self.obj = "object"
-        self._else = "else"
-        self.real = "real"
-        self.bool = "bool"
-        self.each = "each"
-        self._try = "try"
-        self._for = "for"
-        self.int = "int"
-        self._if = "if"
-        self._in = "in"
-        self._as = "as"
-        self.fn = "fn"
-        self.do = "do"
-        self.catch = "catch"
-        self.throw = "throw"
-        self._case = "case"
-        self._match = "match"
-        self._del = "del"
\ No newline at end of file
+    equal = 7, "equal"
+    not_equal = 8, "notequal"
+    greater_than = 9, "greaterthan"
+    greater_than_equal = 10, "greaterthanequal"
+    less_than = 11, "lessthan"
+    less_than_equal = 12, "lessthanequal"
+    _and = 13, "and"
+    _or = 14, "or"
+
+    lineend = 15, "lineend"
+    eof = 16, "eof"
+
+    open_parenthesis = 17, "openparenthesis"
+    close_parenthesis = 18, "closeparenthesis"
+    open_brace = 19, "openbrace"
+    close_brace = 20, "closebrace"
+    open_bracket = 21, "openbracket"
+    close_bracket = 22, "closebracket"
+    colon = 23, "colon"
+    comma = 24, "comma"
+    period = 25, "period"
+    single_quote = 26, "singlequote"
+    double_quote = 27, "doublequote"
+    _return = 28, "return"
+
+    identifier = 29, "identifier"
+
+    # keywords
+    _continue = 30, "continue"
+    unknown = 31, "unknown"
+    _lambda = 32, "lambda"
+    _import = 33, "import"
+    string = 34, "string"
+    export = 35, "export"
+    _while = 36, "while"
+    _break = 37, "break"
+    array = 38, "array"
+    obj = 39, "object"
+    _else = 40, "else"
+    real = 41, "real"
+    bool = 42, "bool"
+    each = 43, "each"
+    _try = 44, "try"
+    _for = 45, "for"
+    int = 46, "int"
+    _if = 47, "if"
+    _in = 48, "in"
+    _as = 49, "as"
+    fn = 50, "fn"
+    do = 51, "do"
+    catch = 52, "catch"
+    throw = 53, "throw"
+    _case = 54, "case"
+    _match = 55, "match"
+    _del = 56, "del"
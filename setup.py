@@ -1,4 +1,5 @@
 from cx_Freeze import Executable, setup
+from version import VERSION
 import sys
 
 base = "Win32GUI" if sys.platform == "win32" else None
@@ -24,7 +25,7 @@ exe = Executable(
 
 setup(
     name="phIDE",
-    version="1.8.0",
+    version=VERSION,
     description="phi IDE",
     executables=[exe],
     options={
@@ -1,42 +1,174 @@
 from frontend.Error import Error
 from frontend.Lexer import *
 from frontend.Parser import *
+from frontend.IncrementalParser import IncrementalParser
+from frontend.ASTCache import ASTCache
 from backend.Interpreter import *
+from backend.UnboxedInterpreter import UnboxedInterpreter
+from backend.ExceptionInterpreter import ExceptionInterpreter
+from backend.ClosureCompiler import ClosureCompiler
+from backend.VirtualMachine import VirtualMachine
+from backend.PythonCompiler import PythonCompiler, PythonTranslator
+from backend.Bytecode import BytecodeCompiler, BytecodeCache, Code, disassemble
+from backend.Purity import PurityAnalyzer, FunctionPurity, pure_bodies
+from backend.Optimizer import Optimizer
 from backend.Environment import *
 import os
 
 ran = False
+incremental_parsers = {}
+ast_cache = ASTCache()
+bytecode_cache = BytecodeCache()
+# Parse function bodies only when the function is first called
+lazy_functions = False
+# Run calls of pure functions with the same scalar arguments only once, on the interpreter backends
+cache_pure_calls = False
+# How much run() optimizes the tree before evaluating it, 0 leaves it as it was parsed
+optimization_level = 0
+# How many nodes the optimizer took out of the last program run() parsed, None when it didn't run
+eliminated_nodes = None
+
+# What run() evaluates programs with, unless it is told otherwise
+BACKENDS = {
+    "interpreter": Interpreter,
+    "unboxed": UnboxedInterpreter,
+    "exceptions": ExceptionInterpreter,
+    "closures": ClosureCompiler,
+    "vm": VirtualMachine,
+    "python": PythonCompiler,
+}
+default_backend = "interpreter"
+
+def write_ast(ast: ProgramNode) -> None:
+    global ran
+    if not ran:
+        with open("ast.json", 'w') as f:
+            f.write(str(ast))
+        ran = True
+
+def parse(source_code: str, file_path: str = "", cache: bool = True, lazy: bool = None) -> ProgramNode | list[Error]:
+    lazy = lazy_functions if lazy is None else lazy
+    variant = "lazy" if lazy else ""
+
+    if cache:
+        ast = ast_cache.load(source_code, file_path, variant)
+        if ast is not None:
+            return ast
 
-# Parsing for the IDE to allow error checking while typing
-def incremental_parsing(source_code: str, file_path: str = "", x: bool = False):
-    global ran, environment
-    environment = create_global_environment(None, file_path)
     lexer = Lexer(source_code, file_path)
     tokens = lexer.tokenize()
 
     if len(tokens) > 0 and isinstance(tokens[0], Error):
         return tokens
 
-    parser = Parser(tokens, file_path)
+    parser = Parser(tokens, file_path, lazy)
     ast = parser.generate_AST()
 
+    if cache and isinstance(ast, ProgramNode):
+        ast_cache.store(source_code, file_path, ast, variant)
+    return ast
+
+# Parsing for the IDE to allow error checking while typing, only the statements around an edit are reparsed
+def incremental_parsing(source_code: str, file_path: str = "", x: bool = False):
+    if file_path not in incremental_parsers:
+        incremental_parsers[file_path] = IncrementalParser(file_path)
+    ast = incremental_parsers[file_path].update(source_code)
+
     if not isinstance(ast, ProgramNode):
         return ast
 
-    if not ran:
-        with open("ast.json", 'w') as f:
-            f.write(str(ast))
-        ran = True
+    write_ast(ast)
     return ast
 
-def run(source_code: str, file_path: str = "") -> None | Error | ExportValue:
-    ast = incremental_parsing(source_code, file_path, True)
-    interpreter = Interpreter(file_path)
-    res = interpreter.evaluate(ast, environment)
+# Which functions of the program are pure, for tooling
+def analyze_purity(source_code: str, file_path: str = "") -> list[FunctionPurity] | list[Error]:
+    ast = parse(source_code, file_path)
+    if not isinstance(ast, ProgramNode):
+        return ast
+    return PurityAnalyzer().analyze(ast)
+
+def optimize(ast: ProgramNode, file_path: str, level: int) -> ProgramNode:
+    global eliminated_nodes
+    optimizer = Optimizer(level, file_path)
+    ast = optimizer.optimize(ast)
+    eliminated_nodes = optimizer.eliminated
+    return ast
+
+def compile_bytecode(source_code: str, file_path: str = "", cache: bool = True, level: int = 0) -> Code | list[Error]:
+    global eliminated_nodes
+    variant = ("lazy" if lazy_functions else "") + (f"O{level}" if level > 0 else "")
+
+    if cache:
+        code = bytecode_cache.load(source_code, file_path, variant)
+        if code is not None:
+            eliminated_nodes = code.eliminated_nodes
+            return code
+
+    ast = parse(source_code, file_path, cache)
+    if not isinstance(ast, ProgramNode):
+        return ast
+    write_ast(ast)
+    if level > 0:
+        ast = optimize(ast, file_path, level)
+
+    code = BytecodeCompiler(file_path).compile_program(ast)
+    if level > 0:
+        code.eliminated_nodes = eliminated_nodes
+    if cache:
+        bytecode_cache.store(source_code, file_path, code, variant)
+    return code
+
+def run(source_code: str, file_path: str = "", backend: str = None, level: int = None) -> None | Error | ExportValue:
+    global eliminated_nodes
+    environment = create_global_environment(None, file_path)
+    interpreter = BACKENDS[backend or default_backend](file_path)
+    level = optimization_level if level is None else level
+    eliminated_nodes = None
+
+    # The virtual machine starts from the cached bytecode when there is one and skips parsing
+    if isinstance(interpreter, VirtualMachine):
+        code = compile_bytecode(source_code, file_path, level=level)
+        res = interpreter.execute(code, environment) if isinstance(code, Code) else interpreter.evaluate(code, environment)
+    else:
+        ast = parse(source_code, file_path)
+        if isinstance(ast, ProgramNode):
+            write_ast(ast)
+            if level > 0:
+                ast = optimize(ast, file_path, level)
+            if cache_pure_calls and isinstance(interpreter, Interpreter):
+                interpreter.pure_bodies = pure_bodies(PurityAnalyzer().analyze(ast))
+        res = interpreter.evaluate(ast, environment)
     
     if isinstance(res, (Error, ExportValue)):
         return res
     
+# Lexes, parses and evaluates one top-level statement at a time so large scripts never hold their whole token list
+def run_stream(file_path: str) -> None | Error | ExportValue:
+    environment = create_global_environment(None, file_path)
+    interpreter = Interpreter(file_path)
+    res = None
+
+    with open(file_path, 'r') as f:
+        lexer = Lexer('', file_path)
+        parser = Parser(lexer.iter_tokens(f), file_path)
+
+        for statement in parser.iter_statements():
+            if len(lexer.errors) > 0:
+                return lexer.errors[0]
+            if isinstance(statement, Error):
+                return statement
+            if not isinstance(statement, ASTNode):
+                continue
+
+            res = interpreter.evaluate(statement, environment)
+            if isinstance(res, Error):
+                return res
+
+    if len(lexer.errors) > 0:
+        return lexer.errors[0]
+    if isinstance(res, ExportValue):
+        return res
+
 def debug(file_path: str) -> None:
     with open(file_path, 'r') as f:
         source_code = '\n'.join(f.readlines())
@@ -91,10 +223,69 @@ if __name__ == "__main__":
                             res = run(source_code, file_path)
                             if isinstance(res, Error):
                                 print(res)
+                            if eliminated_nodes is not None:
+                                print(f"Optimizer eliminated {eliminated_nodes} nodes")
                     else:
                         print("File not found")
                 else:
                     print("Too many arguments")
+            case "stream":
+                if len(parameters) == 1 and os.path.isfile(parameters[0]):
+                    res = run_stream(parameters[0])
+                    if isinstance(res, Error):
+                        print(res)
+                else:
+                    print("Expected a valid filepath")
+            case "lazy":
+                if len(parameters) == 1 and parameters[0] in ("on", "off"):
+                    lazy_functions = parameters[0] == "on"
+                else:
+                    print("Expected 'on' or 'off'")
+            case "pure":
+                if len(parameters) == 1 and parameters[0] in ("on", "off"):
+                    cache_pure_calls = parameters[0] == "on"
+                else:
+                    print("Expected 'on' or 'off'")
+            case "purity":
+                if len(parameters) == 1 and os.path.isfile(parameters[0]):
+                    with open(parameters[0], 'r') as f:
+                        results = analyze_purity(f.read(), parameters[0])
+                    if len(results) > 0 and isinstance(results[0], Error):
+                        print(results[0])
+                    for result in results:
+                        if isinstance(result, FunctionPurity):
+                            print(f"fn {result.name}: {'pure' if result.pure else 'impure, ' + ', '.join(result.reasons)}")
+                else:
+                    print("Expected a valid filepath")
+            case "optimize":
+                if len(parameters) == 1 and parameters[0] in ("0", "1", "2"):
+                    optimization_level = int(parameters[0])
+                else:
+                    print("Expected 0, 1 or 2")
+            case "backend":
+                if len(parameters) == 1 and parameters[0] in BACKENDS:
+                    default_backend = parameters[0]
+                else:
+                    print(f"Expected one of {', '.join(BACKENDS)}")
+            case "dis":
+                if len(parameters) == 1 and os.path.isfile(parameters[0]):
+                    with open(parameters[0], 'r') as f:
+                        code = compile_bytecode(f.read(), parameters[0])
+                    print(disassemble(code) if isinstance(code, Code) else code[0])
+                else:
+                    print("Expected a valid filepath")
+            case "pysource":
+                if len(parameters) == 1 and os.path.isfile(parameters[0]):
+                    with open(parameters[0], 'r') as f:
+                        ast = parse(f.read(), parameters[0])
+                    if isinstance(ast, ProgramNode):
+                        translator = PythonTranslator(parameters[0])
+                        translator.translate_program(ast)
+                        print(translator.source())
+                    else:
+                        print(ast[0])
+                else:
+                    print("Expected a valid filepath")
             case "debug":
                 if len(parameters) > 0:
                     debug(parameters[0])
@@ -110,7 +301,17 @@ exit                    Exits the program
 help                    Prints this message
 phi [code]              Executes the given Phi-code
 run [file path]         Runs the code in the given file
+stream [file path]      Runs the code in the given file one statement at a time
 debug [file path]       Debugs the code in the given file
+lazy [on|off]           Parses function bodies only when they are first called
+pure [on|off]           Runs calls of pure functions with the same arguments only once
+purity [file path]      Prints which functions of the given file are pure
+optimize [0|1|2]        Sets how much programs are optimized before they run, 1 folds
+                        literals and drops code that can't run, 2 also inlines constants
+backend [name]          Selects what runs programs: interpreter, unboxed, exceptions,
+                        closures, vm or python
+dis [file path]         Prints the bytecode the vm runs for the given file
+pysource [file path]    Prints the Python source the python backend runs for the given file
 """
                 print(helpMessage)
             case _:
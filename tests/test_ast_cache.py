@@ -0,0 +1,76 @@
+# Checks the ASTCache gives back the program it stored, and only loads files signed with the
+# user's key for the source and interpreter version they were made for.
+#
+#   python -m pytest tests
+
+from frontend.ASTCache import ASTCache, HEADER, DIGEST_SIZE, source_hash
+from tests.test_equivalence import PROGRAMS, parse
+from version import VERSION
+import unittest
+import tempfile
+import pickle
+import os
+
+# Unpickling this calls os.system, a cache file holding it runs a command when it is loaded
+class Payload:
+    def __reduce__(self):
+        return (os.system, ("echo unpickled > " + os.path.join(tempfile.gettempdir(), "phi-cache-payload"),))
+
+
+class ASTCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "program.phi")
+        self.cache = ASTCache(key_path=os.path.join(self.directory.name, "key", "cache.key"))
+        self.source_code = PROGRAMS["factorial.phi"]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, data: bytes) -> None:
+        with open(self.cache.path(self.file_path), "wb") as f:
+            f.write(data)
+
+    def read(self) -> bytes:
+        with open(self.cache.path(self.file_path), "rb") as f:
+            return f.read()
+
+    def test_round_trip(self):
+        ast = parse(self.source_code)
+        self.cache.store(self.source_code, self.file_path, ast)
+        self.assertEqual(repr(self.cache.load(self.source_code, self.file_path)), repr(ast))
+        self.assertIsNone(self.cache.load(self.source_code + "\n", self.file_path))
+        self.assertIsNone(self.cache.load(self.source_code, self.file_path, "lazy"))
+
+    def test_header_has_the_version(self):
+        self.assertIn(VERSION.encode(), HEADER)
+
+    def test_unsigned_file_is_not_unpickled(self):
+        self.cache.store(self.source_code, self.file_path, parse(self.source_code))
+        signed = len(HEADER) + DIGEST_SIZE
+        data = self.read()
+        marker = os.path.join(tempfile.gettempdir(), "phi-cache-payload")
+        if os.path.exists(marker):
+            os.remove(marker)
+
+        self.write(data[:signed + DIGEST_SIZE] + pickle.dumps(Payload()))
+        self.assertIsNone(self.cache.load(self.source_code, self.file_path))
+        self.write(HEADER + source_hash(self.source_code) + bytes(DIGEST_SIZE) + pickle.dumps(Payload()))
+        self.assertIsNone(self.cache.load(self.source_code, self.file_path))
+        self.assertFalse(os.path.exists(marker))
+
+    def test_file_signed_with_another_key_is_a_miss(self):
+        self.cache.store(self.source_code, self.file_path, parse(self.source_code))
+        other = ASTCache(key_path=os.path.join(self.directory.name, "other", "cache.key"))
+        self.assertIsNone(other.load(self.source_code, self.file_path))
+
+    @unittest.skipUnless(os.name == "posix", "file modes")
+    def test_key_others_can_read_is_not_used(self):
+        self.assertIsNotNone(ASTCache(key_path=self.cache.key_path).key)
+        os.chmod(self.cache.key_path, 0o644)
+        self.cache.store(self.source_code, self.file_path, parse(self.source_code))
+        self.assertFalse(os.path.exists(self.cache.path(self.file_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# Checks every AST node class is slotted and tagged with its own NodeKind.
+#
+#   python -m pytest tests
+
+from frontend.ASTNodes import ASTNode
+from frontend.NodeKind import NodeKind
+from tests.test_equivalence import PROGRAMS, parse
+import unittest
+import pickle
+
+
+def node_classes(cls=ASTNode) -> list[type]:
+    classes = []
+    for subclass in cls.__subclasses__():
+        classes.append(subclass)
+        classes.extend(node_classes(subclass))
+    return classes
+
+# Every node in a tree, reached through the slots of the nodes above it
+def walk(value):
+    if isinstance(value, ASTNode):
+        yield value
+        for cls in type(value).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                yield from walk(getattr(value, name, None))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from walk(item)
+
+
+class ASTNodeTest(unittest.TestCase):
+    def test_tags(self):
+        classes = node_classes()
+        for cls in classes:
+            with self.subTest(node=cls.__name__):
+                self.assertEqual(getattr(NodeKind, cls.kind), cls.tag)
+        self.assertEqual(len({cls.tag for cls in classes}), len(classes))
+
+    def test_no_instance_dict(self):
+        for name, source_code in PROGRAMS.items():
+            with self.subTest(program=name):
+                ast = parse(source_code)
+                for node in walk(ast):
+                    self.assertFalse(hasattr(node, "__dict__"), type(node).__name__)
+                self.assertEqual(repr(pickle.loads(pickle.dumps(ast))), repr(ast))
+
+
+if __name__ == "__main__":
+    unittest.main()
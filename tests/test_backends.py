@@ -0,0 +1,101 @@
+# Runs small programs on every backend and checks what they print, for behaviour the equivalence
+# tests can't see because the Interpreter they compare against would be wrong too.
+#
+#   python -m pytest tests
+
+from backend.Interpreter import Interpreter
+from backend.Environment import create_global_environment
+from backend.RuntimeValue import ArrayValue, ObjectValue, StringValue, NULL, TRUE, FALSE, SMALL_INTEGERS
+from backend.Optimizer import Optimizer
+from frontend.ASTNodes import BreakNode, CaseNode, ContinueNode, ExpressionNode, IntegerLiteralNode, ItemLiteralNode, PropertyLiteralNode
+from frontend.Error import Error, NotImplementedError
+from tests.test_equivalence import PROGRAMS, parse, run
+from shell import BACKENDS
+import unittest
+
+CATCH = '''fn divide(a, b) {
+    int result = 0
+    try {
+        result = a // b
+    } catch (zeroDivisionError) {
+        output("caught")
+        result = 0 - 1
+    }
+    <- result
+}
+output(divide(6, 3))
+output(divide(1, 0))
+try {
+    throw typeError "thrown"
+} catch (typeError) {
+    output("typeError caught")
+}
+try {
+    throw typeError "not caught"
+} catch (zeroDivisionError) {
+    output("not reached")
+}
+'''
+
+
+class BackendTest(unittest.TestCase):
+    def test_catch_body_runs(self):
+        for name, backend in BACKENDS.items():
+            with self.subTest(backend=name):
+                out, error = run(parse(CATCH), backend())
+                self.assertEqual(out, "2\ncaught\n-1\ntypeError caught\n")
+                self.assertIn("not caught", error)
+
+    def test_value_methods(self):
+        for name, backend in BACKENDS.items():
+            with self.subTest(backend=name):
+                out, error = run(parse(PROGRAMS["valueMethods.phi"]), backend())
+                self.assertEqual(out, "2\n2\n2-3-4\n1-9\n2\n4\nx1y2\nx,keys\ny,z\nnativeFunctionValue\nF\nT\n2\n")
+
+    # Every value of a type reads the one table of its class
+    def test_shared_method_tables(self):
+        for value in (StringValue("a"), ArrayValue({}), ObjectValue({})):
+            with self.subTest(value=value.type):
+                self.assertNotIn("methods", vars(value))
+                self.assertIs(value.methods, type(value).methods)
+
+    # The values every backend hands out instead of making new ones must come out as they went in
+    def test_shared_values_unchanged(self):
+        shared = [NULL, TRUE, FALSE, *SMALL_INTEGERS]
+        before = [dict(vars(value)) for value in shared]
+        for name, backend in BACKENDS.items():
+            for program, source_code in PROGRAMS.items():
+                for level in (0, 2):
+                    ast = parse(source_code)
+                    run(Optimizer(level).optimize(ast) if level else ast, backend())
+            with self.subTest(backend=name):
+                self.assertEqual([vars(value) for value in shared], before)
+
+
+# The node kinds the Interpreter evaluated before it dispatched through a table
+EVALUATED = ['arrayLiteral', 'assignmentBinaryExpression', 'assignmentExpression', 'binaryExpression', 'callExpression', 'delete', 'doWhileStatement', 'exportExpression', 'forEachStatement', 'forStatement', 'functionDeclaration', 'identifier', 'ifStatement', 'importExpression', 'integerLiteral', 'matchStatement', 'memberExpression', 'nullLiteral', 'objectLiteral', 'program', 'realLiteral', 'returnExpression', 'stringLiteral', 'throwStatement', 'tryStatement', 'unknownLiteral', 'variableDeclarationExpression', 'whileStatement']
+
+
+class DispatchTest(unittest.TestCase):
+    def test_table(self):
+        self.assertEqual(sorted(node.kind for node in Interpreter().evaluators), EVALUATED)
+
+    def test_other_values(self):
+        interpreter = Interpreter()
+        env = create_global_environment()
+        for value in ("text", 1, 1.5, Error("", 0, 0)):
+            self.assertIs(interpreter.evaluate(value, env), value)
+        for node in (BreakNode(1, 2), ContinueNode(1, 2), ExpressionNode(1, 2), CaseNode(None, [], 1, 2), ItemLiteralNode(0, None, 1, 2), PropertyLiteralNode("a", None, 1, 2)):
+            with self.subTest(node=node.kind):
+                self.assertIsInstance(interpreter.evaluate(node, env), NotImplementedError)
+
+    # The table holds bound methods, so a subclass overriding an evaluator is dispatched to
+    def test_override(self):
+        class Doubling(Interpreter):
+            def evaluate_integer_literal(self, literal, env):
+                return super().evaluate_integer_literal(literal, env).value * 2
+        self.assertEqual(Doubling().evaluate(IntegerLiteralNode(21, 1, 1), create_global_environment()), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# Runs Phi programs on every backend and mode and checks each prints what the Interpreter prints and
+# stops with the same error, at the same place. The programs are the example programs that run
+# without input and the programs in tests/programs.
+#
+#   python -m pytest tests
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser
+from frontend.ASTNodes import ProgramNode
+from frontend.Error import Error
+from backend.Environment import create_global_environment
+from backend.Interpreter import Interpreter
+from backend.ClosureCompiler import ClosureCompiler
+from backend.VirtualMachine import VirtualMachine
+from backend.PythonCompiler import PythonCompiler
+from backend.UnboxedInterpreter import UnboxedInterpreter
+from backend.ExceptionInterpreter import ExceptionInterpreter
+from backend.Purity import PurityAnalyzer, pure_bodies
+from backend.Optimizer import Optimizer
+import contextlib
+import unittest
+import glob
+import os
+import io
+
+def parse(source_code: str, lazy: bool = False) -> ProgramNode | list[Error]:
+    return Parser(Lexer(source_code).tokenize(), "", lazy).generate_AST()
+
+def load_programs() -> dict:
+    programs = {}
+    paths = glob.glob("ExamplePrograms/*.phi") + glob.glob(os.path.join(os.path.dirname(__file__), "programs", "*.phi"))
+    for path in sorted(paths):
+        with open(path, 'r') as f:
+            source_code = f.read()
+        if "input(" not in source_code and isinstance(parse(source_code), ProgramNode):
+            programs[os.path.basename(path)] = source_code
+    return programs
+
+PROGRAMS = load_programs()
+
+# What running the program printed and the error it stopped with
+def run(ast: ProgramNode, interpreter) -> tuple[str, str | None]:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        result = interpreter.evaluate(ast, create_global_environment())
+    return out.getvalue(), str(result) if isinstance(result, Error) else None
+
+
+class EquivalenceTest(unittest.TestCase):
+    def assert_same(self, make_interpreter=Interpreter, make_ast=parse) -> None:
+        for name, source_code in PROGRAMS.items():
+            with self.subTest(program=name):
+                expected = run(parse(source_code), Interpreter())
+                self.assertEqual(run(make_ast(source_code), make_interpreter()), expected)
+
+    def test_lazy_functions(self):
+        self.assert_same(make_ast=lambda source_code: parse(source_code, lazy=True))
+
+    def test_closures(self):
+        self.assert_same(ClosureCompiler)
+
+    def test_virtual_machine(self):
+        self.assert_same(VirtualMachine)
+
+    def test_python(self):
+        self.assert_same(PythonCompiler)
+
+    def test_unboxed(self):
+        self.assert_same(UnboxedInterpreter)
+
+    def test_exceptions(self):
+        self.assert_same(ExceptionInterpreter)
+
+    def test_pure_calls(self):
+        for name, source_code in PROGRAMS.items():
+            with self.subTest(program=name):
+                ast = parse(source_code)
+                interpreter = Interpreter()
+                interpreter.pure_bodies = pure_bodies(PurityAnalyzer().analyze(ast))
+                self.assertEqual(run(ast, interpreter), run(parse(source_code), Interpreter()))
+
+    def test_optimizer(self):
+        for level in (1, 2):
+            with self.subTest(level=level):
+                self.assert_same(make_ast=lambda source_code: Optimizer(level).optimize(parse(source_code)))
+
+
+if __name__ == "__main__":
+    unittest.main()
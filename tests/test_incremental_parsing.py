@@ -0,0 +1,52 @@
+# Edits the example programs one character at a time and checks the IncrementalParser gives back
+# what parsing the whole file again gives back, the same tree or the same errors.
+#
+#   python -m pytest tests
+
+from frontend.IncrementalParser import IncrementalParser
+from tests.test_equivalence import PROGRAMS
+import unittest
+import shell
+import random
+
+EDITS = list("(){}[]\"'#\n =+-*/<>,.:~") + ["fn ", "if ", "else", "int ", "x", "1", "<-", "output("]
+
+# The parse of a source as something that compares equal when the parse is the same
+def describe(ast) -> tuple[str, list[str] | str]:
+    if isinstance(ast, list):
+        return "errors", [str(error) for error in ast]
+    return "ast", repr(ast)
+
+
+class IncrementalParsingTest(unittest.TestCase):
+    # Some broken programs make the Parser raise, the IncrementalParser then raises the same
+    def assert_same(self, parser: IncrementalParser, source_code: str) -> None:
+        try:
+            expected = describe(shell.parse(source_code, cache=False))
+        except Exception as exception:
+            self.assertRaises(type(exception), parser.update, source_code)
+            return
+        self.assertEqual(describe(parser.update(source_code)), expected, repr(source_code))
+
+    def test_unclosed_brackets(self):
+        for source_code in ["a = ((1", "((x", "((1", "((x #c"]:
+            with self.subTest(source_code=source_code):
+                self.assert_same(IncrementalParser(), source_code)
+
+    def test_random_edits(self):
+        generator = random.Random(0)
+        for name, source_code in PROGRAMS.items():
+            with self.subTest(program=name):
+                parser = IncrementalParser()
+                self.assert_same(parser, source_code)
+                for _ in range(40):
+                    position = generator.randint(0, len(source_code))
+                    if generator.random() < 0.5:
+                        source_code = source_code[:position] + source_code[position + generator.randint(1, 5):]
+                    else:
+                        source_code = source_code[:position] + generator.choice(EDITS) + source_code[position:]
+                    self.assert_same(parser, source_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# Checks the tokens, positions and errors the Lexer gives back.
+#
+#   python -m pytest tests
+
+from frontend.Lexer import Lexer
+from frontend.Token import Token
+from tests.test_equivalence import PROGRAMS
+import unittest
+import random
+import io
+
+# Pieces random sources are made of, including ones the Lexer rejects
+PIECES = list("abxyz019_-?.,:()[]{}\"'#\n\t =+-*/%^<>!&|~$@;`") + ["!=", "<-", "//", "+=", "1.2", "1.2.3", "fn", "int"]
+
+# A token as (kind, value, column, line), an error as its message
+def describe(result) -> list:
+    return [(str(item.type), item.value, item.column, item.line) if isinstance(item, Token) else str(item) for item in result]
+
+
+class LexerTest(unittest.TestCase):
+    def test_positions(self):
+        self.assertEqual(describe(Lexer('a\n  b = "x\ny" c').tokenize()), [
+            ("identifier", "a", 2, 1), ("lineend", "\n", 0, 2), ("identifier", "b", 3, 2),
+            ("assignmentoperator", "=", 5, 2), ("stringvalue", "x\ny", 2, 3), ("identifier", "c", 4, 3),
+            ("eof", "eof", 5, 3)
+        ])
+        self.assertEqual(describe(Lexer("a += 1 // 2 <- b != c").tokenize()), [
+            ("identifier", "a", 2, 1), ("assignmentbinaryoperation", "+=", 4, 1), ("intvalue", 1, 7, 1),
+            ("binaryoperation", "//", 9, 1), ("intvalue", 2, 12, 1), ("return", "<-", 15, 1),
+            ("identifier", "b", 17, 1), ("notequal", "!=", 19, 1), ("identifier", "c", 22, 1), ("eof", "eof", 23, 1)
+        ])
+
+    def test_comment_on_the_last_line(self):
+        self.assertEqual(describe(Lexer("int x = 1 # c").tokenize()), [
+            ("int", "int", 4, 1), ("identifier", "x", 6, 1), ("assignmentoperator", "=", 8, 1),
+            ("intvalue", 1, 10, 1), ("eof", "eof", 15, 1)
+        ])
+
+    def test_errors(self):
+        [error] = Lexer("x = 1.2.3").tokenize()
+        self.assertIn("Ln 1, Col 8 in : Found two '.'", str(error))
+        [error] = Lexer("s = 'abc\nx").tokenize()
+        self.assertIn("Ln 2, Col 1 in : Expected a '''", str(error))
+        self.assertEqual(len(Lexer("x $ 1 ! 2").tokenize()), 2)
+
+    def assert_modes_agree(self, source_code: str) -> None:
+        self.assertEqual(describe(Lexer(source_code, mode="regex").tokenize()), describe(Lexer(source_code).tokenize()), repr(source_code))
+
+    def test_regex_mode(self):
+        for name, source_code in PROGRAMS.items():
+            with self.subTest(program=name):
+                self.assert_modes_agree(source_code)
+
+    def test_regex_mode_on_error_input(self):
+        generator = random.Random(0)
+        for _ in range(2000):
+            self.assert_modes_agree("".join(generator.choices(PIECES, k=generator.randint(1, 30))))
+
+    def test_token_buffer(self):
+        for name, source_code in PROGRAMS.items():
+            with self.subTest(program=name):
+                tokens = Lexer(source_code).tokenize_compact()
+                self.assertEqual(describe(tokens), describe(Lexer(source_code).tokenize()))
+                self.assertLess(tokens.nbytes(), 24 * len(tokens))
+
+    # Tokens split across chunks must come out as if the source was read at once
+    def assert_streams_agree(self, source_code: str) -> None:
+        lexer = Lexer(source_code, mode="regex")
+        lexer.tokenize()
+        expected = describe(lexer.tokens), describe(lexer.errors)
+        for chunk_size in (1, 2, 3, 5, 64):
+            lexer = Lexer("")
+            tokens = describe(lexer.iter_tokens(io.StringIO(source_code), chunk_size))
+            self.assertEqual((tokens, describe(lexer.errors)), expected, (chunk_size, source_code))
+
+    def test_stream_chunk_boundaries(self):
+        for name, source_code in PROGRAMS.items():
+            with self.subTest(program=name):
+                self.assert_streams_agree(source_code)
+        for source_code in ["a != b <- c // d += 1", "x = 'a b\nc' # note\ny = 12.50", "1.2.3 $ 'open", "abc123 4567 \"\""]:
+            with self.subTest(source_code=source_code):
+                self.assert_streams_agree(source_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+# Checks what memoize keeps and what memoInfo counts, and that a memoized function runs on the
+# backend running the program.
+#
+#   python -m pytest tests
+
+from backend.Interpreter import Interpreter
+from backend.VirtualMachine import VirtualMachine
+from tests.test_equivalence import PROGRAMS, parse, run
+import unittest
+
+DEEP = '''fn down(n) {
+    int result = n
+    if (n > 0) {
+        result = down(n - 1)
+    }
+    <- result
+}
+down = memoize(down, 0)
+output(down(5000))
+output(memoInfo(down))
+'''
+
+
+class MemoizationTest(unittest.TestCase):
+    def test_counters(self):
+        out, error = run(parse(PROGRAMS["memoization.phi"]), Interpreter())
+        lines = out.splitlines()
+        # Least recently used results are dropped at the size
+        self.assertEqual(lines[:11], ["computing 2", "4", "computing 3", "9", "4", "computing 4", "16", "4", "computing 3", "9", "{hits: 2, misses: 4, cached: 2, size: 2}"])
+        # A size of 0 keeps every result
+        self.assertIn("{hits: 29, misses: 31, cached: 31, size: 0}", lines)
+        # Calls ending in an error are not kept
+        self.assertIn("{hits: 1, misses: 3, cached: 1, size: 128}", lines)
+        self.assertIn("Can't memoize a call with an 'arrayValue' argument", error)
+
+    def test_virtual_machine_recursion(self):
+        out, error = run(parse(DEEP), VirtualMachine())
+        self.assertIsNone(error)
+        self.assertEqual(out, "0\n{hits: 0, misses: 5001, cached: 5001, size: 0}\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# Checks the trees and errors the Parser gives back, and that it gives back the same tree whether
+# its tokens come in a list or are streamed from Lexer.iter_tokens().
+#
+#   python -m pytest tests
+
+from frontend.Lexer import Lexer
+from frontend.Parser import Parser, LOOKAHEAD
+from frontend.ASTNodes import AssignmentBinaryExpressionNode, AssignmentExpressionNode, BinaryExpressionNode, CallExpression, IdentifierNode, IfStatementNode, MemberExpressionNode
+from tests.test_equivalence import PROGRAMS, parse
+import unittest
+import io
+
+# An expression with every operation in brackets
+def shape(node) -> str:
+    match node:
+        case BinaryExpressionNode():
+            return f"({shape(node.left)} {node.operand} {shape(node.right)})"
+        case AssignmentExpressionNode():
+            return f"({shape(node.assigne)} = {shape(node.value)})"
+        case AssignmentBinaryExpressionNode():
+            return f"({shape(node.assigne)} {node.operand} {shape(node.value)})"
+        case MemberExpressionNode():
+            # computed is set for '.', not for '[]'
+            return f"{shape(node.object)}.{shape(node.property)}" if node.computed else f"{shape(node.object)}[{shape(node.property)}]"
+        case CallExpression():
+            return f"{shape(node.caller)}({', '.join(map(shape, node.arguments))})"
+        case IdentifierNode():
+            return node.symbol
+        case IfStatementNode():
+            return f"{shape(node.left_condition)} {node.operand} {shape(node.right_condition)}"
+    return str(node.value)
+
+
+class ParserTest(unittest.TestCase):
+    def test_streamed_tokens(self):
+        for name, source_code in PROGRAMS.items():
+            for lazy in (False, True):
+                with self.subTest(program=name, lazy=lazy):
+                    parser = Parser(Lexer(source_code).iter_tokens(io.StringIO(source_code), 64), "", lazy)
+                    self.assertEqual(repr(parser.generate_AST()), repr(parse(source_code, lazy)))
+
+    def test_binding_powers(self):
+        for source_code, expected in [
+            ("1 + 2 * 3", "(1 + (2 * 3))"),
+            ("1 * 2 + 3", "((1 * 2) + 3)"),
+            ("a % 3 // 2 - 1", "(((a % 3) // 2) - 1)"),
+            ("a.b(1) + c[0] * 2", "(a.b(1) + (c[0] * 2))"),
+            ("a.b.c[1][2]", "a.b.c[1][2]"),
+            ("f(1)(2)", "f(1)(2)"),
+            ("x += 1 * 2 - 3", "(x += ((1 * 2) - 3))"),
+            ("if (a + 1 == b * 2) {\n}", "(a + 1) == (b * 2)"),
+        ]:
+            with self.subTest(source_code=source_code):
+                self.assertEqual(shape(parse(source_code).body[0]), expected)
+
+    def test_associativity(self):
+        # Binary operators group to the left, '^' included, and assignments to the right
+        for source_code, expected in [
+            ("1 - 2 - 3", "((1 - 2) - 3)"),
+            ("8 / 4 / 2", "((8 / 4) / 2)"),
+            ("2 ^ 3 ^ 2", "((2 ^ 3) ^ 2)"),
+            ("x = y = 1 + 2", "(x = (y = (1 + 2)))"),
+        ]:
+            with self.subTest(source_code=source_code):
+                self.assertEqual(shape(parse(source_code).body[0]), expected)
+
+    def test_no_tighter_operation_after_a_looser_one(self):
+        self.assertIn("Invalid token 'period' found", str(parse("f(x).y")[0]))
+        self.assertIn("Invalid token 'openbrace' found", str(parse("1 + {a: 1}")[0]))
+
+    # Token kinds are integers, messages still name them by their labels
+    def test_expected_operator_message(self):
+        errors = parse("for (int i = 0, i, i += 1) {\n}\n")
+        self.assertIn("Expected one of the following operators: ('equal', 'notequal', 'greaterthan', 'lessthan', 'greaterthanequal', 'lessthanequal', 'and', 'or')", str(errors[0]))
+        self.assertIn("Invalid token 'comma' found", str(errors[1]))
+
+    def test_streamed_tokens_are_dropped(self):
+        source_code = "int x = 1\nx += 2\n" * 2000
+        tokens = []
+        sizes = []
+
+        # Tokens the parser still holds each time it pulls another one
+        def stream():
+            for token in Lexer(source_code).iter_tokens():
+                sizes.append(len(tokens))
+                yield token
+
+        parser = Parser(stream())
+        tokens = parser.tokens
+        self.assertEqual(repr(parser.generate_AST()), repr(parse(source_code)))
+        self.assertLessEqual(max(sizes), 2 * LOOKAHEAD)
+
+
+if __name__ == "__main__":
+    unittest.main()
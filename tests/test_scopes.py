@@ -0,0 +1,69 @@
+# Checks which identifiers of a function body the Resolver gives a slot, what reading through
+# those slots gives back on every backend, and that call frames share the builtins without changing them.
+#
+#   python -m pytest tests
+
+from backend.Resolver import Resolver
+from backend.Environment import BUILTIN_CONSTANTS, BUILTIN_NAMES, BUILTIN_SLOTS, BUILTIN_VARIABLES, CallFrame
+from backend.RuntimeValue import IntegerValue
+from frontend.ASTNodes import FunctionDeclarationExpressionNode, IdentifierNode
+from frontend.Error import Error
+from tests.test_equivalence import PROGRAMS, parse, run
+from shell import BACKENDS
+import unittest
+
+SLOTTED_OUTPUT = "1\n2\n5\n1\nT\nbooleanValue\n3\n40\n4\nlocal is not defined\n0\n1\n2\n"
+UNKNOWN = "{'type': 'unknownValue', 'value': {'type': 'nullValue', 'value': '_'}}"
+FRAME_OUTPUT = f"5\n1\noutput is a builtin\n{UNKNOWN}\nunknownValue\nLOCAL stayed in first\n{UNKNOWN}\n"
+
+
+class ScopeTest(unittest.TestCase):
+    def test_layout(self):
+        functions = {node.name: node for node in parse(PROGRAMS["slotResolution.phi"]).body if isinstance(node, FunctionDeclarationExpressionNode)}
+        resolver = Resolver()
+
+        scope = resolver.resolve_function(functions["nested"].parameters, functions["nested"].body)
+        self.assertEqual(scope.names, [*BUILTIN_NAMES, "n", "inner"])
+        slots = {node.symbol: node.slot for node in resolver.walk(functions["nested"].body) if hasattr(node, "slot")}
+        self.assertEqual(slots["output"], BUILTIN_NAMES.index("output"))
+        self.assertEqual(slots["n"], len(BUILTIN_NAMES))
+        # Declared in the inner function, so not part of this call scope
+        self.assertEqual(slots["local"], -1)
+        self.assertIs(resolver.resolve_function(functions["nested"].parameters, functions["nested"].body), scope)
+
+        scope = resolver.resolve_function(functions["missing"].parameters, functions["missing"].body)
+        self.assertNotIn("LIMIT", scope.slots)
+
+    def test_slot_reads(self):
+        for name, backend in BACKENDS.items():
+            with self.subTest(backend=name):
+                out, error = run(parse(PROGRAMS["slotResolution.phi"]), backend())
+                self.assertEqual(out, SLOTTED_OUTPUT)
+                self.assertIn('"LIMIT" is not defined', error)
+
+
+    def test_call_frame_builtins(self):
+        frame = CallFrame(layout={name: index for index, name in enumerate([*BUILTIN_NAMES, "LOCAL"])})
+        for name in BUILTIN_NAMES:
+            self.assertIs(frame.lookup(IdentifierNode(name, 0, 0)), frame.slots[BUILTIN_NAMES.index(name)])
+        self.assertIs(frame.constants, BUILTIN_CONSTANTS)
+
+        # The frame gets its own tables before it writes to them
+        frame.assign_variable("?", IntegerValue(5, 0, 0))
+        frame.declare_variable("LOCAL", IntegerValue(1, 0, 0), True)
+        self.assertIsNot(frame.constants, BUILTIN_CONSTANTS)
+        self.assertEqual(frame.slots[BUILTIN_NAMES.index("?")].value, 5)
+        self.assertEqual(frame.slots[-1].value, 1)
+        self.assertNotIn("LOCAL", BUILTIN_CONSTANTS)
+        self.assertEqual(BUILTIN_VARIABLES["?"].type, "unknownValue")
+        self.assertEqual(len(BUILTIN_SLOTS), len(BUILTIN_NAMES))
+        self.assertIsInstance(frame.declare_variable("output", IntegerValue(2, 0, 0)), Error)
+
+    def test_frames(self):
+        for name, backend in BACKENDS.items():
+            with self.subTest(backend=name):
+                self.assertEqual(run(parse(PROGRAMS["callFrames.phi"]), backend()), (FRAME_OUTPUT, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,2 @@
+# The version of Phi, read by setup.py and by the caches that must not outlive it
+VERSION = "1.8.0"